@@ -3,6 +3,7 @@
 
 import asyncio
 import json as _json
+from ._deps import get_logger, open_connection
 from .aiohttp_ws import (
     _WSRequestContextManager,
     ClientWebSocketResponse,
@@ -10,6 +11,8 @@ from .aiohttp_ws import (
     WSMsgType,
 )
 
+logger = get_logger("http")
+
 HttpVersion10 = "HTTP/1.0"
 HttpVersion11 = "HTTP/1.1"
 
@@ -32,7 +35,7 @@ class ClientResponse:
                     with deflate.DeflateIO(io.BytesIO(data), deflate.GZIP, 15) as d:
                         return d.read()
             except ImportError:
-                print("WARNING: deflate module required")
+                logger.warning("WARNING: deflate module required")
         return data
 
     async def read(self, sz=-1):
@@ -185,7 +188,8 @@ class ClientSession:
             host, port = host.split(":", 1)
             port = int(port)
 
-        reader, writer = await asyncio.open_connection(host, port, ssl=ssl)
+        # hal.open_connection：设备上即 asyncio.open_connection，CPython 上包装成同样接口的 Stream (见 _deps)
+        reader, writer = await open_connection(host, port, ssl=ssl)
 
         # Use protocol 1.0, because 1.1 always allows to use chunked transfer-encoding
         # But explicitly set Connection: close, even though this should be default for 1.0,
@@ -194,13 +198,14 @@ class ClientSession:
             version = self._http_version
         if "Host" not in headers:
             headers.update(Host=host)
+        # 请求头先拼成 str 再编码：MicroPython 允许 bytes % str，CPython 不允许
         if not data:
-            query = b"%s /%s %s\r\n%s\r\n" % (
+            query = ("%s /%s %s\r\n%s\r\n" % (
                 method,
                 path,
                 version,
                 "\r\n".join(f"{k}: {v}" for k, v in headers.items()) + "\r\n" if headers else "",
-            )
+            )).encode()
         else:
             if json:
                 headers.update(**{"Content-Type": "application/json"})
@@ -210,13 +215,12 @@ class ClientSession:
                 data = data.encode()
 
             headers.update(**{"Content-Length": len(data)})
-            query = b"""%s /%s %s\r\n%s\r\n%s""" % (
+            query = ("%s /%s %s\r\n%s\r\n" % (
                 method,
                 path,
                 version,
                 "\r\n".join(f"{k}: {v}" for k, v in headers.items()) + "\r\n",
-                data,
-            )
+            )).encode() + data
         if not is_handshake:
             await writer.awrite(query)
             return reader
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# 本库对项目模块的可选依赖：在本项目里用 hal 的 open_connection、log 日志和 metrics 计数，
+# 单独拷到别的项目里使用时 (没有这几个模块) 退回 asyncio.open_connection、print 和空计数器
+import asyncio
+
+try:
+    from hal import open_connection
+except ImportError:
+    open_connection = asyncio.open_connection
+
+try:
+    from log import DEBUG, get_logger
+except ImportError:
+    DEBUG = 10
+
+    class _PrintLogger:
+        """与 log.Logger 同样的调用方式，debug 以外直接 print"""
+
+        def __init__(self, name):
+            self.name = name
+
+        def enabled(self, level):
+            return level > DEBUG
+
+        def _print(self, fmt, args):
+            try:
+                print(self.name + ": " + (fmt % args if args else fmt))
+            except Exception:
+                print(self.name + ": " + str(fmt), args)
+
+        def debug(self, fmt, *args):
+            pass
+
+        def info(self, fmt, *args):
+            self._print(fmt, args)
+
+        def warning(self, fmt, *args):
+            self._print(fmt, args)
+
+        def error(self, fmt, *args):
+            self._print(fmt, args)
+
+        def exc(self, exc, fmt, *args):
+            self._print(fmt, args)
+
+    def get_logger(name):
+        return _PrintLogger(name)
+
+try:
+    from metrics import counter
+except ImportError:
+    class _Counter:
+        def inc(self, n=1):
+            pass
+
+    def counter(name):
+        return _Counter()
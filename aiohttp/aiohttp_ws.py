@@ -9,9 +9,14 @@ import json as _json
 import binascii
 import re
 import struct
-import sys
 from collections import namedtuple
 import time
+from .ws_mask import mask_inplace
+from ._deps import DEBUG, counter, get_logger
+
+logger = get_logger("ws")
+_frames_rx = counter("ws.frames_rx")  # 收到的帧数 (含控制帧与分片)
+_frames_tx = counter("ws.frames_tx")  # 写出的帧数
 
 URL_RE = re.compile(r"(wss|ws)://([A-Za-z0-9-\.]+)(?:\:([0-9]+))?(/.+)?")
 URI = namedtuple("URI", ("protocol", "hostname", "port", "path"))  # noqa: PYI024
@@ -63,6 +68,19 @@ class WebSocketClient:
         self.closed = False
         self.reader = None
         self.writer = None
+        # 为 True 时 TEXT 消息不解码成 str，直接返回 UTF-8 载荷缓冲区 (由调用方自行分拣/解析)
+        self.raw_text = False
+        # 发送批次：多帧依次编码进同一个复用缓冲区，flush() 时一次 write + 一次 drain
+        self._batch_buf = bytearray(0)
+        self._batch_pos = 0
+        self._batch_frames = 0
+        self.batch_max_bytes = 8192  # 批次达到该大小前必须先 flush (单帧超过时单独成批)
+        # 发送统计，用于评估合并效果 (每次 flush 平均帧数/字节数)
+        self.flushes = 0
+        self.frames_flushed = 0
+        self.bytes_flushed = 0
+        self.max_frames_per_flush = 0
+        self.max_bytes_per_flush = 0
 
     async def connect(self, uri, ssl=None, handshake_request=None, headers={}):
         uri = urlparse(uri)
@@ -88,7 +106,8 @@ class WebSocketClient:
 
     def _process_websocket_frame(self, opcode, payload):
         if opcode == self.TEXT:
-            payload = str(payload, "utf-8")
+            if not self.raw_text:
+                payload = str(payload, "utf-8")
         elif opcode == self.BINARY:
             pass
         elif opcode == self.CLOSE:
@@ -100,11 +119,23 @@ class WebSocketClient:
             return None, None
         return None, payload
 
-    @classmethod
-    def _encode_websocket_frame(cls, opcode, payload):
-        if opcode == cls.TEXT:
-            payload = payload.encode()
+    @staticmethod
+    def _frame_size(length):
+        """客户端帧 (带 4 字节掩码) 的总长度"""
+        if length < 126:  # 126 is magic value to use 2-byte length header
+            return 2 + 4 + length
+        elif length < (1 << 16):  # Length fits in 2-bytes
+            return 4 + 4 + length
+        elif length < (1 << 64):
+            return 10 + 4 + length
+        raise ValueError
 
+    @classmethod
+    def _encode_frame_into(cls, buf, pos, opcode, payload):
+        """
+        把一帧 (帧头 + 掩码 + 已掩码载荷) 直接写入 buf[pos:]，返回帧结束位置
+        调用方保证 buf 至少还有 _frame_size(len(payload)) 字节可写
+        """
         length = len(payload)
         fin = mask = True
 
@@ -117,25 +148,62 @@ class WebSocketClient:
         byte2 = 0x80 if mask else 0
 
         if length < 126:  # 126 is magic value to use 2-byte length header
-            byte2 |= length
-            frame = struct.pack("!BB", byte1, byte2)
+            struct.pack_into("!BB", buf, pos, byte1, byte2 | length)
+            pos += 2
 
         elif length < (1 << 16):  # Length fits in 2-bytes
-            byte2 |= 126  # Magic code
-            frame = struct.pack("!BBH", byte1, byte2, length)
+            struct.pack_into("!BBH", buf, pos, byte1, byte2 | 126, length)
+            pos += 4
 
         elif length < (1 << 64):
-            byte2 |= 127  # Magic code
-            frame = struct.pack("!BBQ", byte1, byte2, length)
+            struct.pack_into("!BBQ", buf, pos, byte1, byte2 | 127, length)
+            pos += 10
 
         else:
             raise ValueError
 
         # Mask is 4 bytes
-        mask_bits = struct.pack("!I", random.getrandbits(32))
-        frame += mask_bits
-        payload = bytes(b ^ mask_bits[i % 4] for i, b in enumerate(payload))
-        return frame + payload
+        struct.pack_into("!I", buf, pos, random.getrandbits(32))
+        view = memoryview(buf)
+        key = view[pos:pos + 4]
+        pos += 4
+        view[pos:pos + length] = payload
+        mask_inplace(buf, pos, length, key)
+        return pos + length
+
+    @classmethod
+    def _encode_websocket_frame(cls, opcode, payload):
+        if opcode == cls.TEXT:
+            payload = payload.encode()
+        frame = bytearray(cls._frame_size(len(payload)))
+        cls._encode_frame_into(frame, 0, opcode, payload)
+        return frame
+
+    def _append_frame(self, opcode, payload):
+        """把一帧编码追加到发送批次末尾 (缓冲区只增不减，按 1KB 取整)"""
+        need = self._batch_pos + self._frame_size(len(payload))
+        if len(self._batch_buf) < need:
+            buf = bytearray((need + 1023) & ~1023)
+            buf[:self._batch_pos] = memoryview(self._batch_buf)[:self._batch_pos]
+            self._batch_buf = buf
+        self._batch_pos = self._encode_frame_into(self._batch_buf, self._batch_pos, opcode, payload)
+        self._batch_frames += 1
+
+    @property
+    def pending_bytes(self):
+        """已编码、尚未 flush 的字节数"""
+        return self._batch_pos
+
+    def flush_stats(self):
+        return {
+            "flushes": self.flushes,
+            "frames": self.frames_flushed,
+            "bytes": self.bytes_flushed,
+            "frames_per_flush": self.frames_flushed / self.flushes if self.flushes else 0,
+            "bytes_per_flush": self.bytes_flushed / self.flushes if self.flushes else 0,
+            "max_frames_per_flush": self.max_frames_per_flush,
+            "max_bytes_per_flush": self.max_bytes_per_flush,
+        }
 
     async def handshake(self, uri, ssl, req, headers={}):
         # 使用传入的headers，而不是创建一个空的headers字典
@@ -166,13 +234,24 @@ class WebSocketClient:
             header = await self.reader.readline()
             header = header[:-2]
 
+    async def _readinto(self, buf):
+        """
+        把数据直接读入 buf (memoryview)，返回实际读取的字节数
+        流支持 readinto 时零拷贝；否则退化为 read() 后拷贝一次到 buf
+        """
+        readinto = getattr(self.reader, "readinto", None)
+        if readinto is not None:
+            return await readinto(buf) or 0
+        chunk = await self.reader.read(len(buf))
+        n = len(chunk)
+        buf[:n] = chunk
+        return n
+
     async def _read_frame(self):
         header = await self.reader.read(2)
         if len(header) != 2:  # pragma: no cover
             # raise OSError(32, "Websocket connection closed")
-            opcode = self.CLOSE
-            payload = b""
-            return fin, opcode, payload
+            return True, self.CLOSE, b""
         fin, opcode, has_mask, length = self._parse_frame_header(header)
         if length == 126:  # Magic number, length header is 2 bytes
             (length,) = struct.unpack("!H", await self.reader.read(2))
@@ -181,69 +260,68 @@ class WebSocketClient:
 
         if has_mask:  # pragma: no cover
             mask = await self.reader.read(4)
-            
-        # 对于大型数据，使用分块读取
-        payload = b""
-        chunk_size = 4096  # 使用较小的块大小 (4KB)
-        remaining = length
-        
+
+        # 按帧头声明的长度一次性分配载荷缓冲区，之后直接读入，避免 payload += chunk 的 O(n²) 拷贝
+        payload = memoryview(bytearray(length))
+        chunk_size = 4096  # 单次读取上限 (4KB)
+        got = 0
+
         # 记录是否已经打印过进度
         progress_markers = set()
-        total_chunks = (length + chunk_size - 1) // chunk_size  # 总的分块数
-        
+
         # 增强的读取循环，确保读取完整的载荷
         start_time = time.time()
-        while remaining > 0:
+        while got < length:
             try:
-                chunk = await self.reader.read(min(chunk_size, remaining))
+                n = await self._readinto(payload[got:min(got + chunk_size, length)])
                 # 如果没有读取到数据，尝试等待一小段时间后重试
-                if not chunk:
+                if not n:
                     # 短暂休眠后重试，而不是立即退出
                     await asyncio.sleep(0.05)  # 增加等待时间，给网络栈更多处理时间
-                    
+
                     # 减少重试次数的计数器
                     retry_count = getattr(self, '_retry_count', 10)  # 增加默认重试次数
                     if retry_count <= 0:
                         elapsed = time.time() - start_time
-                        print(f"WARNING: EOF reading frame payload after {len(payload)}/{length} bytes (elapsed: {elapsed:.2f}s)")
+                        logger.warning("WARNING: EOF reading frame payload after %s/%s bytes (elapsed: %.2fs)", got, length, elapsed)
                         break
-                    
+
                     self._retry_count = retry_count - 1
                     continue
                 else:
                     # 重置重试计数器
                     self._retry_count = 10
-                
-                payload += chunk
-                remaining -= len(chunk)
-                
-                # 打印进度日志（对于大型载荷）
-                if length > 8192:
+
+                got += n
+
+                # 打印进度日志（对于大型载荷，仅 DEBUG 级别）
+                if length > 8192 and logger.enabled(DEBUG):
                     # 计算已完成百分比
-                    percent_complete = (len(payload) * 100) // length
+                    percent_complete = (got * 100) // length
                     # 每 25% 打印一次进度，避免重复日志
                     marker = percent_complete // 25
                     if marker not in progress_markers and marker > 0:
                         progress_markers.add(marker)
                         elapsed = time.time() - start_time
-                        print(f"Reading WebSocket frame: {len(payload)}/{length} bytes ({percent_complete}%) in {elapsed:.2f}s")
-                
+                        logger.debug("Reading WebSocket frame: %s/%s bytes (%s%%) in %.2fs", got, length, percent_complete, elapsed)
+
             except Exception as e:
-                print(f"Error reading WebSocket frame: {e}")
-                sys.print_exception(e)
+                logger.exc(e, "Error reading WebSocket frame: %s", e)
                 break
-        
+
         # 载荷读取完成后检查是否读取了声明的完整长度
-        if len(payload) < length:
+        if got < length:
             elapsed = time.time() - start_time
-            print(f"WARNING: Incomplete frame payload: got {len(payload)}/{length} bytes in {elapsed:.2f}s")
-        elif length > 8192:
+            logger.warning("WARNING: Incomplete frame payload: got %s/%s bytes in %.2fs", got, length, elapsed)
+            payload = payload[:got]
+        elif length > 8192 and logger.enabled(DEBUG):
             elapsed = time.time() - start_time
-            print(f"COMPLETE: Read full frame of {length} bytes in {elapsed:.2f}s")
-                
+            logger.debug("COMPLETE: Read full frame of %s bytes in %.2fs", length, elapsed)
+
         if has_mask:  # pragma: no cover
-            payload = bytes(x ^ mask[i % 4] for i, x in enumerate(payload))
-        
+            # 原地去掩码，不产生新的载荷副本
+            mask_inplace(payload, 0, len(payload), mask)
+
         return fin, opcode, payload
 
     async def receive(self):
@@ -251,6 +329,8 @@ class WebSocketClient:
         接收 WebSocket 消息，支持处理分片消息
         分片消息由多个帧组成，第一个帧的 opcode 指定了消息类型，
         后续帧的 opcode 为 0 (CONT)，最后一个帧的 fin 为 True
+        TEXT 消息返回 str (raw_text 为 True 时与 BINARY 一样返回载荷缓冲区)；
+        BINARY 消息直接返回载荷缓冲区的 memoryview，不再拷贝
         """
         # 用于收集分片消息的状态变量
         message_opcode = None
@@ -264,7 +344,7 @@ class WebSocketClient:
             while True:
                 # 检查接收时间是否过长
                 if time.time() - start_time > max_receive_time:
-                    print(f"WARNING: Receiving WebSocket message exceeded {max_receive_time}s timeout")
+                    logger.warning("WARNING: Receiving WebSocket message exceeded %ss timeout", max_receive_time)
                     if self.closed:
                         return self.CLOSE, b""
                     else:
@@ -274,9 +354,9 @@ class WebSocketClient:
                 
                 try:
                     fin, opcode, payload = await self._read_frame()
+                    _frames_rx.inc()
                 except Exception as e:
-                    print(f"Error in _read_frame: {e}")
-                    sys.print_exception(e)
+                    logger.exc(e, "Error in _read_frame: %s", e)
                     if self.closed:
                         return self.CLOSE, b""
                     else:
@@ -286,12 +366,13 @@ class WebSocketClient:
                 
                 # 处理控制帧 (PING, PONG, CLOSE)
                 if opcode in (self.PING, self.PONG, self.CLOSE):
-                    send_opcode, data = self._process_websocket_frame(opcode, payload)
+                    # 控制帧载荷很小 (<=125 字节)，转成 bytes 便于回显和打印
+                    send_opcode, data = self._process_websocket_frame(opcode, bytes(payload))
                     if send_opcode:  # pragma: no cover
                         try:
                             await self.send(data, send_opcode)
                         except Exception as e:
-                            print(f"Error sending control frame response: {e}")
+                            logger.error("Error sending control frame response: %s", e)
                     if opcode == self.CLOSE:
                         self.closed = True
                         return self.CLOSE, data
@@ -302,10 +383,12 @@ class WebSocketClient:
                 if opcode == self.CONT:
                     # 连续帧 - 必须已有一个消息开始
                     if message_opcode is None:
-                        print("ERROR: Received CONT frame without initial frame")
+                        logger.error("ERROR: Received CONT frame without initial frame")
                         continue
-                    # 将载荷添加到正在收集的消息中
-                    message_payload += payload
+                    # 将载荷添加到正在收集的消息中 (首帧是只读视图，需要时转成可扩展的 bytearray)
+                    if not isinstance(message_payload, bytearray):
+                        message_payload = bytearray(message_payload)
+                    message_payload.extend(payload)
                 else:
                     # 新的消息开始 (TEXT 或 BINARY)
                     message_opcode = opcode
@@ -321,18 +404,49 @@ class WebSocketClient:
                     message_opcode = None
                     message_payload = b""
         except Exception as e:
-            print(f"Unexpected error in receive: {e}")
-            sys.print_exception(e)
+            logger.exc(e, "Unexpected error in receive: %s", e)
             self.closed = True
             return self.CLOSE, b"error"
 
-    async def send(self, data, opcode=None):
-        frame = self._encode_websocket_frame(
-            opcode or (self.TEXT if isinstance(data, str) else self.BINARY), data
-        )
-        self.writer.write(frame)
+    async def queue(self, data, opcode=None):
+        """
+        编码一帧放入发送批次但不立即发送，返回后 data 即可复用
+        批次再放这一帧会超过 batch_max_bytes 时，先把已有的帧 flush 出去
+        """
+        if opcode is None:
+            opcode = self.TEXT if isinstance(data, str) else self.BINARY
+        if isinstance(data, str):
+            data = data.encode()
+        if self._batch_pos and self._batch_pos + self._frame_size(len(data)) > self.batch_max_bytes:
+            await self.flush()
+        self._append_frame(opcode, data)
+
+    async def flush(self):
+        """把批次中的所有帧一次写出并 drain"""
+        n = self._batch_pos
+        if not n:
+            return
+        frames = self._batch_frames
+        # 先清空批次再 await：drain 期间其他任务可以继续往批次里追加
+        self._batch_pos = 0
+        self._batch_frames = 0
+        self.flushes += 1
+        self.frames_flushed += frames
+        _frames_tx.inc(frames)
+        self.bytes_flushed += n
+        if frames > self.max_frames_per_flush:
+            self.max_frames_per_flush = frames
+        if n > self.max_bytes_per_flush:
+            self.max_bytes_per_flush = n
+        # StreamWriter.write 会把数据拷入自己的输出缓冲区，之后批次缓冲区即可复用
+        self.writer.write(memoryview(self._batch_buf)[:n])
         await self.writer.drain()
 
+    async def send(self, data, opcode=None):
+        """立即发送一帧 (连同批次中尚未发送的帧，保持顺序)"""
+        await self.queue(data, opcode)
+        await self.flush()
+
     async def close(self):
         if not self.closed:  # pragma: no cover
             self.closed = True
@@ -351,19 +465,18 @@ class ClientWebSocketResponse:
             msg_type, msg_data = await self.ws.receive()
             # 添加更多日志，帮助诊断
             if msg_type == self.ws.CLOSE:
-                print(f"WebSocket connection closing: {msg_data}")
+                logger.info("WebSocket connection closing: %s", msg_data)
                 self.ws.closed = True
                 raise StopAsyncIteration
             
             if not msg_data and self.ws.closed:
-                print("WebSocket already closed, stopping iteration")
+                logger.info("WebSocket already closed, stopping iteration")
                 raise StopAsyncIteration
                 
             msg = WebSocketMessage(msg_type, msg_data)
             return msg
         except Exception as e:
-            print(f"Error in __anext__: {e}")
-            sys.print_exception(e)
+            logger.exc(e, "Error in __anext__: %s", e)
             self.ws.closed = True
             raise StopAsyncIteration
 
@@ -380,12 +493,37 @@ class ClientWebSocketResponse:
             raise TypeError("data argument must be byte-ish (%r)" % type(data))
         await self.ws.send(data)
 
+    async def send_frame(self, data, opcode):
+        """发送已编码好的载荷 (bytes-like)，帧类型由调用方指定，不做类型检查和 JSON 序列化"""
+        await self.ws.send(data, opcode)
+
+    async def queue_frame(self, data, opcode):
+        """同 send_frame，但只放入发送批次，需要之后调用 flush()"""
+        await self.ws.queue(data, opcode)
+
+    async def queue_json(self, data):
+        """同 send_json，但只放入发送批次，需要之后调用 flush()"""
+        try:
+            payload = _json.dumps(data)
+        except Exception as e:
+            logger.error("%s", e)
+            logger.error("data: %s", data)
+            raise TypeError("data argument must be json-able")
+        await self.ws.queue(payload, self.ws.TEXT)
+
+    async def flush(self):
+        await self.ws.flush()
+
+    @property
+    def pending_bytes(self):
+        return self.ws.pending_bytes
+
     async def send_json(self, data):
         try:
             await self.send_str(_json.dumps(data))
         except Exception as e:
-            print(e)
-            print("data: ", data)
+            logger.error("%s", e)
+            logger.error("data: %s", data)
             raise TypeError("data argument must be json-able")
 
     async def receive_str(self):
@@ -405,9 +543,8 @@ class ClientWebSocketResponse:
             data = await self.receive_str()
             return _json.loads(data)
         except Exception as e:
-            sys.print_exception(e)
-            print("data: ", data)
-            print("data length: ", len(data) if data else 0)
+            logger.exc(e, "data: %s", data)
+            logger.error("data length: %s", len(data) if data else 0)
             raise TypeError("data argument must be json-able, error processing large JSON data")
 
 
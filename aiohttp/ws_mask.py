@@ -0,0 +1,57 @@
+# MicroPython aiohttp library
+# MIT license; Copyright (c) 2023 Carlos Gil
+# WebSocket 载荷掩码引擎：按 32 位字原地异或，避免逐字节的 Python 生成器
+
+import sys
+
+# MicroPython 上使用 viper 发射器；这段代码只在 MicroPython 下执行，CPython 不会求值装饰器和类型注解
+_VIPER = sys.implementation.name == "micropython"
+
+if _VIPER:
+    import micropython
+
+    @micropython.viper
+    def _mask_viper(buf: ptr8, start: int, n: int, key: ptr8):
+        p = start
+        i = 0
+        # 先逐字节处理到 4 字节对齐 (Xtensa 不允许非对齐的 32 位访问)
+        while i < n and ((int(buf) + p) & 3):
+            buf[p] ^= key[i & 3]
+            p += 1
+            i += 1
+        # 按当前相位旋转出小端序的 32 位掩码字
+        word = key[i & 3] | (key[(i + 1) & 3] << 8) | (key[(i + 2) & 3] << 16) | (key[(i + 3) & 3] << 24)
+        words = ptr32(int(buf) + p)
+        nw = (n - i) >> 2
+        j = 0
+        while j < nw:
+            words[j] ^= word
+            j += 1
+        p += nw << 2
+        i += nw << 2
+        # 剩余不足 4 字节的尾部
+        while i < n:
+            buf[p] ^= key[i & 3]
+            p += 1
+            i += 1
+
+
+def _mask_int(buf, start, n, key):
+    # 整个区间当作一个大整数做一次异或，循环全部在 C 里完成
+    view = memoryview(buf)[start:start + n]
+    pattern = (bytes(key) * ((n >> 2) + 1))[:n]
+    value = int.from_bytes(view, "little") ^ int.from_bytes(pattern, "little")
+    view[:] = value.to_bytes(n, "little")
+
+
+def mask_inplace(buf, start, n, key):
+    """
+    对 buf[start:start+n] 原地应用 4 字节 WebSocket 掩码 key
+    掩码与解掩码是同一个操作；buf 必须是可写的 bytearray/memoryview
+    """
+    if n <= 0:
+        return
+    if _VIPER:
+        _mask_viper(buf, start, n, key)
+    else:
+        _mask_int(buf, start, n, key)
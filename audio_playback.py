@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+# 音频播放管线：base64 音频增量按块流式解码到复用缓冲区，经抖动缓冲交给独立的播放线程写入 I2S
+import asyncio
+import time
+from hal import thread as _thread, ticks_ms as _ticks_ms
+import b64codec
+import metrics
+from ringbuf import ByteRing
+
+# 每块解码后的 PCM 字节数：3 的倍数 (对应整数个 base64 四字符组) 且为偶数 (整数个 16 位样本)
+PCM_BLOCK = 4092
+
+_underruns = metrics.counter("audio.underruns")
+_overruns = metrics.counter("audio.overruns")
+
+
+class Base64PcmWriter:
+    """
+    把 response.audio.delta 的 base64 文本边解码边写入 sink (I2S 或任何有 write() 的对象)
+    不再先解码出整段 PCM 再切片：每次只解码 PCM_BLOCK 字节到同一个缓冲区，
+    整块写入时直接传缓冲区本身，热循环里没有按块分配
+    """
+
+    def __init__(self, block=PCM_BLOCK, retries=50):
+        self.block_chars = block // 3 * 4
+        self._buf = bytearray(block // 3 * 3)
+        self._view = memoryview(self._buf)
+        self.retries = retries  # sink.write 连续返回 0 时最多重试次数 (每次等待 10ms)
+
+    def blocks(self, b64, start=0, end=None):
+        """逐块解码 b64[start:end]，每次产出本块解码到 self.buffer 中的字节数"""
+        if end is None:
+            end = len(b64)
+        pos = start
+        while pos < end:
+            stop = min(pos + self.block_chars, end)
+            yield b64codec.decode_into(b64, pos, stop, self._buf, 0)
+            pos = stop
+
+    @property
+    def buffer(self):
+        return self._buf
+
+    def write(self, sink, b64, start=0, end=None):
+        """
+        解码 b64[start:end] 并写入 sink，返回 (已写入字节数, 解码出的总字节数)
+        base64 非法时抛出 ValueError (之前已解码的块已经写入)
+        """
+        written = total = 0
+        for n in self.blocks(b64, start, end):
+            total += n
+            written += self._write_all(sink, n)
+        return written, total
+
+    def _write_all(self, sink, n):
+        # 满块直接传整个缓冲区；只有最后的短块和部分写入时才需要切片
+        buf = self._buf if n == len(self._buf) else self._view[:n]
+        off = 0
+        retries = self.retries
+        while off < n:
+            w = sink.write(buf if off == 0 else self._view[off:n])
+            if w <= 0:
+                retries -= 1
+                if retries <= 0:
+                    break
+                time.sleep(0.01)
+                continue
+            off += w
+        return off
+
+
+class JitterBuffer:
+    """
+    解码后 PCM 的有界抖动缓冲，生产者 (asyncio 接收循环) 与消费者 (播放线程) 通过锁共享
+    - 低水位：开始播放或欠载后，至少攒够 low 字节 (或流已结束) 才重新输出，避免断断续续
+    - 高水位：缓存超过 high 字节时生产者应暂停解码，把背压留给 TCP
+    - underruns：流进行中缓冲被取空的次数；overruns：因空间不足被丢弃写入的次数
+    """
+
+    def __init__(self, capacity, low, high):
+        self.ring = ByteRing(capacity)
+        self.low = low
+        self.high = high
+        self._lock = _thread.allocate_lock()
+        self.streaming = False  # 当前响应还有音频要来
+        self.priming = True     # 等待攒够低水位
+        self.underruns = 0
+        self.overruns = 0
+        self.dropped_bytes = 0
+        self.max_level = 0
+
+    @property
+    def level(self):
+        return self.ring.level
+
+    def start_stream(self):
+        """新的响应开始：重新等待攒够低水位 (end_stream 时清掉了 priming)"""
+        with self._lock:
+            self.streaming = True
+            self.priming = True
+
+    def end_stream(self):
+        """本次响应的音频已全部到达：剩余数据不再受低水位限制，直接播完"""
+        with self._lock:
+            self.streaming = False
+            self.priming = False
+
+    def flush(self):
+        """丢弃所有缓存 (例如连接重置)"""
+        with self._lock:
+            self.ring.clear()
+            self.streaming = False
+            self.priming = True
+
+    def put(self, src, n):
+        """写入 src[:n]，返回实际接收的字节数；放不下的部分计为 overrun 丢弃"""
+        with self._lock:
+            w = self.ring.write(src, n)
+            if w < n:
+                self.overruns += 1
+                _overruns.inc()
+                self.dropped_bytes += n - w
+            if self.ring.level > self.max_level:
+                self.max_level = self.ring.level
+            return w
+
+    def take(self, dst, n):
+        """播放线程调用：取出最多 n 字节到 dst，暂时无可播放数据时返回 0"""
+        with self._lock:
+            level = self.ring.level
+            if self.priming:
+                if level < self.low and self.streaming:
+                    return 0
+                self.priming = False
+            if level == 0:
+                if self.streaming:
+                    self.underruns += 1
+                    _underruns.inc()
+                    self.priming = True
+                return 0
+            return self.ring.read_into(dst, n)
+
+
+# 最近启动的播放阶段，显示等模块按它的播放进度同步 (见 fed_bytes / reached)
+active = None
+
+
+def fed_bytes():
+    """当前播放阶段累计放入缓冲的 PCM 字节数，没有播放阶段时为 0"""
+    stage = active
+    return stage.bytes_fed if stage is not None else 0
+
+
+def reached(mark):
+    """累计播放字节数是否已到 mark (fed_bytes() 的某次取值)；播放已停止时视为已到"""
+    stage = active
+    return stage is None or not stage.running or stage.bytes_played >= mark
+
+
+class PlaybackStage:
+    """
+    独立的播放阶段：接收循环只调用 feed() 把解码后的 PCM 放进抖动缓冲，
+    阻塞的 sink.write 在单独的 _thread 线程里进行，不再占用 asyncio 事件循环
+    """
+
+    def __init__(self, sink, capacity, low, high, out_block=2048):
+        self.sink = sink
+        self.jitter = JitterBuffer(capacity, low, high)
+        self._decoder = Base64PcmWriter()
+        self._out = bytearray(out_block)
+        self._out_view = memoryview(self._out)
+        self.running = False
+        self._stopped = True
+        # 缓冲里暂时没有可播放的数据时播放线程阻塞在 acquire 上，feed()/end_of_stream()/stop() 释放它
+        self._wake = _thread.allocate_lock()
+        self._wake.acquire()
+        self.first_write_ms = None  # 本轮响应第一个样本写入 sink 的时间戳 (ticks_ms)，供时延统计
+        self.bytes_fed = 0
+        self.bytes_played = 0
+
+    def start(self):
+        global active
+        if self.running:
+            return
+        active = self
+        self.running = True
+        self._stopped = False
+        _thread.start_new_thread(self._run, ())
+
+    def stop(self):
+        """通知播放线程退出 (异步生效，以 stopped 为准)"""
+        self.running = False
+        self._notify()
+
+    def _notify(self):
+        if self._wake.locked():
+            self._wake.release()
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    @property
+    def idle(self):
+        """流已结束且缓冲已播空"""
+        return not self.jitter.streaming and self.jitter.level == 0
+
+    async def feed(self, b64, start=0, end=None):
+        """
+        解码一段 base64 音频放入抖动缓冲，返回解码出的字节数
+        缓冲超过高水位时让出事件循环等待播放线程消费，而不是阻塞或丢数据
+        """
+        jitter = self.jitter
+        if not jitter.streaming:
+            jitter.start_stream()
+            self.first_write_ms = None
+        total = 0
+        buf = self._decoder.buffer
+        for n in self._decoder.blocks(b64, start, end):
+            while (jitter.level > jitter.high or jitter.ring.free() < n) and self.running:
+                await asyncio.sleep(0.005)
+            jitter.put(buf, n)
+            self._notify()
+            total += n
+        self.bytes_fed += total
+        return total
+
+    def end_of_stream(self):
+        self.jitter.end_stream()
+        self._notify()
+
+    async def wait_idle(self, poll=0.02):
+        """等待当前响应的音频全部播完"""
+        while self.running and not self.idle:
+            await asyncio.sleep(poll)
+
+    def _run(self):
+        jitter = self.jitter
+        out = self._out
+        view = self._out_view
+        size = len(out)
+        try:
+            while self.running:
+                n = jitter.take(out, size)
+                if not n:
+                    self._wake.acquire()
+                    continue
+                if self.first_write_ms is None:
+                    self.first_write_ms = _ticks_ms()
+                off = 0
+                while off < n and self.running:
+                    w = self.sink.write(out if (off == 0 and n == size) else view[off:n])
+                    if w <= 0:
+                        time.sleep(0.005)
+                        continue
+                    off += w
+                self.bytes_played += off
+        finally:
+            self._stopped = True
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# 音频上行编码器：把麦克风 PCM 块编码成 WebSocket 帧载荷
+# 每个编码器都持有一个复用的输出缓冲区，encode() 返回指向它的 memoryview，
+# 因此只能在单一消费者 (消息发送任务) 中调用，且要在下一次 encode() 前发送出去
+from aiohttp.aiohttp_ws import WebSocketClient
+import b64codec
+
+
+class JsonAudioEncoder:
+    """
+    input_audio_buffer.append 事件编码器
+    预先写好 JSON 前缀，base64 直接写在前缀之后再补上后缀，每块音频不再构造 dict 或调用 json.dumps
+    """
+    opcode = WebSocketClient.TEXT
+    PREFIX = b'{"type":"input_audio_buffer.append","audio":"'
+    SUFFIX = b'"}'
+
+    def __init__(self, chunk_size):
+        self._alloc(chunk_size)
+
+    def _alloc(self, chunk_size):
+        self._buf = bytearray(len(self.PREFIX) + b64codec.encoded_len(chunk_size) + len(self.SUFFIX))
+        self._buf[:len(self.PREFIX)] = self.PREFIX
+        self._view = memoryview(self._buf)
+
+    def encode(self, pcm):
+        n = len(pcm)
+        if len(self.PREFIX) + b64codec.encoded_len(n) + len(self.SUFFIX) > len(self._buf):
+            # 偶尔出现的超大块：扩容一次后继续复用
+            self._alloc(n)
+        end = b64codec.encode_into(pcm, n, self._buf, len(self.PREFIX))
+        self._view[end:end + len(self.SUFFIX)] = self.SUFFIX
+        return self._view[:end + len(self.SUFFIX)]
+
+
+class BinaryAudioEncoder:
+    """二进制帧模式：PCM 原样作为 BINARY 帧发送，仅适用于支持该模式的网关"""
+    opcode = WebSocketClient.BINARY
+
+    def __init__(self, chunk_size):
+        pass
+
+    def encode(self, pcm):
+        return pcm
+
+
+ENCODERS = {
+    "json": JsonAudioEncoder,
+    "binary": BinaryAudioEncoder,
+}
+
+
+def make_encoder(mode, chunk_size):
+    """按 config.AUDIO_UPLINK_MODE 创建编码器"""
+    try:
+        return ENCODERS[mode](chunk_size)
+    except KeyError:
+        raise ValueError("Unknown audio uplink mode: {}".format(mode))
+
+
+async def queue_audio(ws, encoder, pcm):
+    """编码一块 PCM 放入 ClientWebSocketResponse 的发送批次 (编码器缓冲区随即可复用)，由调用方 flush()"""
+    await ws.queue_frame(encoder.encode(pcm), encoder.opcode)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Base64 编解码到预分配缓冲区，音频热路径上不产生中间对象
+import sys
+import binascii
+
+_TABLE = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+# 解码反查表：非法字符为 0xFF
+_RTABLE = bytearray(b"\xff" * 256)
+for _i in range(64):
+    _RTABLE[_TABLE[_i]] = _i
+
+# viper 代码只在 MicroPython 下执行，CPython 不会求值装饰器和类型注解
+_VIPER = sys.implementation.name == "micropython"
+
+if _VIPER:
+    import micropython
+
+    @micropython.viper
+    def _encode_viper(src: ptr8, n: int, dst: ptr8, pos: int, table: ptr8) -> int:
+        i = 0
+        p = pos
+        while i + 2 < n:
+            v = (src[i] << 16) | (src[i + 1] << 8) | src[i + 2]
+            dst[p] = table[(v >> 18) & 63]
+            dst[p + 1] = table[(v >> 12) & 63]
+            dst[p + 2] = table[(v >> 6) & 63]
+            dst[p + 3] = table[v & 63]
+            i += 3
+            p += 4
+        rem = n - i
+        if rem == 1:
+            v = src[i] << 16
+            dst[p] = table[(v >> 18) & 63]
+            dst[p + 1] = table[(v >> 12) & 63]
+            dst[p + 2] = 61  # '='
+            dst[p + 3] = 61
+            p += 4
+        elif rem == 2:
+            v = (src[i] << 16) | (src[i + 1] << 8)
+            dst[p] = table[(v >> 18) & 63]
+            dst[p + 1] = table[(v >> 12) & 63]
+            dst[p + 2] = table[(v >> 6) & 63]
+            dst[p + 3] = 61
+            p += 4
+        return p
+
+    @micropython.viper
+    def _decode_viper(src: ptr8, start: int, end: int, dst: ptr8, pos: int, table: ptr8) -> int:
+        i = start
+        p = pos
+        while i < end:
+            a = table[src[i]]
+            b = table[src[i + 1]]
+            c = src[i + 2]
+            d = src[i + 3]
+            if (a | b) & 0x80:
+                return -1
+            if d == 61:  # '=' 只能出现在最后一组
+                dst[p] = (a << 2) | (b >> 4)
+                p += 1
+                if c != 61:
+                    c = table[c]
+                    if c & 0x80:
+                        return -1
+                    dst[p] = ((b << 4) | (c >> 2)) & 0xFF
+                    p += 1
+                return p
+            c = table[c]
+            d = table[d]
+            if (c | d) & 0x80:
+                return -1
+            v = (a << 18) | (b << 12) | (c << 6) | d
+            dst[p] = v >> 16
+            dst[p + 1] = (v >> 8) & 0xFF
+            dst[p + 2] = v & 0xFF
+            i += 4
+            p += 3
+        return p
+
+
+def encoded_len(n):
+    """n 字节原始数据编码后的 base64 长度 (含填充，不含换行)"""
+    return ((n + 2) // 3) * 4
+
+
+def encode_into(src, n, dst, pos):
+    """
+    把 src[:n] 的 base64 编码写入 dst[pos:]，返回写入后的结束位置
+    dst 需预留 encoded_len(n) 字节；MicroPython 上完全不分配内存
+    """
+    if _VIPER:
+        return int(_encode_viper(src, n, dst, pos, _TABLE))
+    data = binascii.b2a_base64(memoryview(src)[:n])
+    end = pos + len(data) - 1  # 去掉末尾换行
+    memoryview(dst)[pos:end] = memoryview(data)[:-1]
+    return end
+
+
+def decode_into(src, start, end, dst, pos):
+    """
+    把 base64 文本 src[start:end] 解码写入 dst[pos:]，返回写入后的结束位置
+    end - start 必须是 4 的倍数 (按 4 字符对齐的块流式解码)；dst 需预留 (end - start) // 4 * 3 字节
+    src 可以是 str/bytes/bytearray/memoryview；MicroPython 上完全不分配内存
+    """
+    if (end - start) & 3:
+        raise ValueError("base64 block not 4-char aligned")
+    if _VIPER:
+        p = int(_decode_viper(src, start, end, dst, pos, _RTABLE))
+        if p < 0:
+            raise ValueError("invalid base64 data")
+        return p
+    if isinstance(src, str):
+        src = src[start:end].encode()
+        start, end = 0, len(src)
+    try:
+        data = binascii.a2b_base64(memoryview(src)[start:end])
+    except binascii.Error as e:
+        raise ValueError(str(e))
+    end = pos + len(data)
+    memoryview(dst)[pos:end] = data
+    return end
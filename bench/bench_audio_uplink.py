@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+音频上行编码基准 (CPython)
+
+对比旧路径 (b2a_base64 -> decode -> strip -> dict -> json.dumps -> TEXT 帧) 与
+audio_uplink 编码器 + 复用发送缓冲区，输出每秒可编码的消息数和每块音频的瞬时分配峰值
+(CPython 上掩码走 int.from_bytes 路径，其临时大整数占了新路径的大部分分配；设备上的 viper 路径不分配)
+
+用法: python bench/bench_audio_uplink.py
+"""
+import binascii
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import audio_uplink  # noqa: E402
+from aiohttp.aiohttp_ws import WebSocketClient  # noqa: E402
+
+CHUNK = 1024  # 与 config.CHUNK 一致，16kHz/16bit 下约 32ms
+
+
+def legacy(ws, pcm):
+    audio_b64 = binascii.b2a_base64(pcm).decode("utf-8").strip()
+    msg = {"type": "input_audio_buffer.append", "audio": audio_b64}
+    return WebSocketClient._encode_websocket_frame(WebSocketClient.TEXT, json.dumps(msg))
+
+
+def make_new(mode):
+    encoder = audio_uplink.make_encoder(mode, CHUNK)
+
+    def new(ws, pcm):
+        ws._batch_pos = 0
+        ws._append_frame(encoder.opcode, encoder.encode(pcm))
+        return memoryview(ws._batch_buf)[:ws._batch_pos]
+    return new
+
+
+def measure(label, fn):
+    ws = WebSocketClient(None)
+    pcm = bytearray(os.urandom(CHUNK))
+    fn(ws, pcm)  # 预热，让复用缓冲区先分配好
+
+    n = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < 0.5:
+        fn(ws, pcm)
+        n += 1
+    rate = n / (time.perf_counter() - t0)
+
+    tracemalloc.start()
+    frame = fn(ws, pcm)  # 先在跟踪状态下跑一次，排除 tracemalloc 自身的一次性开销
+    del frame
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    frame = fn(ws, pcm)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<14} {rate:>10.0f} msg/s   {peak - base:>6} B/chunk   frame {len(frame)} B")
+
+
+def main():
+    print(f"PCM chunk {CHUNK} bytes")
+    measure("legacy", legacy)
+    measure("json template", make_new("json"))
+    measure("binary", make_new("binary"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+消息队列入队到上线 (enqueue-to-wire) 延迟 (CPython)
+
+生产者线程模拟录音线程，每 32ms 放入一块 1024 字节 PCM (偶尔连续放入 pre-roll 批次)，
+发送任务把消息写入一个模拟的 WebSocket，记录每条消息从 put 到写出的延迟，对比：
+- poll：deque + 锁，队列为空时 sleep 10ms (原 process_message_queue 的行为)
+- channel：channel.Channel，有消息立即唤醒，空闲时不轮询
+同时统计发送任务在空闲期间醒来的次数
+
+用法: python bench/bench_channel.py
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from channel import Channel  # noqa: E402
+
+CHUNK_INTERVAL = 0.032
+CHUNKS = 150
+
+
+class FakeWS:
+    def __init__(self):
+        self.latencies = []
+
+    async def send(self, item):
+        self.latencies.append(time.perf_counter() - item[0])
+
+
+def producer(put, done):
+    payload = bytes(1024)
+    for i in range(CHUNKS):
+        # 每 30 块模拟一次 ONSET：pre-roll 与当前块连续放入
+        burst = 3 if i % 30 == 0 else 1
+        for _ in range(burst):
+            put((time.perf_counter(), payload))
+        time.sleep(CHUNK_INTERVAL)
+    done.set()
+
+
+async def run_poll(ws, total):
+    q = deque((), 1024)
+    lock = threading.Lock()
+    wakeups = 0
+
+    def put(item):
+        with lock:
+            q.append(item)
+
+    done = threading.Event()
+    threading.Thread(target=producer, args=(put, done)).start()
+    while len(ws.latencies) < total:
+        item = None
+        with lock:
+            if q:
+                item = q.popleft()
+        if item:
+            await ws.send(item)
+        else:
+            wakeups += 1
+            await asyncio.sleep(0.01)
+    return wakeups
+
+
+async def run_channel(ws, total):
+    chan = Channel(1024)
+    wakeups = 0
+    done = threading.Event()
+    threading.Thread(target=producer, args=(chan.put, done)).start()
+    while len(ws.latencies) < total:
+        await chan.wait()
+        wakeups += 1
+        while True:
+            item = chan.pop()
+            if item is None:
+                break
+            await ws.send(item)
+    return wakeups
+
+
+def pct(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    total = sum(3 if i % 30 == 0 else 1 for i in range(CHUNKS))
+    for name, fn in (("poll", run_poll), ("channel", run_channel)):
+        ws = FakeWS()
+        wakeups = asyncio.run(fn(ws, total))
+        lat = sorted(ws.latencies)
+        print(f"{name:<8} {len(lat)} msgs  p50 {pct(lat, 0.5) * 1000:6.2f}ms  "
+              f"p95 {pct(lat, 0.95) * 1000:6.2f}ms  p99 {pct(lat, 0.99) * 1000:6.2f}ms  "
+              f"max {lat[-1] * 1000:6.2f}ms  loop wakeups {wakeups}")
+
+
+if __name__ == "__main__":
+    main()
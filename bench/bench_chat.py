@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+端到端基准 (CPython)：doubao_chat.chat_client 对接本地 mock_server
+
+设备代码原样运行，硬件由 hal 的 CPython 后端代替：麦克风按实时节拍循环播放
+"静音 - 说话 - 静音" (或 --mic-wav 指定的录音)，VAD 提交后服务端流式回复，扬声器按采样率消耗。
+每个场景跑若干轮对话，记录：
+- 吞吐：下行音频字节/秒、收发帧数
+- 内存：tracemalloc 峰值、metrics 中的 heap.free 最小值
+- 时延：tracer 各阶段的 p50/p95 (vad_commit->first_pcm 即说完到听到回复)
+- 播放欠载次数与事件分发耗时
+- 事件循环卡顿：探测任务每 10ms 醒一次，记录实际醒来比预定晚了多久的最大值
+
+每个场景在独立子进程中运行 (录音线程与全局状态互不干扰)，结果以 JSON 行汇总到父进程
+--record DIR 保存每个场景的扬声器输出 WAV 与屏幕截图 PNG；--profile DIR 保存主线程 (事件循环) 的 cProfile 数据，
+录音/播放线程可以用 py-spy 观察
+--config KEY=VALUE 在导入设备代码前覆盖 config.py 中的配置 (VALUE 按 JSON 解析，失败时当作字符串)，
+例如 --config DISPLAY_STREAM=false 对比整段显示与流式显示的 vad_commit->first_glyph，
+--config DISPLAY_THREAD=false 对比在事件循环里直接绘制 (表中 lag max 为事件循环被阻塞的最长时间)
+
+用法: python bench/bench_chat.py [--turns 3] [--speed 1] [--scenario 名字 ...] [--json]
+                                 [--mic-wav in.wav] [--record DIR] [--profile DIR] [--config KEY=VALUE ...]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import shim_env  # noqa: E402
+
+# 场景名 -> mock_server.MockOptions 参数
+SCENARIOS = {
+    "baseline": {},
+    "small-deltas": {"delta_ms": 20, "interval_ms": 10},
+    "burst": {"delta_ms": 500, "interval_ms": 0},
+    "fragmented": {"fragment_bytes": 1024},
+    "pings": {"ping_ms": 200},
+    "slow-server": {"first_delta_ms": 1200, "interval_ms": 100},
+    "error-event": {"fail": "error"},
+    "abort": {"fail": "abort", "fail_turn": 2},
+    "malformed": {"fail": "malformed", "fail_turn": 2},
+}
+
+
+def override_config(pairs):
+    """把 KEY=VALUE 写进 config 模块，须在导入 doubao_chat 之前调用"""
+    import config
+    for pair in pairs or ():
+        key, _, value = pair.partition("=")
+        try:
+            value = json.loads(value)
+        except ValueError:
+            pass
+        setattr(config, key, value)
+
+
+async def probe_lag(lags, period=0.01):
+    """事件循环卡顿探测：每 period 秒醒来一次，把迟到的毫秒数记入 lags"""
+    while True:
+        t = time.monotonic()
+        await asyncio.sleep(period)
+        lags.append((time.monotonic() - t - period) * 1000)
+
+
+async def run_scenario(name, turns, speed, mic_wav=None, record=None, config=None):
+    speaker_wav = os.path.join(record, name + "-speaker.wav") if record else None
+    shim_env.install(speed, mic_wav, speaker_wav)
+    override_config(config)
+    import mock_server
+    import doubao_chat
+    import display_events
+    import log
+    import metrics
+    import tracer
+    from hal import I2S
+
+    log.set_level(os.environ.get("BENCH_LOG_LEVEL", "warning"))
+    opts = mock_server.MockOptions(max_turns=turns, **SCENARIOS[name])
+    server = await mock_server.MockServer(opts).start()
+    doubao_chat.WS_URL = server.url
+
+    tracemalloc.start()
+    lags = []
+    probe = asyncio.create_task(probe_lag(lags))
+    t0 = time.monotonic()
+    asyncio.create_task(doubao_chat.events.start_plugins())  # 与 main_ai 一样，屏幕初始化与握手并行
+    try:
+        # 客户端在服务端正常关闭后退出；故障场景不会自动重连，超时兜底
+        await asyncio.wait_for(doubao_chat.chat_client(), timeout=30 + turns * 15 / speed)
+        status = "ok"
+    except asyncio.TimeoutError:
+        status = "timeout"
+    elapsed = time.monotonic() - t0
+    probe.cancel()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await server.stop()
+    if record:
+        await display_events.get_worker().wait_idle()
+        display_events.get_display().tft.save_png(os.path.join(record, name + "-screen.png"))
+
+    snap = metrics.registry.snapshot()
+    heap = snap.get("heap.free") or {}
+    speakers = [i for i in I2S.instances if i.mode == I2S.TX]
+    played = sum(i.bytes_written for i in speakers)
+    return {
+        "scenario": name,
+        "status": status,
+        "elapsed_s": round(elapsed, 2),
+        "turns": tracer.tracer.count,
+        "server": server.stats.as_dict(),
+        "audio_rx_bytes_per_s": round(server.stats.audio_out_bytes / elapsed),
+        "audio_played_bytes": played,
+        "frames_rx": snap.get("ws.frames_rx"),
+        "frames_tx": snap.get("ws.frames_tx"),
+        "underruns": snap.get("audio.underruns"),
+        "peak_alloc_bytes": peak,
+        "heap_free_min": heap.get("min"),
+        "loop_lag_ms": {"p95": round(sorted(lags)[int(len(lags) * 0.95)], 1), "max": round(max(lags), 1)}
+        if lags else {},
+        "display_draw_ms": snap.get("display.draw_ms"),
+        "display_dropped": snap.get("display.dropped"),
+        "latency": {row[0]: {"n": row[1], "p50": row[2], "p95": row[3], "max": row[4]}
+                    for row in tracer.tracer.summary()},
+        "dispatch_us": {k: round(v[1] / v[0]) for k, v in doubao_chat.events.router.stats.items()},
+    }
+
+
+def child(args):
+    run = lambda: asyncio.run(run_scenario(args.child, args.turns, args.speed, args.mic_wav, args.record,  # noqa: E731
+                                           args.config))
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        result = profiler.runcall(run)
+        profiler.dump_stats(os.path.join(args.profile, args.child + ".prof"))
+    else:
+        result = run()
+    sys.stdout.write("RESULT " + json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def run_child(name, args):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", name,
+           "--turns", str(args.turns), "--speed", str(args.speed)]
+    for flag in ("mic_wav", "record", "profile"):
+        value = getattr(args, flag)
+        if value:
+            cmd += ["--" + flag.replace("_", "-"), os.path.abspath(value)]
+    for pair in args.config or ():
+        cmd += ["--config", pair]
+    proc = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+    for line in proc.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[7:])
+    return {"scenario": name, "status": "crashed", "stderr": proc.stderr[-2000:]}
+
+
+def print_table(results):
+    print("{:<14} {:>8} {:>6} {:>8} {:>10} {:>8} {:>8} {:>9} {:>9} {:>9} {:>9} {:>8}".format(
+        "scenario", "status", "turns", "time s", "audio B/s", "rx/tx", "underrun",
+        "peak KB", "c->pcm50", "c->pcm95", "c->glyph50", "lag max"))
+    for r in results:
+        if r["status"] == "crashed":
+            print("{:<14} {:>8}".format(r["scenario"], "crashed"))
+            print(r["stderr"])
+            continue
+        e2e = r["latency"].get("vad_commit->first_pcm", {})
+        glyph = r["latency"].get("vad_commit->first_glyph", {})
+        print("{:<14} {:>8} {:>6} {:>8} {:>10} {:>8} {:>8} {:>9} {:>9} {:>9} {:>9} {:>8}".format(
+            r["scenario"], r["status"], r["turns"], r["elapsed_s"], r["audio_rx_bytes_per_s"],
+            "%s/%s" % (r["frames_rx"], r["frames_tx"]), r["underruns"],
+            r["peak_alloc_bytes"] // 1024, e2e.get("p50", "-"), e2e.get("p95", "-"), glyph.get("p50", "-"),
+            r["loop_lag_ms"].get("max", "-")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="doubao_chat 端到端基准 (对接 mock_server)")
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--scenario", nargs="+", action="extend", choices=sorted(SCENARIOS),
+                        metavar="名字", help="要运行的场景 (可以写多个，也可以重复 --scenario)；默认全部")
+    parser.add_argument("--json", action="store_true", help="输出完整 JSON 结果")
+    parser.add_argument("--mic-wav", help="麦克风输入 WAV (16kHz/16bit/单声道)")
+    parser.add_argument("--record", help="保存扬声器 WAV 与屏幕 PNG 的目录")
+    parser.add_argument("--profile", help="保存 cProfile 数据的目录")
+    parser.add_argument("--config", action="append", metavar="KEY=VALUE", help="覆盖 config.py 中的配置")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+    for path in (args.record, args.profile):
+        if path:
+            os.makedirs(path, exist_ok=True)
+    results = []
+    for name in args.scenario or SCENARIOS:
+        results.append(run_child(name, args))
+    if args.json:
+        for r in results:
+            print(json.dumps(r, ensure_ascii=False))
+    else:
+        print_table(results)
+        for r in results:
+            if r.get("latency"):
+                print("\n[%s] 各阶段时延 (ms)" % r["scenario"])
+                for stage, v in r["latency"].items():
+                    print("  {:<28} n={:<3} p50={:<6} p95={:<6} max={}".format(stage, v["n"], v["p50"], v["p95"], v["max"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+服务端事件分拣基准 (CPython)
+
+按一次典型回复的事件序列 (session/response 控制事件、文本增量、5~60KB 的 response.audio.delta)
+构造原始 TEXT 载荷，对比：
+- json.loads：载荷解码成 str -> json.loads -> 取 delta 字符串解码 (原 receive_with_timeout 的行为)
+- event_sniff：event_sniff.parse 分拣，音频增量直接把 delta 区间交给 Base64PcmWriter 流式解码
+输出每条事件的平均耗时和单条最大音频增量的瞬时内存峰值，并校验两条路径的结果一致
+也可以用 JSONL 抓包文件 (每行一个服务端事件) 替换合成序列：python bench/bench_event_sniff.py trace.jsonl
+
+用法: python bench/bench_event_sniff.py [trace.jsonl]
+"""
+import binascii
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import audio_playback  # noqa: E402
+import event_sniff  # noqa: E402
+
+
+def synthetic_trace(seed=11):
+    rnd = random.Random(seed)
+    events = [
+        {"type": "session.created", "event_id": "e1",
+         "session": {"id": "sess_1", "tools": [{"type": "function", "name": "get_weather"}],
+                     "turn_detection": {"type": "server_vad"}}},
+        {"type": "input_audio_buffer.committed", "event_id": "e2", "item_id": "item_1"},
+        {"event_id": "e3", "type": "response.created", "response": {"id": "resp_1", "status": "in_progress"}},
+    ]
+    for i in range(40):
+        if i % 4 == 0:
+            events.append({"type": "response.audio_transcript.delta", "response_id": "resp_1",
+                           "delta": "好的，\"今天\"天气\\不错"})
+        pcm = os.urandom(rnd.choice((4000, 12000, 24000, 45000)))
+        # 部分事件把 delta 放在 type 前面，覆盖字段顺序不固定的情况
+        if i % 3 == 0:
+            events.append({"delta": binascii.b2a_base64(pcm)[:-1].decode(), "event_id": "a%d" % i,
+                           "type": "response.audio.delta", "response_id": "resp_1", "content_index": 0})
+        else:
+            events.append({"event_id": "a%d" % i, "type": "response.audio.delta", "response_id": "resp_1",
+                           "item_id": "item_2", "output_index": 0, "content_index": 0,
+                           "delta": binascii.b2a_base64(pcm)[:-1].decode()})
+    events.append({"type": "response.audio.done", "event_id": "e4"})
+    events.append({"type": "response.done", "event_id": "e5", "response": {"id": "resp_1", "output": []}})
+    return [bytearray(json.dumps(e, ensure_ascii=False).encode()) for e in events]
+
+
+def load_trace(path):
+    with open(path, "rb") as f:
+        return [bytearray(line.strip()) for line in f if line.strip()]
+
+
+class NullSink:
+    def write(self, buf):
+        return len(buf)
+
+
+def legacy(payload, writer, sink):
+    data = json.loads(str(payload, "utf-8"))
+    if data.get("type") == "response.audio.delta":
+        return data["type"], writer.write(sink, data["delta"])[1]
+    return data.get("type"), None
+
+
+def sniffed(payload, writer, sink):
+    event_type, data, start, end = event_sniff.parse(memoryview(payload))
+    if data is None:
+        return event_type, writer.write(sink, payload, start, end)[1]
+    return event_type, None
+
+
+def main():
+    trace = load_trace(sys.argv[1]) if len(sys.argv) > 1 else synthetic_trace()
+    writer = audio_playback.Base64PcmWriter()
+    sink = NullSink()
+    for payload in trace:
+        assert legacy(payload, writer, sink) == sniffed(payload, writer, sink), bytes(payload[:80])
+    audio = [p for p in trace if sniffed(p, writer, sink)[1] is not None]
+    print(f"{len(trace)} events, {len(audio)} audio deltas, "
+          f"{sum(map(len, trace)) / 1024:.0f} KB total, largest {max(map(len, trace)) / 1024:.0f} KB")
+    biggest = max(trace, key=len)
+    for label, fn in (("json.loads", legacy), ("event_sniff", sniffed)):
+        t0 = time.perf_counter()
+        rounds = 0
+        while time.perf_counter() - t0 < 1.0:
+            for payload in trace:
+                fn(payload, writer, sink)
+            rounds += 1
+        per_event = (time.perf_counter() - t0) / (rounds * len(trace))
+        tracemalloc.start()
+        fn(biggest, writer, sink)
+        tracemalloc.reset_peak()
+        fn(biggest, writer, sink)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {label:<12} {per_event * 1e6:8.1f} us/event   peak {peak / 1024:6.1f} KB on {len(biggest) / 1024:.0f} KB delta")
+
+
+if __name__ == "__main__":
+    main()
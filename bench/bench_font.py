@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+中文字库加载基准 (CPython)：proverbs_20.py 模块 vs binfont 二进制字库
+
+- 加载耗时与加载后常驻内存 (tracemalloc)
+- 取字形耗时，以及不同 LRU 缓存大小下的命中率，两种文本：
+  同一段文本重复 4 次 (循环里不同的字比缓存槽位多时 LRU 几乎总被挤掉，只能看出最坏情况)；
+  一组各不相同的对话回复 (常用字反复出现，接近实际使用，用来选 DISPLAY_GLYPH_CACHE)
+设备上导入 proverbs_20.py 还要先编译约 1MB 源码，差距比这里更大；设备上未命中要从 flash 读两次，比这里慢得多
+
+用法: python bench/bench_font.py [proverbs_20.fnt]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import binfont  # noqa: E402
+
+TEXT = ("你好呀！我是Evelyn老师，今天我们一起来学习新的英文单词吧。Apple 就是苹果的意思哦，哈哈。"
+        "这是一个由虾哥开源的ESP32项目，以MIT许可证发布，允许任何人免费使用，或用于商业用途。"
+        "如果你有任何想法或建议，请随时提出Issues或加入QQ群。") * 4
+
+DIALOG = "".join((
+    "你好！我是豆包，有什么可以帮你的吗？",
+    "今天北京晴，最高气温二十六度，最低十五度，早晚温差比较大，出门记得带件外套。",
+    "好的，已经为你设置明天早上七点的闹钟。记得早点休息，祝你好梦！",
+    "苹果的英文是apple，香蕉是banana，橙子是orange，你可以跟着我读一遍。",
+    "这首诗是李白写的《静夜思》：床前明月光，疑是地上霜。举头望明月，低头思故乡。",
+    "番茄炒蛋的做法很简单：先把鸡蛋打散炒熟盛出，再炒番茄出汁，最后把鸡蛋倒回去，加一点盐和糖就可以了。",
+    "一公里等于一千米，一米等于一百厘米，所以一公里等于十万厘米。",
+    "我没有听清楚你的问题，可以再说一遍吗？",
+    "现在是下午三点二十分，距离你设置的会议提醒还有四十分钟。",
+    "地球绕太阳公转一周大约需要三百六十五天，这就是一年的长度。",
+    "当然可以！我们来玩成语接龙吧，我先说：一心一意。",
+    "意气风发，该你啦！如果想不出来，可以说提示，我会帮你想一个。",
+    "小朋友每天应该睡够十个小时左右，充足的睡眠有助于长高和保持好心情。",
+    "好的，下次见！有需要随时叫我。",
+))
+
+
+def measure(load):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    font = load()
+    elapsed = time.perf_counter() - t0
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return font, elapsed, current
+
+
+def load_module():
+    sys.modules.pop("proverbs_20", None)
+    import proverbs_20
+    return proverbs_20
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, "proverbs_20.fnt")
+    _, t_mod, m_mod = measure(load_module)
+    font, t_bin, m_bin = measure(lambda: binfont.BinFont(path))
+    print("加载 (首次导入含编译，之后走 __pycache__)")
+    print(f"  proverbs_20.py   {t_mod * 1000:8.1f} ms   常驻 {m_mod // 1024:6d} KB")
+    print(f"  {os.path.basename(path):<16} {t_bin * 1000:8.1f} ms   常驻 {m_bin // 1024:6d} KB  ({font.count} 字形)")
+
+    for label, text in (("重复 4 次的文本", TEXT), ("各不相同的对话回复", DIALOG)):
+        print(f"\n取字形：{label} ({len(text)} 字符，{len(set(text))} 个不同的字)")
+        for size in (8, 16, 32, 64, 128, 256):
+            font = binfont.BinFont(path, cache_size=size)
+            t0 = time.perf_counter()
+            for ch in text:
+                i = font.index(ch)
+                if i >= 0:
+                    font.bitmap(i)
+            elapsed = time.perf_counter() - t0
+            total = font.hits + font.misses
+            print(f"  cache={size:<3} {elapsed / total * 1e6:6.2f} us/字形   命中率 {font.hits / total:6.1%}   "
+                  f"文件读取 {font.misses:4d} 次   缓存 {len(font._cache) // 1024:3d} KB")
+            font.close()
+
+
+if __name__ == "__main__":
+    main()
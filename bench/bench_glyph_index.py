@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+字形查找基准 (CPython)：MAP 线性查找 vs glyph_index 查找表
+
+对一段中英混排文本逐字取 (字形序号, 宽度)，输出 chars/s：
+- 线性：英文 `ch in MAP` + MAP.index，中文 MAP.find (即 tft.write_len / C 驱动 write 内部的做法)
+- 查找表：glyph_index.find + 字宽表
+CPython 的 str.find 是 C 实现的 memchr 类搜索，设备上 C 驱动要逐个解码 UTF-8 的 MAP，
+且 MicroPython 的 str.index 还要把字节偏移换算成字符序号，线性做法在设备上相对更慢
+这里 glyph_index 与设备上是同一条路径 (ASCII 表 + 二分)，只是二分用的是 viper 内核的纯 Python 回退，
+逐次比较都在解释器里，CPython 上反而比 C 实现的 str.find 慢；设备上的对比要在板子上用 ticks_us 计时
+
+用法: python bench/bench_glyph_index.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import glyph_index  # noqa: E402
+import inconsolata_16  # noqa: E402
+import proverbs_20  # noqa: E402
+
+TEXT = ("你好呀！我是Evelyn老师，今天我们一起来学习新的英文单词吧。Apple 就是苹果的意思哦，哈哈。"
+        "We hope this project helps you understand AI hardware development. 如果你有任何想法或建议，请随时提出Issues。") * 20
+REPEAT = 20
+
+
+def is_chinese(ch):
+    code = ord(ch)
+    return 0x4E00 <= code <= 0x9FFF or code in (0xFF0C, 0xFF0E, 0xFF1A, 0xFF1B, 0xFF01, 0xFF1F, 0x2E, 0x21, 0x3F)
+
+
+def linear(text):
+    cmap = proverbs_20.MAP
+    cwidths = proverbs_20.WIDTHS
+    emap = inconsolata_16.MAP
+    total = 0
+    for ch in text:
+        if is_chinese(ch):
+            i = cmap.find(ch)
+            if i >= 0:
+                total += cwidths[i]
+        elif ch in emap:
+            emap.index(ch)
+            total += inconsolata_16.WIDTH
+    return total
+
+
+def indexed(text, chinese, english):
+    total = 0
+    for ch in text:
+        if is_chinese(ch):
+            total += chinese.width(ch)
+        elif english.find(ch) >= 0:
+            total += english.widths[0]
+    return total
+
+
+def rate(fn, text=TEXT):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return len(text) * REPEAT / (time.perf_counter() - t0)
+
+
+def main():
+    t0 = time.perf_counter()
+    chinese = glyph_index.from_map(proverbs_20.MAP, proverbs_20.WIDTHS)
+    english = glyph_index.from_map(inconsolata_16.MAP, width=inconsolata_16.WIDTH)
+    build_ms = (time.perf_counter() - t0) * 1000
+    assert linear(TEXT) == indexed(TEXT, chinese, english)
+    print(f"建表耗时 {build_ms:.1f} ms ({len(chinese.codes)} + {len(english.codes)} 字形)")
+    print("中英混排回复文本")
+    print(f"  线性 MAP 查找   {rate(lambda: linear(TEXT)):12.0f} chars/s")
+    print(f"  glyph_index     {rate(lambda: indexed(TEXT, chinese, english)):12.0f} chars/s")
+
+    # 最坏情况：MAP 末尾的字 (线性查找要扫过整个 MAP)
+    tail = proverbs_20.MAP[-50:] * 40
+    print("MAP 末尾的 50 个字")
+    print(f"  线性 MAP 查找   {rate(lambda: linear(tail), tail):12.0f} chars/s")
+    print(f"  glyph_index     {rate(lambda: indexed(tail, chinese, english), tail):12.0f} chars/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+播放抖动缓冲仿真 (CPython)
+
+用按 16kHz/16bit 实时速率消费数据的模拟 I2S (write 按数据时长阻塞) 回放一段带网络抖动的
+response.audio.delta 序列，对比：
+- 同步写入：在事件循环里直接 Base64PcmWriter.write (原 play_audio_data 的行为)
+- PlaybackStage：接收端只 feed() 入队，播放线程写 I2S
+同时运行一个每 10ms 醒一次的"心跳"任务，统计事件循环最长卡顿，代表收帧/回 PONG 的及时性
+最后用同一个 PlaybackStage 连续回放几轮响应 (中间有停顿)，逐轮统计欠载，
+检查第二轮起是否同样先攒够低水位再开始播放
+
+用法: python bench/bench_jitter.py
+"""
+import asyncio
+import binascii
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import audio_playback  # noqa: E402
+
+RATE = 16000
+BYTES_PER_S = RATE * 2
+
+
+class ClockedI2S:
+    """模拟 I2S：DMA 缓冲装满后 write 按音频时长阻塞，体现真实的播放时钟"""
+
+    def __init__(self, dma=4096):
+        self.dma = dma
+        self.queued = 0.0  # DMA 中尚未播放完的秒数
+        self.last = time.perf_counter()
+        self.total = 0
+
+    def write(self, buf):
+        now = time.perf_counter()
+        self.queued = max(0.0, self.queued - (now - self.last))
+        self.last = now
+        n = len(buf)
+        limit = self.dma / BYTES_PER_S
+        over = self.queued + n / BYTES_PER_S - limit
+        if over > 0:
+            time.sleep(over)
+            self.queued -= over
+            self.last = time.perf_counter()
+        self.queued += n / BYTES_PER_S
+        self.total += n
+        return n
+
+
+def make_deltas(seconds=3, seed=3):
+    """服务端大约按实时速率推送 0.1~0.3s 的音频块，到达间隔带 ±60ms 抖动，偶尔成批到达"""
+    rnd = random.Random(seed)
+    deltas = []
+    t = 0.0
+    sent = 0.0
+    while sent < seconds:
+        dur = rnd.choice((0.1, 0.2, 0.3))
+        pcm = os.urandom(int(dur * BYTES_PER_S) & ~1)
+        deltas.append((t, binascii.b2a_base64(pcm)[:-1].decode()))
+        sent += dur
+        t += dur * 0.9 + rnd.uniform(-0.06, 0.06) * (0 if rnd.random() < 0.2 else 1)
+    return deltas
+
+
+async def heartbeat(stats, stop):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(0.01)
+        stats.append(time.perf_counter() - t0 - 0.01)
+
+
+async def scenario(name, deltas):
+    sink = ClockedI2S()
+    stats = []
+    stop = asyncio.Event()
+    hb = asyncio.create_task(heartbeat(stats, stop))
+    start = time.perf_counter()
+    stage = None
+    if name == "sync":
+        writer = audio_playback.Base64PcmWriter()
+    else:
+        stage = audio_playback.PlaybackStage(sink, 32768, 6400, 24576)
+        stage.start()
+    for at, b64 in deltas:
+        delay = at - (time.perf_counter() - start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if stage is None:
+            writer.write(sink, b64)
+        else:
+            await stage.feed(b64)
+    if stage is not None:
+        stage.end_of_stream()
+        await stage.wait_idle()
+        stage.stop()
+    stop.set()
+    await hb
+    elapsed = time.perf_counter() - start
+    stats.sort()
+    p99 = stats[int(len(stats) * 0.99) - 1] if stats else 0
+    print(f"  {name:<6} played {sink.total / BYTES_PER_S:.2f}s audio in {elapsed:.2f}s, "
+          f"loop stall max {stats[-1] * 1000:.0f}ms p99 {p99 * 1000:.0f}ms")
+    if stage is not None:
+        j = stage.jitter
+        print(f"         underruns {j.underruns}, overruns {j.overruns}, max level {j.max_level} bytes")
+
+
+async def turns(count, gap=0.5):
+    """同一个播放阶段连续 count 轮相同的响应，每轮之间等播完再停顿 gap 秒；各轮欠载数应与第一轮相同"""
+    sink = ClockedI2S()
+    stage = audio_playback.PlaybackStage(sink, 32768, 6400, 24576)
+    stage.start()
+    j = stage.jitter
+    per_turn = []
+    deltas = make_deltas()
+    for _ in range(count):
+        before = j.underruns
+        start = time.perf_counter()
+        for at, b64 in deltas:
+            delay = at - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await stage.feed(b64)
+        stage.end_of_stream()
+        await stage.wait_idle()
+        per_turn.append(j.underruns - before)
+        await asyncio.sleep(gap)
+    stage.stop()
+    print(f"  {count} turns, underruns per turn {per_turn}, played {sink.total / BYTES_PER_S:.2f}s audio")
+
+
+def main():
+    deltas = make_deltas()
+    print(f"{len(deltas)} deltas")
+    asyncio.run(scenario("sync", deltas))
+    asyncio.run(scenario("staged", deltas))
+    print("consecutive responses")
+    asyncio.run(turns(3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+圆形屏幕排版基准 (CPython，屏幕为 hal 的帧缓冲实现)：text_layout.LayoutEngine
+
+- 折行质量：同一组文本关闭/打开折行规则 (英文按单词、中文避头尾) 时，行首出现收尾标点、单词被拆开的次数
+- 排版耗时：每段文本重新排版 vs 命中 mix_display 的排版缓存 (按文本哈希)
+--show 打印打开规则后每行的内容
+
+用法: python bench/bench_layout.py [--repeat 200] [--show]
+"""
+import argparse
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import shim_env  # noqa: E402
+
+TEXTS = [
+    "这是一个由虾哥开源的ESP32项目，以MIT许可证发布，允许任何人免费使用，或用于商业用途。"
+    "We hope this project helps you understand AI hardware development and apply large language "
+    "models to real devices. 如果你有任何想法或建议，请随时提出Issues或加入QQ群：575180511。",
+    "你好！我是豆包，有什么可以帮你的吗？今天天气晴朗，气温二十五度，适合出门散步。",
+    "好的，已经为你设置明天早上七点的闹钟。记得早点休息，祝你好梦！",
+    "The quick brown fox jumps over the lazy dog, while the small robot keeps listening for your voice.",
+    "我们可以一起学习英语：apple 是苹果，banana 是香蕉，orange 是橙子，watermelon 是西瓜。",
+    "今天的新闻有三条：第一，天气转凉；第二，地铁新线开通；第三，图书馆延长开放时间。",
+]
+
+
+def lines(layout):
+    for i in range(len(layout.line_y)):
+        yield layout.line_start[i], layout.line_end(i)
+
+
+def positions(layout, text):
+    """每个排好的字在 text 中的位置 (跳过字库中没有的字和折行后丢掉的空格)"""
+    pos = []
+    j = 0
+    for code in layout.codes:
+        while ord(text[j]) != code:
+            j += 1
+        pos.append(j)
+        j += 1
+    return pos
+
+
+def violations(layout, text):
+    """(行首是收尾标点的行数, 单词被拆到两行的次数)"""
+    import text_layout
+    codes = layout.codes
+    pos = positions(layout, text)
+    bad_start = 0
+    split = 0
+    for start, end in lines(layout):
+        if start and end > start:
+            if codes[start] in text_layout.NO_LINE_START:
+                bad_start += 1
+            if pos[start] == pos[start - 1] + 1 and text_layout._is_word(codes[start - 1]) \
+                    and text_layout._is_word(codes[start]):
+                split += 1
+    return bad_start, split
+
+
+def main():
+    parser = argparse.ArgumentParser(description="圆形屏幕排版：折行规则与排版缓存")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--show", action="store_true", help="打印打开规则后每行的内容")
+    args = parser.parse_args()
+    shim_env.install(100)
+    import mix_display
+    import text_layout
+    display = mix_display.CircularTextDisplay()
+
+    print("折行规则        行首标点  拆开的单词  行数")
+    for label, rules in (("关闭", False), ("打开", True)):
+        bad = split = count = 0
+        for text in TEXTS:
+            layout = text_layout.LayoutEngine(display._measure, display.line_height, False, rules, rules)
+            layout.feed(text)
+            b, s = violations(layout, text)
+            bad += b
+            split += s
+            count += len(layout.line_y)
+            if rules and args.show:
+                for start, end in lines(layout):
+                    print("    " + "".join(chr(c) for c in layout.codes[start:end]))
+                print()
+        print(f"{label:<12} {bad:8d} {split:11d} {count:5d}")
+
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in TEXTS:
+            text_layout.LayoutEngine(display._measure, display.line_height, display.scroll).feed(text)
+    fresh = (time.perf_counter() - t0) * 1e6 / (args.repeat * len(TEXTS))
+    mix_display.DISPLAY_LAYOUT_CACHE = len(TEXTS)
+    for text in TEXTS:
+        display._layout_text(text)
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in TEXTS:
+            display._layout_text(text)
+    cached = (time.perf_counter() - t0) * 1e6 / (args.repeat * len(TEXTS))
+    print(f"\n每段排版 {fresh:8.1f} us   命中缓存 {cached:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
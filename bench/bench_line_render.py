@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+文字渲染方式对比 (CPython，屏幕为 hal 的帧缓冲实现)：逐字 fill_rect + write/bitmap vs 行缓冲 blit_buffer
+
+对同一段中英混排文本分别用两种方式 display_text，输出：
+- chars/s (CPython 上两边都是纯 Python 的逐像素循环，只作相对参考；设备上行缓冲展开走 viper)
+- SPI 事务数与传输字节：每次绘制调用都要发 CASET/RASET/RAMWR 设置地址窗口 (约 11 字节命令/参数)
+- 两种方式的帧缓冲是否一致
+
+用法: python bench/bench_line_render.py [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import shim_env  # noqa: E402
+
+TEXT = ("你好呀！我是Evelyn老师，今天我们一起来学习新的英文单词吧。Apple 就是苹果的意思哦，哈哈。"
+        "如果你有任何想法或建议，请随时提出Issues或加入QQ群：575180511")
+WINDOW_BYTES = 11  # 每次绘制调用设置地址窗口的命令与参数字节
+
+
+def run(line_buffer, repeat):
+    import config
+    config.DISPLAY_LINE_BUFFER = line_buffer
+    config.DISPLAY_SCROLL = False  # 只比较绘制方式，换页都用清屏
+    import mix_display
+    from hal import gc9a01
+    display = mix_display.CircularTextDisplay()
+    tft = display.tft
+    elapsed = 0.0
+    for _ in range(repeat):
+        tft.calls.clear()
+        tft.pixels = 0
+        tft.spi_us = 0.0
+        t0 = time.perf_counter()
+        display.display_text(TEXT, color=gc9a01.WRAP_V, bg_color=gc9a01.WHITE, char_delay=0)
+        elapsed += time.perf_counter() - t0
+    calls = {k: v for k, v in tft.calls.items() if k != "fill"}  # 清屏两种方式相同，不计入
+    transactions = sum(calls.values())
+    pixels = tft.pixels - tft.calls.get("fill", 0) * tft.width() * tft.height()
+    return {
+        "chars_per_s": len(TEXT) * repeat / elapsed,
+        "calls": calls,
+        "transactions": transactions,
+        "spi_bytes": pixels * 2 + transactions * WINDOW_BYTES,
+        "framebuffer": bytes(tft.framebuffer),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="逐字绘制 vs 行缓冲 blit_buffer")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    shim_env.install(100)
+    results = {}
+    for label, line_buffer in (("逐字 write/bitmap", False), ("行缓冲 blit_buffer", True)):
+        for name in ("config", "mix_display"):
+            sys.modules.pop(name, None)
+        results[label] = r = run(line_buffer, args.repeat)
+        print(f"{label:<18} {r['chars_per_s']:8.0f} chars/s   SPI 事务 {r['transactions']:4d}   "
+              f"SPI {r['spi_bytes']:7d} 字节   {r['calls']}")
+    same = len({r["framebuffer"] for r in results.values()}) == 1
+    print("帧缓冲一致" if same else "帧缓冲不一致！")
+
+
+if __name__ == "__main__":
+    main()
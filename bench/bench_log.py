@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+日志开销基准 (CPython)
+
+对比热路径上每条消息的开销：
+- f-string + print：原写法，无论是否需要都构造字符串并写控制台 (输出重定向到空设备)
+- logger.debug (级别关闭)：只做一次级别比较，但仍记入环形缓冲
+- logger.debug (级别与环形缓冲都关闭)：立即返回
+- logger.throttled：同一调用点每 100ms 最多输出一次
+
+用法: python bench/bench_log.py
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import log  # noqa: E402
+
+N = 200000
+
+
+results = []
+
+
+def timeit(label, fn):
+    t0 = time.perf_counter()
+    for i in range(N):
+        fn(i)
+    results.append((label, (time.perf_counter() - t0) / N))
+
+
+def main():
+    logger = log.get_logger("bench")
+    base64_len = 61440
+    real_stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        timeit("f-string + print", lambda i: print(f"收到音频数据: {base64_len} 字节 (Base64编码)"))
+        log.set_level(log.INFO)
+        log.set_ring_level(log.DEBUG)
+        timeit("logger.debug (off, ring on)", lambda i: logger.debug("收到音频数据: %s 字节 (Base64编码)", base64_len))
+        log.set_ring_level(log.OFF)
+        timeit("logger.debug (off, ring off)", lambda i: logger.debug("收到音频数据: %s 字节 (Base64编码)", base64_len))
+        timeit("logger.info (on)", lambda i: logger.info("收到音频数据: %s 字节 (Base64编码)", base64_len))
+        timeit("logger.throttled 100ms (on)",
+               lambda i: logger.throttled(100, log.INFO, "收到音频数据: %s 字节 (Base64编码)", base64_len))
+    finally:
+        printed = sys.stdout.getvalue().count("\n")
+        sys.stdout = real_stdout
+    for label, per in results:
+        print(f"  {label:<38} {per * 1e9:8.0f} ns/call")
+    print(f"  ({printed} lines written to the redirected console)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+音频播放解码基准 (CPython)
+
+用假的 I2S sink (只把数据拷进固定大小的 DMA 缓冲) 对比旧的 play_audio_data 路径
+(a2b_base64 整段解码 + 4KB 切片写入) 与 audio_playback.Base64PcmWriter 的流式解码，
+输出解码吞吐和峰值内存
+
+用法: python bench/bench_playback.py
+"""
+import binascii
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import audio_playback  # noqa: E402
+
+
+class FakeI2S:
+    """模拟 I2S.write：每次最多接收 DMA 缓冲大小的数据并拷贝进去"""
+
+    def __init__(self, dma=8192):
+        self.dma = bytearray(dma)
+        self.total = 0
+
+    def write(self, buf):
+        n = min(len(buf), len(self.dma))
+        self.dma[:n] = buf[:n]
+        self.total += n
+        return n
+
+
+def legacy(sink, b64):
+    audio_bytes = binascii.a2b_base64(b64)
+    offset = 0
+    while offset < len(audio_bytes):
+        chunk = audio_bytes[offset:offset + 4096]
+        offset += sink.write(chunk)
+    return offset
+
+
+def streaming(writer):
+    def run(sink, b64):
+        return writer.write(sink, b64)[0]
+    return run
+
+
+def measure(label, fn, b64, repeat):
+    sink = FakeI2S()
+    fn(sink, b64)  # 预热
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    fn(sink, b64)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(sink, b64)
+    elapsed = time.perf_counter() - t0
+    pcm = len(b64) // 4 * 3 * repeat
+    print(f"  {label:<10} {pcm / elapsed / 1e6:8.1f} MB/s PCM   peak {(peak - base) / 1024:7.1f} KB")
+
+
+def main():
+    writer = audio_playback.Base64PcmWriter()
+    for pcm_len in (3200, 16000, 48000):  # 0.1s / 0.5s / 1.5s @ 16kHz 16bit
+        b64 = binascii.b2a_base64(os.urandom(pcm_len))[:-1].decode()
+        print(f"delta: {len(b64)} base64 chars ({pcm_len} PCM bytes)")
+        repeat = max(20, 2000000 // pcm_len)
+        measure("legacy", legacy, b64, repeat)
+        measure("streaming", streaming(writer), b64, repeat)
+
+
+if __name__ == "__main__":
+    main()
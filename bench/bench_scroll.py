@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+长回复换页方式对比 (CPython，屏幕为 hal 的帧缓冲实现)：写满后清屏重来 vs 垂直滚动
+
+按 4 个字一段流式追加一段超过一屏的回复，统计绘制调用、传输字节 (像素 x 2) 与估算的 SPI 时间，
+并把最后一屏存成 PNG (滚动模式下应能看到连续的最后几行)
+
+用法: python bench/bench_scroll.py [--png DIR]
+"""
+import argparse
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import shim_env  # noqa: E402
+
+TEXT = ("这是一个由虾哥开源的ESP32项目，以MIT许可证发布，允许任何人免费使用，或用于商业用途。"
+        "We hope this project helps you understand AI hardware development and apply large language "
+        "models to real devices. 如果你有任何想法或建议，请随时提出Issues或加入QQ群：575180511。") * 3
+
+
+def run(scroll, png):
+    import config
+    config.DISPLAY_SCROLL = scroll
+    import mix_display
+    from hal import gc9a01
+    display = mix_display.CircularTextDisplay()
+    tft = display.tft
+    display.begin_text(gc9a01.WRAP_V, gc9a01.WHITE)
+    tft.calls.clear()
+    tft.pixels = 0
+    tft.spi_us = 0.0
+    for k in range(0, len(TEXT), 4):
+        display.append_text(TEXT[k:k + 4])
+    if png:
+        tft.save_png(os.path.join(png, "scroll-%s.png" % ("on" if scroll else "off")))
+    return dict(tft.calls), tft.pixels * 2, tft.spi_us / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="清屏换页 vs 垂直滚动")
+    parser.add_argument("--png", help="保存最后一屏截图的目录")
+    args = parser.parse_args()
+    shim_env.install(100)
+    if args.png:
+        os.makedirs(args.png, exist_ok=True)
+    for label, scroll in (("清屏重来", False), ("垂直滚动", True)):
+        for name in ("config", "mix_display"):
+            sys.modules.pop(name, None)
+        calls, spi_bytes, spi_ms = run(scroll, args.png)
+        print(f"{label:<8} SPI {spi_bytes:8d} 字节  约 {spi_ms:6.1f} ms   {calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+VAD 能量计算基准 (CPython)
+
+对比 audio_recording_thread 原来的逐样本循环与 vad.energy (含降采样)，
+并校验各实现的平均绝对值与参考实现一致
+
+用法: python bench/bench_vad_energy.py [录音.wav ...]
+不给参数时使用合成的静音底噪 / 正弦 / 类语音调制噪声三种 PCM 片段
+"""
+import math
+import os
+import random
+import struct
+import sys
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import vad  # noqa: E402
+
+CHUNK = 1024  # 与 config.CHUNK 一致
+RATE = 16000
+
+
+def legacy_avg(buf, bytes_read):
+    """基线版本 audio_recording_thread 中的 VAD 循环"""
+    volume = 0
+    for i in range(0, bytes_read, 2):
+        if i + 1 < bytes_read:
+            sample = (buf[i + 1] << 8) | buf[i]
+            if sample & 0x8000:
+                sample = -((~sample & 0xFFFF) + 1)
+            volume += abs(sample)
+    return volume / (bytes_read // 2) if bytes_read > 0 else 0
+
+
+def synth(kind, seconds=2):
+    rnd = random.Random(1)
+    out = bytearray()
+    for n in range(RATE * seconds):
+        if kind == "noise":
+            v = rnd.gauss(0, 30)
+        elif kind == "tone":
+            v = 6000 * math.sin(2 * math.pi * 440 * n / RATE)
+        else:  # speech-like: 4Hz 音节包络调制的噪声
+            v = rnd.gauss(0, 4000) * max(0.0, math.sin(2 * math.pi * 4 * n / RATE))
+        out += struct.pack("<h", max(-32768, min(32767, int(v))))
+    return out
+
+
+def load_wav(path):
+    with wave.open(path, "rb") as w:
+        if w.getsampwidth() != 2 or w.getnchannels() != 1:
+            raise ValueError(f"{path}: need 16-bit mono PCM")
+        return bytearray(w.readframes(w.getnframes()))
+
+
+def chunks(pcm):
+    for off in range(0, len(pcm) - CHUNK + 1, CHUNK):
+        yield pcm[off:off + CHUNK]
+
+
+def bench(fn, blocks):
+    t0 = time.perf_counter()
+    for b in blocks:
+        fn(b)
+    return (time.perf_counter() - t0) / len(blocks) * 1e6
+
+
+def main():
+    if len(sys.argv) > 1:
+        fixtures = [(os.path.basename(p), load_wav(p)) for p in sys.argv[1:]]
+    else:
+        fixtures = [(k, synth(k)) for k in ("noise", "tone", "speech")]
+
+    for name, pcm in fixtures:
+        blocks = list(chunks(pcm))
+        for b in blocks:
+            ref = legacy_avg(b, CHUNK)
+            got = vad.energy(b, CHUNK)[0]
+            assert abs(ref - got) < 1e-6, (name, ref, got)
+        mean = sum(vad.energy(b, CHUNK)[0] for b in blocks) / len(blocks)
+        print(f"{name}: {len(blocks)} chunks, mean-abs {mean:.1f}")
+        t_old = bench(lambda b: legacy_avg(b, CHUNK), blocks)
+        print(f"  {'legacy loop':<16} {t_old:8.1f} us/chunk")
+        for step in (1, 2, 4):
+            t = bench(lambda b: vad.energy(b, CHUNK, step), blocks)
+            print(f"  {'energy step=%d' % step:<16} {t:8.1f} us/chunk  ({t_old / t:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+WebSocket 发送合并基准 (CPython)
+
+模拟 StreamWriter：每次 drain 对应一个 TLS 记录 + 一次 socket 发送，固定开销 0.4ms 再加按字节的时间，
+按 process_message_queue 的方式发送一段录音 (每 32ms 一条 append，ONSET 时连同 pre-roll 连发 4 条，
+偶尔网络卡顿 100ms 让队列积压)，对比：
+- per-message：每条消息 send() = write + drain (原行为)
+- batched：取空队列时 queue()，之后一次 flush()
+
+用法: python bench/bench_ws_batch.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import audio_uplink  # noqa: E402
+from aiohttp.aiohttp_ws import WebSocketClient  # noqa: E402
+from channel import Channel  # noqa: E402
+
+CHUNK = 1024
+DRAIN_COST_S = 0.0004
+BYTES_PER_S = 2_000_000
+
+
+class FakeWriter:
+    def __init__(self):
+        self.pending = 0
+        self.writes = 0
+        self.drains = 0
+        self.stall_until = 0
+
+    def write(self, buf):
+        self.pending += len(buf)
+        self.writes += 1
+
+    async def drain(self):
+        self.drains += 1
+        delay = DRAIN_COST_S + self.pending / BYTES_PER_S
+        wait = self.stall_until - time.perf_counter()
+        if wait > 0:
+            delay += wait
+        self.pending = 0
+        await asyncio.sleep(delay)
+
+
+class Response:
+    """只保留 process_message_queue 用到的 ClientWebSocketResponse 接口"""
+
+    def __init__(self, ws):
+        self.ws = ws
+
+    async def queue_frame(self, data, opcode):
+        await self.ws.queue(data, opcode)
+
+
+async def producer(chan, writer, chunks=200):
+    pcm = bytearray(os.urandom(CHUNK))
+    for i in range(chunks):
+        burst = 4 if i % 40 == 0 else 1
+        for _ in range(burst):
+            chan.put((time.perf_counter(), pcm))
+        if i % 60 == 30:
+            writer.stall_until = time.perf_counter() + 0.1
+        await asyncio.sleep(0.032)
+    chan.put((time.perf_counter(), None))  # 结束标记
+
+
+async def consumer(chan, resp, batched, lat):
+    encoder = audio_uplink.make_encoder("json", CHUNK)
+    while True:
+        await chan.wait()
+        stamps = []
+        while True:
+            item = chan.pop()
+            if item is None:
+                break
+            if item[1] is None:
+                if stamps:
+                    await resp.ws.flush()
+                    now = time.perf_counter()
+                    lat.extend(now - t for t in stamps)
+                return
+            await audio_uplink.queue_audio(resp, encoder, item[1])
+            if batched:
+                stamps.append(item[0])
+            else:
+                await resp.ws.flush()
+                lat.append(time.perf_counter() - item[0])
+        if stamps:
+            await resp.ws.flush()
+            now = time.perf_counter()
+            lat.extend(now - t for t in stamps)
+
+
+async def run(batched):
+    ws = WebSocketClient(None)
+    ws.writer = FakeWriter()
+    chan = Channel(1024)
+    lat = []
+    cons = asyncio.create_task(consumer(chan, Response(ws), batched, lat))
+    await asyncio.sleep(0)
+    await producer(chan, ws.writer)
+    await cons
+    return ws, lat
+
+
+def main():
+    for label, batched in (("per-message", False), ("batched", True)):
+        ws, lat = asyncio.run(run(batched))
+        stats = ws.flush_stats()
+        lat.sort()
+        p95 = lat[int(len(lat) * 0.95)]
+        print(f"{label:<12} {stats['frames']} frames, {ws.writer.drains} drains, "
+              f"{stats['frames_per_flush']:.2f} frames/flush (max {stats['max_frames_per_flush']}), "
+              f"{stats['bytes_per_flush']:.0f} B/flush, latency p50 {lat[len(lat) // 2] * 1000:.1f}ms "
+              f"p95 {p95 * 1000:.1f}ms max {lat[-1] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
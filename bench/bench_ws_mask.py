@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+WebSocket 掩码/编帧微基准 (CPython)
+
+对比旧的逐字节生成器掩码与 ws_mask.mask_inplace，以及旧的 _encode_websocket_frame
+与编码进复用发送批次的 WebSocketClient._append_frame，覆盖从控制帧到大帧的多种载荷大小
+
+用法: python bench/bench_ws_mask.py
+"""
+import os
+import random
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aiohttp.aiohttp_ws import WebSocketClient  # noqa: E402
+from aiohttp.ws_mask import mask_inplace  # noqa: E402
+
+SIZES = (16, 256, 2760, 16 * 1024, 64 * 1024)  # 2760 ≈ 一条 input_audio_buffer.append 消息
+
+
+def legacy_mask(payload, mask_bits):
+    return bytes(b ^ mask_bits[i % 4] for i, b in enumerate(payload))
+
+
+def legacy_encode(opcode, payload):
+    """基线版本 _encode_websocket_frame 的等价实现"""
+    length = len(payload)
+    byte1 = 0x80 | opcode
+    if length < 126:
+        frame = struct.pack("!BB", byte1, 0x80 | length)
+    elif length < (1 << 16):
+        frame = struct.pack("!BBH", byte1, 0x80 | 126, length)
+    else:
+        frame = struct.pack("!BBQ", byte1, 0x80 | 127, length)
+    mask_bits = struct.pack("!I", random.getrandbits(32))
+    frame += mask_bits
+    return frame + legacy_mask(payload, mask_bits)
+
+
+def build_frame(ws, opcode, payload):
+    """在发送批次缓冲区里编码单帧 (丢弃上一帧)，等价于一次 send 的编码部分"""
+    ws._batch_pos = 0
+    ws._append_frame(opcode, payload)
+    return memoryview(ws._batch_buf)[:ws._batch_pos]
+
+
+def timeit(fn, budget=0.3):
+    n = 0
+    t0 = time.perf_counter()
+    while True:
+        fn()
+        n += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed > budget:
+            return elapsed / n
+
+
+def main():
+    key = struct.pack("!I", random.getrandbits(32))
+    ws = WebSocketClient(None)
+    print(f"{'size':>8} {'gen mask':>12} {'mask_inplace':>14} {'speedup':>8} "
+          f"{'old encode':>12} {'batch encode':>14} {'speedup':>8}")
+    for size in SIZES:
+        payload = os.urandom(size)
+        buf = bytearray(payload)
+        t_gen = timeit(lambda: legacy_mask(payload, key))
+        t_fast = timeit(lambda: mask_inplace(buf, 0, size, key))
+        t_old = timeit(lambda: legacy_encode(WebSocketClient.BINARY, payload))
+        t_new = timeit(lambda: build_frame(ws, WebSocketClient.BINARY, payload))
+        print(f"{size:>8} {t_gen * 1e6:>10.1f}us {t_fast * 1e6:>12.1f}us {t_gen / t_fast:>7.1f}x "
+              f"{t_old * 1e6:>10.1f}us {t_new * 1e6:>12.1f}us {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
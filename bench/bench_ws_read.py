@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+WebSocket 接收路径基准 (CPython)
+
+用假的 StreamReader 喂入合成的 TEXT 帧，对比旧的 payload += chunk 读取方式
+与 WebSocketClient._read_frame 的预分配缓冲区读取方式，输出吞吐 (bytes/s) 与峰值内存
+
+用法: python bench/bench_ws_read.py
+"""
+import asyncio
+import os
+import struct
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aiohttp import aiohttp_ws  # noqa: E402
+from aiohttp.aiohttp_ws import WebSocketClient  # noqa: E402
+
+report = print
+SEGMENT = 1460  # 模拟 TCP 段大小，每次 read 最多返回这么多字节
+
+
+class FakeReader:
+    """按 SEGMENT 大小吐数据的 StreamReader 替身；readinto=True 时额外提供 readinto"""
+
+    def __init__(self, data, readinto=False):
+        self.data = memoryview(data)
+        self.pos = 0
+        if readinto:
+            self.readinto = self._readinto
+
+    async def read(self, n):
+        n = min(n, SEGMENT, len(self.data) - self.pos)
+        chunk = bytes(self.data[self.pos:self.pos + n])
+        self.pos += n
+        return chunk
+
+    async def _readinto(self, buf):
+        n = min(len(buf), SEGMENT, len(self.data) - self.pos)
+        buf[:n] = self.data[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+
+def make_frame(size):
+    payload = b'{"type":"response.audio.delta","delta":"' + b"A" * (size - 44) + b'"}'
+    if len(payload) < 126:
+        header = struct.pack("!BB", 0x81, len(payload))
+    elif len(payload) < (1 << 16):
+        header = struct.pack("!BBH", 0x81, 126, len(payload))
+    else:
+        header = struct.pack("!BBQ", 0x81, 127, len(payload))
+    return header + payload
+
+
+async def legacy_read_frame(self):
+    """基线版本 _read_frame 的原样拷贝 (payload += chunk)，作为对照组"""
+    header = await self.reader.read(2)
+    if len(header) != 2:  # pragma: no cover
+        # raise OSError(32, "Websocket connection closed")
+        opcode = self.CLOSE
+        payload = b""
+        return fin, opcode, payload
+    fin, opcode, has_mask, length = self._parse_frame_header(header)
+    if length == 126:  # Magic number, length header is 2 bytes
+        (length,) = struct.unpack("!H", await self.reader.read(2))
+    elif length == 127:  # Magic number, length header is 8 bytes
+        (length,) = struct.unpack("!Q", await self.reader.read(8))
+
+    if has_mask:  # pragma: no cover
+        mask = await self.reader.read(4)
+
+    # 对于大型数据，使用分块读取
+    payload = b""
+    chunk_size = 4096  # 使用较小的块大小 (4KB)
+    remaining = length
+
+    # 记录是否已经打印过进度
+    progress_markers = set()
+    total_chunks = (length + chunk_size - 1) // chunk_size  # 总的分块数
+
+    # 增强的读取循环，确保读取完整的载荷
+    start_time = time.time()
+    while remaining > 0:
+        try:
+            chunk = await self.reader.read(min(chunk_size, remaining))
+            # 如果没有读取到数据，尝试等待一小段时间后重试
+            if not chunk:
+                # 短暂休眠后重试，而不是立即退出
+                await asyncio.sleep(0.05)  # 增加等待时间，给网络栈更多处理时间
+
+                # 减少重试次数的计数器
+                retry_count = getattr(self, '_retry_count', 10)  # 增加默认重试次数
+                if retry_count <= 0:
+                    elapsed = time.time() - start_time
+                    print(f"WARNING: EOF reading frame payload after {len(payload)}/{length} bytes (elapsed: {elapsed:.2f}s)")
+                    break
+
+                self._retry_count = retry_count - 1
+                continue
+            else:
+                # 重置重试计数器
+                self._retry_count = 10
+
+            payload += chunk
+            remaining -= len(chunk)
+
+            # 打印进度日志（对于大型载荷）
+            if length > 8192:
+                # 计算已完成百分比
+                percent_complete = (len(payload) * 100) // length
+                # 每 25% 打印一次进度，避免重复日志
+                marker = percent_complete // 25
+                if marker not in progress_markers and marker > 0:
+                    progress_markers.add(marker)
+                    elapsed = time.time() - start_time
+                    print(f"Reading WebSocket frame: {len(payload)}/{length} bytes ({percent_complete}%) in {elapsed:.2f}s")
+
+        except Exception as e:
+            print(f"Error reading WebSocket frame: {e}")
+            sys.print_exception(e)
+            break
+
+    # 载荷读取完成后检查是否读取了声明的完整长度
+    if len(payload) < length:
+        elapsed = time.time() - start_time
+        print(f"WARNING: Incomplete frame payload: got {len(payload)}/{length} bytes in {elapsed:.2f}s")
+    elif length > 8192:
+        elapsed = time.time() - start_time
+        print(f"COMPLETE: Read full frame of {length} bytes in {elapsed:.2f}s")
+
+    if has_mask:  # pragma: no cover
+        payload = bytes(x ^ mask[i % 4] for i, x in enumerate(payload))
+
+    return fin, opcode, payload
+
+
+def _quiet(*args, **kwargs):
+    pass
+
+
+def run(label, reader_fn, frame, frames):
+    ws = WebSocketClient(None)
+    data = frame * frames
+    ws.reader = FakeReader(data, readinto=label.endswith("readinto"))
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    total = 0
+
+    async def loop():
+        nonlocal total
+        for _ in range(frames):
+            _, _, payload = await reader_fn(ws)
+            total += len(payload)
+
+    asyncio.run(loop())
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report(f"  {label:<22} {total / elapsed / 1e6:8.1f} MB/s   peak {peak / 1024:8.1f} KB")
+
+
+def main():
+    # 屏蔽两个实现里大帧的进度打印，避免干扰计时
+    aiohttp_ws.print = _quiet
+    globals()["print"] = _quiet
+    for size in (1024, 16 * 1024, 60 * 1024):
+        frame = make_frame(size)
+        frames = max(4, (2 * 1024 * 1024) // size)
+        report(f"frame {size} bytes x {frames}")
+        run("legacy += chunk", legacy_read_frame, frame, frames)
+        run("_read_frame read", WebSocketClient._read_frame, frame, frames)
+        run("_read_frame readinto", WebSocketClient._read_frame, frame, frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+把 write 字体模块 (MAP/WIDTHS/OFFSETS/BITMAPS，如 proverbs_20.py) 转换成 binfont 的二进制字库 (.fnt)
+
+字形按码点排序，点阵从原模块的连续位流中取出后各自补齐到整字节，方便设备上按字形 seek 读取
+
+用法: python bench/font_convert.py proverbs_20.py [-o proverbs_20.fnt]
+"""
+import argparse
+import os
+import runpy
+import struct
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import binfont  # noqa: E402
+
+
+def glyph_bits(font, i):
+    """第 i 个字形的 (宽度, 补齐到整字节的点阵)"""
+    ow = font["OFFSET_WIDTH"]
+    offset = 0
+    for b in font["OFFSETS"][i * ow:(i + 1) * ow]:
+        offset = (offset << 8) | b
+    width = font["WIDTHS"][i]
+    nbits = width * font["HEIGHT"] * font["BPP"]
+    data = font["BITMAPS"]
+    out = bytearray((nbits + 7) // 8)
+    for k in range(nbits):
+        bit = offset + k
+        if (data[bit >> 3] >> (7 - (bit & 7))) & 1:
+            out[k >> 3] |= 0x80 >> (k & 7)
+    return width, bytes(out)
+
+
+def convert(font):
+    """font 为字体模块的全局变量字典，返回 .fnt 文件内容"""
+    glyphs = {}
+    for i, ch in enumerate(font["MAP"]):
+        code = ord(ch)
+        if code > 0xFFFF:
+            raise ValueError("Code point out of range: U+{:X}".format(code))
+        if code not in glyphs:
+            glyphs[code] = glyph_bits(font, i)
+    codes = sorted(glyphs)
+    count = len(codes)
+
+    offsets_pos = binfont.HEADER_SIZE + 3 * count
+    offsets_pos += -offsets_pos % 4
+    bitmaps_pos = offsets_pos + 4 * count
+    offsets = []
+    bitmaps = bytearray()
+    for code in codes:
+        offsets.append(len(bitmaps))
+        bitmaps += glyphs[code][1]
+
+    header = struct.pack(binfont.HEADER, binfont.MAGIC, binfont.VERSION, font["BPP"], font["HEIGHT"],
+                         font["MAX_WIDTH"], count, 0, offsets_pos, bitmaps_pos)
+    out = bytearray(header)
+    out += struct.pack("<%dH" % count, *codes)
+    out += bytes(glyphs[code][0] for code in codes)
+    out += bytes(offsets_pos - len(out))
+    out += struct.pack("<%dI" % count, *offsets)
+    out += bitmaps
+    return bytes(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="write 字体模块 -> binfont 二进制字库")
+    parser.add_argument("module", help="字体模块文件，例如 proverbs_20.py")
+    parser.add_argument("-o", "--output", help="输出文件，默认与模块同名 .fnt")
+    args = parser.parse_args()
+    font = runpy.run_path(args.module)
+    data = convert(font)
+    output = args.output or os.path.splitext(args.module)[0] + ".fnt"
+    with open(output, "wb") as f:
+        f.write(data)
+    print("{}: {} glyphs, {} bytes -> {}".format(args.module, len(set(font["MAP"])), len(data), output))
+
+
+if __name__ == "__main__":
+    main()
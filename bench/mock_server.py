@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+"""
+离线的实时语音网关替身 (CPython, 只用标准库 asyncio)
+
+说与网关相同的事件协议：连接后发 session.created；收到 session.update 回 session.updated；
+累计 input_audio_buffer.append 的音频，收到 input_audio_buffer.commit 回 committed 与转写结果；
+收到 response.create 后按配置的大小与节拍流式发送 response.audio.delta / 文本增量，
+最后是 response.audio.done、response.done 等收尾事件
+
+可调：每个音频增量的时长、增量间隔 (0 = 一次性灌入)、帧分片大小、PING 注入间隔，
+以及故障注入 (中途断开连接 / 发送无法解析的 JSON / 每轮附带 error 事件)
+
+用法: python bench/mock_server.py [--port 8765] [--delta-ms 100] [--interval-ms 50] ...
+然后把 config.WS_URL 改成 ws://127.0.0.1:8765/v1/realtime
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import struct
+import time
+from array import array
+
+GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+CONT = 0
+TEXT = 1
+BINARY = 2
+CLOSE = 8
+PING = 9
+PONG = 10
+
+REPLY_TEXT = "你好呀！我是Evelyn老师，今天我们一起来学习新的英文单词吧。Apple 就是苹果的意思哦，哈哈。"
+
+
+class MockOptions:
+    """服务端行为参数，属性名与命令行选项对应"""
+
+    def __init__(self, **kwargs):
+        self.rate = 16000             # 回复音频采样率 (16 位单声道)
+        self.response_ms = 2000       # 每轮回复的音频总时长
+        self.delta_ms = 100           # 每个 response.audio.delta 携带的音频时长
+        self.interval_ms = 50         # 相邻增量的发送间隔，0 = 尽快发送
+        self.first_delta_ms = 300     # response.create 到第一个增量的"思考"时间
+        self.created_ms = 50          # response.create 到 response.created 的时间
+        self.fragment_bytes = 0       # >0 时把 TEXT 消息切成不超过该大小的分片帧
+        self.ping_ms = 0              # >0 时每隔该时间向客户端发送 PING
+        self.fail = None              # None / "abort" (第 fail_turn 轮中途断开) / "malformed" / "error"
+        self.fail_turn = 2
+        self.max_turns = 0            # >0 时完成这么多轮后，在客户端重新开始说话时关闭连接
+        for key, value in kwargs.items():
+            if not hasattr(self, key):
+                raise ValueError("Unknown mock option: {}".format(key))
+            setattr(self, key, value)
+
+
+class Stats:
+    def __init__(self):
+        self.connections = 0
+        self.turns = 0
+        self.events_in = {}
+        self.events_out = {}
+        self.audio_in_bytes = 0
+        self.audio_out_bytes = 0
+        self.frames_out = 0
+        self.bytes_out = 0
+        self.pings = 0
+        self.pongs = 0
+        self.ping_rtt_ms = []
+
+    def as_dict(self):
+        rtt = sorted(self.ping_rtt_ms)
+        return {
+            "connections": self.connections,
+            "turns": self.turns,
+            "events_in": self.events_in,
+            "events_out": self.events_out,
+            "audio_in_bytes": self.audio_in_bytes,
+            "audio_out_bytes": self.audio_out_bytes,
+            "frames_out": self.frames_out,
+            "bytes_out": self.bytes_out,
+            "pings": self.pings,
+            "pongs": self.pongs,
+            "ping_rtt_p50_ms": rtt[len(rtt) // 2] if rtt else None,
+        }
+
+
+def tone(rate, ms, freq=440, amplitude=4000):
+    n = rate * ms // 1000
+    return bytes(array("h", (int(amplitude * math.sin(2 * math.pi * freq * i / rate)) for i in range(n))))
+
+
+def _unmask(payload, mask):
+    n = len(payload)
+    key = int.from_bytes((mask * (n // 4 + 1))[:n], "big")
+    return (int.from_bytes(payload, "big") ^ key).to_bytes(n, "big")
+
+
+class Connection:
+    """一个客户端连接：读循环处理客户端事件，回复在单独的任务里流式发送"""
+
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.opts = server.opts
+        self.stats = server.stats
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+        self.response_task = None
+        self.ping_task = None
+        self.pending_audio = 0
+        self.ping_sent = {}
+        self.event_seq = 0
+        self._write_lock = asyncio.Lock()
+
+    # --- 帧 ---
+    async def handshake(self):
+        key = None
+        line = await self.reader.readline()
+        if not line.startswith(b"GET "):
+            raise ConnectionError("not a websocket request: %r" % line)
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.strip().lower() == "sec-websocket-key":
+                key = value.strip().encode()
+        if key is None:
+            raise ConnectionError("missing Sec-WebSocket-Key")
+        accept = base64.b64encode(hashlib.sha1(key + GUID).digest())
+        self.writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                          b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        await self.writer.drain()
+
+    async def read_frame(self):
+        b0, b1 = await self.reader.readexactly(2)
+        fin = bool(b0 & 0x80)
+        opcode = b0 & 0x0F
+        length = b1 & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", await self.reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", await self.reader.readexactly(8))
+        mask = await self.reader.readexactly(4) if b1 & 0x80 else None
+        payload = await self.reader.readexactly(length)
+        if mask:
+            payload = _unmask(payload, mask)
+        return fin, opcode, payload
+
+    def _frame(self, opcode, payload, fin=True):
+        n = len(payload)
+        b0 = (0x80 if fin else 0) | opcode
+        if n < 126:
+            header = struct.pack("!BB", b0, n)
+        elif n < 65536:
+            header = struct.pack("!BBH", b0, 126, n)
+        else:
+            header = struct.pack("!BBQ", b0, 127, n)
+        return header + payload
+
+    async def send_frames(self, opcode, payload):
+        """发送一条消息；fragment_bytes > 0 时切成首帧 + CONT 分片"""
+        size = self.opts.fragment_bytes
+        async with self._write_lock:
+            if self.closed:
+                return
+            if size <= 0 or len(payload) <= size:
+                frames = [self._frame(opcode, payload)]
+            else:
+                frames = []
+                for off in range(0, len(payload), size):
+                    last = off + size >= len(payload)
+                    frames.append(self._frame(opcode if off == 0 else CONT, payload[off:off + size], last))
+            for frame in frames:
+                self.writer.write(frame)
+                self.stats.frames_out += 1
+                self.stats.bytes_out += len(frame)
+            await self.writer.drain()
+
+    async def send_event(self, event_type, **fields):
+        self.event_seq += 1
+        event = {"event_id": "srv-%d" % self.event_seq, "type": event_type}
+        event.update(fields)
+        self.stats.events_out[event_type] = self.stats.events_out.get(event_type, 0) + 1
+        await self.send_frames(TEXT, json.dumps(event, ensure_ascii=False).encode())
+
+    def abort(self):
+        self.closed = True
+        self.writer.transport.abort()
+
+    async def close(self):
+        if self.closed:
+            return
+        async with self._write_lock:
+            self.writer.write(self._frame(CLOSE, struct.pack("!H", 1000)))
+            await self.writer.drain()
+            self.closed = True
+
+    # --- 协议 ---
+    async def run(self):
+        await self.handshake()
+        self.stats.connections += 1
+        await self.send_event("session.created", session={"id": "sess-mock-%d" % self.stats.connections})
+        if self.opts.ping_ms > 0:
+            self.ping_task = asyncio.create_task(self.ping_loop())
+        message = bytearray()
+        message_opcode = None
+        try:
+            while not self.closed:
+                fin, opcode, payload = await self.read_frame()
+                if opcode == PING:
+                    async with self._write_lock:
+                        self.writer.write(self._frame(PONG, payload))
+                    continue
+                if opcode == PONG:
+                    self.on_pong(payload)
+                    continue
+                if opcode == CLOSE:
+                    await self.close()
+                    break
+                if opcode != CONT:
+                    message_opcode = opcode
+                    message = bytearray()
+                message.extend(payload)
+                if fin:
+                    await self.on_message(message_opcode, bytes(message))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.closed = True
+            for task in (self.response_task, self.ping_task):
+                if task is not None:
+                    task.cancel()
+            self.writer.close()
+
+    async def on_message(self, opcode, payload):
+        if opcode == BINARY:
+            # 二进制上行音频 (AUDIO_UPLINK_MODE = "binary")
+            await self.on_audio(len(payload))
+            return
+        event = json.loads(payload)
+        event_type = event.get("type")
+        self.stats.events_in[event_type] = self.stats.events_in.get(event_type, 0) + 1
+        if event_type == "session.update":
+            await self.send_event("session.updated", session=event.get("session", {}))
+        elif event_type == "input_audio_buffer.append":
+            await self.on_audio(len(event.get("audio", "")) * 3 // 4)
+        elif event_type == "input_audio_buffer.commit":
+            item_id = "item-%d" % (self.stats.turns + 1)
+            await self.send_event("input_audio_buffer.committed", item_id=item_id, previous_item_id=None)
+            await self.send_event("conversation.item.input_audio_transcription.completed",
+                                  item_id=item_id, transcript="mock 语音 %d 字节" % self.pending_audio)
+            self.pending_audio = 0
+        elif event_type == "response.create":
+            if self.response_task is None or self.response_task.done():
+                self.response_task = asyncio.create_task(self.respond())
+
+    async def on_audio(self, n):
+        opts = self.opts
+        if opts.max_turns and self.stats.turns >= opts.max_turns:
+            # 客户端播完最后一轮并重新开始录音：结束本次基准
+            await self.close()
+            return
+        self.pending_audio += n
+        self.stats.audio_in_bytes += n
+
+    async def respond(self):
+        opts = self.opts
+        stats = self.stats
+        turn = stats.turns + 1
+        response_id = "resp-%d" % turn
+        item = {"id": "item-out-%d" % turn, "type": "message", "role": "assistant"}
+        fail = opts.fail if turn == opts.fail_turn else None
+        await asyncio.sleep(opts.created_ms / 1000)
+        await self.send_event("response.created", response={"id": response_id, "status": "in_progress"})
+        await self.send_event("response.output_item.added", response_id=response_id, output_index=0, item=item)
+        await asyncio.sleep(max(0, opts.first_delta_ms - opts.created_ms) / 1000)
+        if opts.fail == "error":
+            await self.send_event("error", error={"type": "server_error", "code": "mock_error",
+                                                  "message": "injected error (turn %d)" % turn})
+
+        pcm = tone(opts.rate, opts.response_ms)
+        step = opts.rate * 2 * opts.delta_ms // 1000
+        step -= step % 6  # base64 按 3 字节分组、PCM 按 2 字节对齐
+        chars = len(REPLY_TEXT)
+        deltas = (len(pcm) + step - 1) // step
+        for i, off in enumerate(range(0, len(pcm), step)):
+            if self.closed:
+                return
+            if fail == "abort" and i == deltas // 2:
+                self.abort()
+                return
+            if fail == "malformed" and i == deltas // 2:
+                await self.send_frames(TEXT, b'{"type":"response.audio.delta","delta":"AAAA')
+            chunk = pcm[off:off + step]
+            await self.send_event("response.audio.delta", response_id=response_id, item_id=item["id"],
+                                  output_index=0, content_index=0, delta=base64.b64encode(chunk).decode())
+            stats.audio_out_bytes += len(chunk)
+            lo = chars * i // deltas
+            hi = chars * (i + 1) // deltas
+            if hi > lo:
+                await self.send_event("response.audio_transcript.delta", response_id=response_id,
+                                      item_id=item["id"], delta=REPLY_TEXT[lo:hi])
+            if opts.interval_ms > 0:
+                await asyncio.sleep(opts.interval_ms / 1000)
+        await self.send_event("response.audio.done", response_id=response_id, item_id=item["id"])
+        await self.send_event("response.audio_transcript.done", response_id=response_id,
+                              item_id=item["id"], transcript=REPLY_TEXT)
+        await self.send_event("response.output_item.done", response_id=response_id, output_index=0, item=item)
+        stats.turns += 1
+        await self.send_event("response.done", response={"id": response_id, "status": "completed"})
+
+    async def ping_loop(self):
+        seq = 0
+        while not self.closed:
+            await asyncio.sleep(self.opts.ping_ms / 1000)
+            seq += 1
+            payload = b"%d" % seq
+            self.ping_sent[payload] = time.monotonic()
+            self.stats.pings += 1
+            async with self._write_lock:
+                if self.closed:
+                    return
+                self.writer.write(self._frame(PING, payload))
+
+    def on_pong(self, payload):
+        self.stats.pongs += 1
+        sent = self.ping_sent.pop(bytes(payload), None)
+        if sent is not None:
+            self.stats.ping_rtt_ms.append((time.monotonic() - sent) * 1000)
+
+
+class MockServer:
+    def __init__(self, opts=None, host="127.0.0.1", port=0):
+        self.opts = opts or MockOptions()
+        self.host = host
+        self.port = port
+        self.stats = Stats()
+        self._server = None
+
+    @property
+    def url(self):
+        return "ws://%s:%d/v1/realtime" % (self.host, self.port)
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        try:
+            await Connection(self, reader, writer).run()
+        except Exception as e:
+            print("mock server connection error: %r" % e)
+
+
+def parse_args(argv=None):
+    defaults = MockOptions()
+    parser = argparse.ArgumentParser(description="离线实时语音网关替身")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    for name, value in vars(defaults).items():
+        flag = "--" + name.replace("_", "-")
+        if value is None:
+            parser.add_argument(flag, default=None)
+        else:
+            parser.add_argument(flag, type=type(value), default=value)
+    args = parser.parse_args(argv)
+    opts = MockOptions(**{k: getattr(args, k) for k in vars(defaults)})
+    return args, opts
+
+
+async def main():
+    args, opts = parse_args()
+    server = await MockServer(opts, args.host, args.port).start()
+    print("mock realtime server listening on %s" % server.url)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        print(json.dumps(server.stats.as_dict(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
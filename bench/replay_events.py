@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+事件日志离线回放 (CPython)
+
+把录制的 JSONL 事件日志 (每行一个服务端事件) 经 event_sniff 分拣后交给 events 分发表，
+打印每种事件的处理次数和平均/最大耗时。doubao_chat 依赖 machine/I2S 无法在主机上导入，
+这里注册主机版处理函数：音频增量流式解码进 PlaybackStage (扬声器替换为空 sink)，
+其余事件只计分发开销；不给日志文件时回放 bench_event_sniff 的合成序列
+
+用法: python bench/replay_events.py [events.jsonl]
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import audio_playback  # noqa: E402
+import event_sniff  # noqa: E402
+import events  # noqa: E402
+from bench_event_sniff import load_trace, synthetic_trace  # noqa: E402
+
+
+class NullSink:
+    def write(self, buf):
+        return len(buf)
+
+
+def build_router(stage):
+    router = events.EventRouter()
+
+    @router.on(event_sniff.AUDIO_DELTA)
+    async def on_audio_delta(ws, buf, start, end):
+        return await stage.feed(buf, start, end) > 0
+
+    @router.on("response.audio.done", "response.done")
+    async def on_done(ws, data):
+        stage.end_of_stream()
+
+    @router.on("session.created", "session.updated", "response.created",
+               "input_audio_buffer.committed", "response.output_item.added",
+               "response.output_item.done", "error",
+               "conversation.item.input_audio_transcription.completed")
+    async def on_control(ws, data):
+        pass  # 控制事件在主机上只统计分发与 JSON 解析后的开销
+
+    @router.on("response.audio_transcript.delta", "response.audio_transcript.done")
+    async def on_text(ws, data):
+        pass
+
+    @router.fallback
+    async def on_unknown(ws, event_type, data):
+        pass
+
+    return router
+
+
+async def main():
+    trace = load_trace(sys.argv[1]) if len(sys.argv) > 1 else synthetic_trace()
+    stage = audio_playback.PlaybackStage(NullSink(), 1 << 20, 6400, 1 << 19)
+    stage.start()
+    router = build_router(stage)
+    failures = await events.replay(trace, router)
+    await stage.wait_idle()
+    stage.stop()
+    print(f"{len(trace)} events replayed, {failures} failed")
+    router.report()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+在 CPython 上运行设备代码 (doubao_chat / aiohttp 等) 的基准环境准备
+
+硬件差异由 hal 包的 CPython 后端处理 (WAV 文件 I2S、帧缓冲屏幕、threading 线程、
+MicroPython 风格的网络流)，这里只负责把仓库根目录加入 sys.path 并设置 hal 后端参数
+"""
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+
+def install(speed=1.0, mic_wav=None, speaker_wav=None):
+    """speed 为麦克风/扬声器时钟倍率；mic_wav / speaker_wav 见 hal.host.configure"""
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import hal
+    hal.configure(speed=speed, mic_wav=mic_wav, speaker_wav=speaker_wav)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+二进制字库 (.fnt)：只把码点索引和字宽留在内存里，字形点阵按需从文件 seek/readinto 读取，带 LRU 字形缓存
+
+文件格式 (小端)：
+    头部  MAGIC "BFNT", 版本, BPP, HEIGHT, MAX_WIDTH, 字形数 n, 保留, 偏移表位置, 点阵区位置
+    索引  n 个 uint16 码点，升序
+    字宽  n 个 uint8
+    偏移  n 个 uint32，字形点阵相对点阵区的字节偏移 (4 字节对齐)
+    点阵  每个字形 WIDTH*HEIGHT 位，行优先、高位在前，补齐到整字节
+
+由 bench/font_convert.py 从 write 字体模块 (如 proverbs_20.py) 转换得到
+ModuleFont 把 write 字体模块包装成相同的接口 (index/width/write_len/write)，两者都用 glyph_index 查字形
+"""
+import struct
+from array import array
+import glyph_slot
+from glyph_index import GlyphIndex, from_map
+
+MAGIC = b"BFNT"
+VERSION = 1
+HEADER = "<4sBBBBHHII"
+HEADER_SIZE = struct.calcsize(HEADER)
+
+
+class BinFont:
+    def __init__(self, path, cache_size=32):
+        f = open(path, "rb")
+        magic, version, bpp, height, max_width, count, _, offsets_pos, bitmaps_pos = struct.unpack(
+            HEADER, f.read(HEADER_SIZE))
+        if magic != MAGIC or version != VERSION:
+            f.close()
+            raise ValueError("Unknown font file: {}".format(path))
+        self.path = path
+        self.BPP = bpp
+        self.HEIGHT = height
+        self.MAX_WIDTH = max_width
+        self.count = count
+        self._file = f
+        self._offsets_pos = offsets_pos
+        self._bitmaps_pos = bitmaps_pos
+        self.codes = array("H", bytes(2 * count))
+        f.readinto(self.codes)
+        self.widths = bytearray(count)
+        f.readinto(self.widths)
+        self.glyph_index = GlyphIndex(self.codes, None, self.widths)
+
+        # LRU 字形缓存：固定槽位，字形序号 -> 槽位的 dict 让命中为 O(1)，只有未命中淘汰时才扫描最久未用的槽位
+        self._slot_bytes = (max_width * height * bpp + 7) // 8
+        self._cache = bytearray(self._slot_bytes * cache_size)
+        self._cache_mv = memoryview(self._cache)
+        self._slot_of = {}
+        self._slot_glyph = array("i", [-1] * cache_size)
+        self._slot_used = array("I", [0] * cache_size)
+        self._clock = 0
+        self._offset_buf = bytearray(4)
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self._file.close()
+
+    def index(self, ch):
+        """字符 ch 的字形序号，不在字库中返回 -1"""
+        return self.glyph_index.find(ch)
+
+    def width(self, ch):
+        return self.glyph_index.width(ch)
+
+    def write_len(self, s):
+        total = 0
+        for ch in s:
+            total += self.width(ch)
+        return total
+
+    def bitmap(self, i):
+        """第 i 个字形的点阵 (memoryview，指向缓存槽位，下次未命中时可能被覆盖)"""
+        self._clock += 1
+        used = self._slot_used
+        slot = self._slot_of.get(i)
+        if slot is not None:
+            used[slot] = self._clock
+            self.hits += 1
+            return self._slot_view(slot, i)
+
+        self.misses += 1
+        glyphs = self._slot_glyph
+        victim = 0
+        for slot in range(1, len(used)):
+            if used[slot] < used[victim]:
+                victim = slot
+        if glyphs[victim] >= 0:
+            del self._slot_of[glyphs[victim]]
+        f = self._file
+        f.seek(self._offsets_pos + 4 * i)
+        f.readinto(self._offset_buf)
+        f.seek(self._bitmaps_pos + struct.unpack("<I", self._offset_buf)[0])
+        view = self._slot_view(victim, i)
+        f.readinto(view)
+        glyphs[victim] = i
+        used[victim] = self._clock
+        self._slot_of[i] = victim
+        return view
+
+    def glyph(self, i):
+        """第 i 个字形的 (点阵, 起始位)，供行缓冲渲染直接展开"""
+        return self.bitmap(i), 0
+
+    def _slot_view(self, slot, i):
+        start = slot * self._slot_bytes
+        return self._cache_mv[start:start + (self.widths[i] * self.HEIGHT * self.BPP + 7) // 8]
+
+    def write(self, tft, s, x, y, fg, bg):
+        """
+        按 tft.write 的约定画字符串，返回绘制的总宽度
+        每个字形放进 glyph_slot 模块 (C 驱动只接受模块对象作为字体) 后交给 tft.write
+        """
+        start = x
+        slot = glyph_slot
+        slot.BPP = self.BPP
+        slot.HEIGHT = self.HEIGHT
+        slot.MAX_WIDTH = self.MAX_WIDTH
+        slot.OFFSET_WIDTH = 1
+        slot.OFFSETS = _ZERO_OFFSET
+        for ch in s:
+            i = self.glyph_index.find(ch)
+            if i < 0:
+                continue
+            slot.MAP = ch
+            slot.WIDTHS[0] = self.widths[i]
+            slot.BITMAPS = self.bitmap(i)
+            tft.write(slot, ch, x, y, fg, bg)
+            x += self.widths[i]
+        return x - start
+
+
+_ZERO_OFFSET = bytes(1)
+
+
+class ModuleFont:
+    """
+    write 字体模块 (MAP/WIDTHS/OFFSETS/BITMAPS) 的包装：查字形用 glyph_index，
+    绘制时同样经 glyph_slot 交给 tft.write，C 驱动只需在单字 MAP 里查找
+    """
+
+    def __init__(self, module):
+        self.module = module
+        self.BPP = module.BPP
+        self.HEIGHT = module.HEIGHT
+        self.MAX_WIDTH = module.MAX_WIDTH
+        self.glyph_index = from_map(module.MAP, module.WIDTHS)
+
+    def index(self, ch):
+        return self.glyph_index.find(ch)
+
+    def width(self, ch):
+        return self.glyph_index.width(ch)
+
+    def write_len(self, s):
+        total = 0
+        for ch in s:
+            total += self.glyph_index.width(ch)
+        return total
+
+    def glyph(self, i):
+        """第 i 个字形的 (点阵, 起始位)：点阵为模块的 BITMAPS 整体，起始位取自 OFFSETS"""
+        font = self.module
+        ow = font.OFFSET_WIDTH
+        offsets = font.OFFSETS
+        bit = 0
+        for k in range(i * ow, (i + 1) * ow):
+            bit = (bit << 8) | offsets[k]
+        return font.BITMAPS, bit
+
+    def write(self, tft, s, x, y, fg, bg):
+        """按 tft.write 的约定画字符串，返回绘制的总宽度"""
+        font = self.module
+        ow = font.OFFSET_WIDTH
+        widths = font.WIDTHS
+        start = x
+        slot = glyph_slot
+        slot.BPP = self.BPP
+        slot.HEIGHT = self.HEIGHT
+        slot.MAX_WIDTH = self.MAX_WIDTH
+        slot.OFFSET_WIDTH = ow
+        slot.BITMAPS = font.BITMAPS
+        for ch in s:
+            i = self.glyph_index.find(ch)
+            if i < 0:
+                continue
+            slot.MAP = ch
+            slot.WIDTHS[0] = widths[i]
+            slot.OFFSETS = font.OFFSETS[i * ow:(i + 1) * ow]
+            tft.write(slot, ch, x, y, fg, bg)
+            x += widths[i]
+        return x - start
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# 启动时间线：记录复位后到各个关键节点 (WiFi 连上、WebSocket 打开、session.updated、麦克风打开等) 的毫秒数
+# 每个节点只记第一次，断线重连不会覆盖；设备上 ticks_ms 从复位开始计数，CPython 上从导入本模块开始
+from hal import MICROPYTHON, ticks_ms, ticks_diff
+
+_T0 = 0 if MICROPYTHON else ticks_ms()
+
+marks = []  # [(节点名, 毫秒)]，按发生顺序
+
+
+def mark(name):
+    """记录节点 name，返回是否为第一次记录"""
+    for n, _ in marks:
+        if n == name:
+            return False
+    marks.append((name, ticks_diff(ticks_ms(), _T0)))
+    return True
+
+
+def elapsed(name):
+    """节点 name 的毫秒数，尚未发生返回 None"""
+    for n, ms in marks:
+        if n == name:
+            return ms
+    return None
+
+
+def report(out=print):
+    out("⏱️ 启动时间线: " + ", ".join("%s %dms" % m for m in marks))
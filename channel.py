@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# 线程安全的生产者/消费者通道：录音线程 put()，asyncio 发送任务 await wait() 后一次取空
+import asyncio
+from hal import thread as _thread
+from collections import deque
+
+
+class Channel:
+    """
+    生产者可以在任意线程调用 put()；消费者在事件循环里 await wait()，有消息时立即唤醒，
+    空闲时没有定时器轮询
+    - MicroPython: 用 asyncio.ThreadSafeFlag 唤醒
+    - CPython: 用 loop.call_soon_threadsafe 设置 asyncio.Event
+    """
+
+    def __init__(self, maxlen=1024):
+        self._items = deque((), maxlen)
+        self._lock = _thread.allocate_lock()
+        self._loop = None
+        if hasattr(asyncio, "ThreadSafeFlag"):
+            self._flag = asyncio.ThreadSafeFlag()
+            self._event = None
+        else:
+            self._flag = None
+            self._event = asyncio.Event()
+
+    def __len__(self):
+        return len(self._items)
+
+    def _notify(self):
+        if self._flag is not None:
+            self._flag.set()
+        elif self._loop is not None:
+            self._loop.call_soon_threadsafe(self._event.set)
+
+    def put(self, item):
+        """追加到队尾并唤醒消费者 (任意线程)"""
+        with self._lock:
+            self._items.append(item)
+        self._notify()
+
+    def put_front(self, item):
+        """放回队首，例如发送失败后重试"""
+        with self._lock:
+            self._items.appendleft(item)
+        self._notify()
+
+    def pop(self):
+        """取出队首消息，队列为空时返回 None (不等待)"""
+        with self._lock:
+            if self._items:
+                return self._items.popleft()
+        return None
+
+    async def wait(self):
+        """等待直到队列非空；队列已有消息时立即返回"""
+        while not self._items:
+            if self._flag is not None:
+                await self._flag.wait()
+            else:
+                if self._loop is None:
+                    self._loop = asyncio.get_running_loop()
+                    if self._items:
+                        break
+                await self._event.wait()
+                self._event.clear()
@@ -7,6 +7,50 @@ RATE = 16000      # 采样率
 CHANNELS = 1      # 通道数
 BIT_DEPTH = 16    # 位深度
 
+# 音频上行编码: "json" = input_audio_buffer.append 事件 (base64)，"binary" = 二进制帧 (需网关支持)
+AUDIO_UPLINK_MODE = "json"
+
+# WebSocket 发送合并：队列里积压的多条消息编码进同一批次，一次 write + 一次 drain
+WS_BATCH_MAX_BYTES = 8192     # 单批最大字节数 (约 3 条音频消息)
+WS_BATCH_MAX_DELAY_MS = 0     # 队列取空后再等待后续消息的最长时间，0 = 取空即发送 (不增加延迟)
+
+# 事件插件：启动时按名字导入的模块，模块里用 @events.on("事件类型") 注册处理函数 (显示、工具调用等)
+EVENT_PLUGINS = ("display_events",)
+
+# 屏幕中文字库：二进制字库 (bench/font_convert.py 由 proverbs_20.py 生成) 只在内存中保留索引，字形按需从 flash 读取
+# 文件不存在时退回导入 proverbs_20.py 模块 (约 1MB 源码，导入慢且常驻内存)
+DISPLAY_FONT_FILE = "proverbs_20.fnt"
+DISPLAY_GLYPH_CACHE = 128  # LRU 字形缓存槽位数 (每槽 MAX_WIDTH*HEIGHT/8 = 58 字节，共约 7 KB)；
+# 对话回复里常用字反复出现，32 槽命中率不到 30%，128 槽约 45% (bench/bench_font.py)
+DISPLAY_LINE_BUFFER = True  # 整行在内存中合成 RGB565 后一次 blit_buffer 发出 (行缓冲 240x23x2 = 11KB)，False 为逐字 fill_rect + write
+DISPLAY_SCROLL = True       # 写满一屏后用屏幕的垂直滚动上移一行 (只重画露出的行)，False 为清屏后从头显示；需要行缓冲
+                            # 滚动时每行都要经过最窄的顶部行位，所以每行按顶部行位的宽度排 (行数比清屏模式多)
+DISPLAY_LAYOUT_CACHE = 4      # 整段显示的排版结果按文本哈希缓存的条数 (重复的提示语不再重新排版)，0 为不缓存
+DISPLAY_STREAM = True     # 回复文本随 response.audio_transcript.delta 逐段显示 (按播放进度同步)，False 为整段说完再显示
+DISPLAY_THREAD = True     # 屏幕绘制放在单独的线程 (display_worker)，False 为在事件循环里直接绘制
+
+# 日志 (log.py)：级别 "debug"/"info"/"warning"/"error"/"off"，串口打印会阻塞数毫秒，量产时建议 "warning"
+LOG_LEVEL = "info"
+LOG_FILE = None     # 例如 "/log.txt"：同时追加写入 flash 上的日志文件
+LOG_UDP = None      # 例如 ("192.168.1.10", 5140)：同时以 UDP 数据报发给局域网内的收集端
+
+# 运行时指标 (metrics.py)：每 METRICS_INTERVAL_S 秒取一次快照
+METRICS_INTERVAL_S = 60  # 0 表示不定期输出，只在连接结束时打印一次
+METRICS_FILE = None      # 快照追加写入的文件，例如 "/metrics.jsonl" (注意 flash 写入寿命)
+METRICS_WS_EVENT = None  # 非空时把快照作为该类型的事件经 WebSocket 发出，例如 "client.metrics" (需服务端能接受)
+
+# 播放抖动缓冲 (16kHz/16bit 下 32000 字节 = 1 秒)
+PLAYBACK_BUFFER_BYTES = 32768    # 缓冲容量
+PLAYBACK_LOW_WATERMARK = 6400    # 起播/欠载后至少攒够这么多 (200ms) 才开始输出
+PLAYBACK_HIGH_WATERMARK = 24576  # 超过后接收端暂停解码，让背压回到 TCP
+
+# VAD (语音活动检测) 配置
+VAD_ENGINE = "threshold"        # "threshold" = 固定阈值，"adaptive" = 自适应底噪 + 过零率 (适合嘈杂环境)
+VAD_THRESHOLD = 80              # 静音阈值 (平均绝对值)，adaptive 模式下作为最低门限
+VAD_MIN_SPEECH_S = 0.4          # 语音段最短有效时长 (秒)，更短的视为误触发
+VAD_POST_SPEECH_SILENCE_S = 1.5 # 语音后持续静音多久提交 (秒)
+VAD_PREROLL_CHUNKS = 3          # pre-roll 环形缓冲深度：起音前保留并补发的音频块数 (每块约 32ms，预分配 CHUNK*N 字节)
+
 # MIC I2S配置
 MIC_SCK_PIN = 4       # I2S SCK引脚
 MIC_WS_PIN = 5       # I2S WS引脚
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# 事件插件：在圆形屏幕上显示回复文本 (通过 config.EVENT_PLUGINS 加载)
+# DISPLAY_STREAM 时随 response.audio_transcript.delta 逐段追加，每段等扬声器播到它到达时的音频位置再画，
+# 文字与语音同步出现；否则等 response.audio_transcript.done 后整段重画
+# 绘制交给 display_worker 的线程 (DISPLAY_THREAD)，处理函数只把命令入队，不阻塞接收音频的事件循环
+import asyncio
+from hal import gc9a01
+import mix_display
+import display_worker
+import audio_playback
+import events
+import log
+import boot_timeline
+import tracer
+from config import DISPLAY_STREAM, DISPLAY_THREAD
+
+logger = log.get_logger("display")
+
+TEXT_COLOR = gc9a01.WRAP_V
+BG_COLOR = gc9a01.WHITE
+
+# 显示对象在第一次使用时创建 (初始化 SPI、清屏、加载字库)，不放在导入路径上
+display = None
+worker = None
+
+
+def get_display():
+    global display
+    if display is None:
+        display = mix_display.CircularTextDisplay(debug=1)
+        boot_timeline.mark("display_ready")
+    return display
+
+
+def get_worker():
+    global worker
+    if worker is None:
+        worker = display_worker.DisplayWorker(get_display(), DISPLAY_THREAD)
+    return worker
+
+
+async def start():
+    """插件启动钩子 (events.start_plugins)：在 WiFi 连接/WebSocket 握手期间提前初始化屏幕，启动绘制线程"""
+    await asyncio.sleep(0)
+    get_worker()
+    asyncio.create_task(_collect())
+
+
+async def _collect():
+    """接收绘制线程送回的结果"""
+    results = worker.results
+    while True:
+        await results.wait()
+        item = results.pop()
+        while item is not None:
+            _report(*item)
+            item = results.pop()
+
+
+def _report(kind, queued, drawn, first_glyph_ms):
+    """绘制线程画完一条命令：第一个字画出的时间记入 tracer，整段显示的耗时写日志"""
+    if first_glyph_ms is not None:
+        tracer.mark(tracer.FIRST_GLYPH, first_glyph_ms)
+    if kind == display_worker.SHOW:
+        logger.info("Total display_text time: %s ms (queued %s ms)", drawn, queued)
+
+
+async def display_text(text):
+    get_worker().show(text, TEXT_COLOR, BG_COLOR, 0.005)
+
+
+class TranscriptStream:
+    """
+    一次回复的流式文本：delta 连同到达时的 audio_playback.fed_bytes() 排队，
+    后台任务在播放进度到达该位置后把它交给绘制线程 (append)，只画新增的字
+    """
+
+    def __init__(self):
+        self.pending = []    # [(音频位置, 文本增量)]
+        self.text = []       # 已收到的全部增量，done 时与完整文本核对
+        self.closed = False
+        self.final = None    # 与增量不一致的完整文本：流式画完后整段重画
+        self.task = None
+
+    def push(self, delta):
+        self.pending.append((audio_playback.fed_bytes(), delta))
+        self.text.append(delta)
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    def close(self, final=None):
+        if final is not None:
+            self.final = final
+        self.closed = True
+
+    async def _run(self):
+        screen = get_worker()
+        screen.clear(TEXT_COLOR, BG_COLOR)
+        pending = self.pending
+        while pending or not self.closed:
+            if not pending or not audio_playback.reached(pending[0][0]):
+                await asyncio.sleep(0.02)
+                continue
+            screen.append(pending.pop(0)[1])
+            await asyncio.sleep(0)
+        # 已被下一轮回复取代时不再重画，免得盖住新的文本
+        if self.final is not None and _stream is self:
+            await display_text(self.final)
+
+
+_stream = None  # 当前回复的 TranscriptStream
+
+
+@events.on('response.created')
+async def on_response_created(ws, data):
+    global _stream
+    if _stream is not None:
+        _stream.close()
+    _stream = TranscriptStream() if DISPLAY_STREAM else None
+
+
+@events.on('response.audio_transcript.delta')
+async def on_transcript_delta(ws, data):
+    delta = data.get('delta')
+    if _stream is not None and delta:
+        _stream.push(delta)
+
+
+@events.on('response.audio_transcript.done')
+async def on_transcript_done(ws, data):
+    final_text = data.get('transcript')
+    if not final_text:
+        return
+    if _stream is not None and _stream.task is not None:
+        # 增量有缺失时由流式任务画完已收到的部分后整段重画；这里不等它，
+        # 它按播放进度推进，在接收循环里等待会卡住读取后续的 response.audio.done
+        _stream.close(None if "".join(_stream.text) == final_text else final_text)
+        return
+    #display.clear_screen()
+    await display_text(final_text)
+
+
+@events.on('response.done')
+async def on_response_done(ws, data):
+    if _stream is not None:
+        _stream.close()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+屏幕绘制线程：事件循环只把 show/append/clear/image 命令放进队列就返回，
+SPI 传输和逐行的 char_delay 等待都在单独的 _thread 线程里进行，不再阻塞同在事件循环里接收 response.audio.delta 的任务
+
+- 合并：show/clear/image 都会重画整屏，入队时丢弃队列里它之前的所有命令 (计入 display.dropped)，
+  正在画的 show 在画下一行之前发现已过时也会提前结束；相邻的 append 合并成一条
+- 每条命令画完后把 (命令, 排队 ms, 绘制 ms, 第一个字画出的 ticks_ms) 放进 results 通道，
+  由事件循环一侧 (display_events) 取出记入 tracer / 日志；排队与绘制耗时同时记入 metrics 直方图
+- threaded=False 时命令在调用处直接执行 (与之前一样占用事件循环)，供对比
+"""
+from hal import thread as _thread, ticks_ms, ticks_diff
+from channel import Channel
+import asyncio
+import log
+import metrics
+
+logger = log.get_logger("display")
+
+SHOW = 0
+APPEND = 1
+CLEAR = 2
+IMAGE = 3
+NAMES = ("show", "append", "clear", "image")
+
+_queue_ms = metrics.histogram("display.queue_ms", (5, 10, 20, 50, 100, 200, 500, 1000))
+_draw_ms = metrics.histogram("display.draw_ms")
+_dropped = metrics.counter("display.dropped")
+
+
+class DisplayWorker:
+    """
+    命令为元组 (种类, 入队 ticks_ms, 参数...)，队列只在 _lock 下访问；
+    _wake 平时处于锁定状态，入队后释放，绘制线程阻塞在 acquire 上等待，空闲时不轮询
+    """
+
+    def __init__(self, display, threaded=True, results=16):
+        self.display = display
+        self.threaded = threaded
+        self.results = Channel(results)
+        self._queue = []
+        self._lock = _thread.allocate_lock()
+        self._wake = _thread.allocate_lock()
+        self._wake.acquire()
+        self._stale = False  # 队列里有重画整屏的新命令，正在画的 show 可以停下
+        self.busy = False
+        self.running = threaded
+        if threaded:
+            _thread.start_new_thread(self._run, ())
+
+    # --- 事件循环一侧 ---
+    def show(self, text, color=None, bg_color=None, char_delay=None):
+        """整段显示 text (CircularTextDisplay.display_text)"""
+        self._put((SHOW, ticks_ms(), text, color, bg_color, char_delay), True)
+
+    def append(self, delta):
+        """接着流式文本追加 delta (CircularTextDisplay.append_text)"""
+        self._put((APPEND, ticks_ms(), delta), False)
+
+    def clear(self, color=None, bg_color=None):
+        """清屏并开始新的流式文本 (CircularTextDisplay.begin_text)"""
+        self._put((CLEAR, ticks_ms(), color, bg_color), True)
+
+    def image(self, path, x=0, y=0):
+        """显示 jpg 图片 (CircularTextDisplay.show_image)"""
+        self._put((IMAGE, ticks_ms(), path, x, y), True)
+
+    def _put(self, cmd, replaces):
+        if not self.threaded:
+            self._execute(cmd)
+            return
+        with self._lock:
+            queue = self._queue
+            if replaces:
+                if queue:
+                    _dropped.inc(len(queue))
+                    queue.clear()
+                self._stale = True
+                queue.append(cmd)
+            elif queue and queue[-1][0] == APPEND:
+                last = queue[-1]
+                queue[-1] = (APPEND, last[1], last[2] + cmd[2])
+            else:
+                queue.append(cmd)
+        if self._wake.locked():
+            self._wake.release()
+
+    @property
+    def idle(self):
+        return not self._queue and not self.busy
+
+    async def wait_idle(self, poll=0.02):
+        """等待队列里的命令全部画完"""
+        while self.running and not self.idle:
+            await asyncio.sleep(poll)
+
+    def stop(self):
+        """通知绘制线程退出 (异步生效)"""
+        self.running = False
+        if self._wake.locked():
+            self._wake.release()
+
+    # --- 绘制线程 ---
+    def _is_stale(self):
+        return self._stale
+
+    def _run(self):
+        while self.running:
+            self._wake.acquire()
+            while self.running:
+                with self._lock:
+                    if not self._queue:
+                        self.busy = False
+                        break
+                    cmd = self._queue.pop(0)
+                    self._stale = False
+                    self.busy = True
+                self._execute(cmd)
+
+    def _execute(self, cmd):
+        kind = cmd[0]
+        display = self.display
+        start = ticks_ms()
+        try:
+            if kind == SHOW:
+                display.display_text(cmd[2], cmd[3], cmd[4], cmd[5], stop=self._is_stale)
+            elif kind == APPEND:
+                display.append_text(cmd[2])
+            elif kind == CLEAR:
+                display.begin_text(cmd[2], cmd[3])
+            else:
+                display.show_image(cmd[2], cmd[3], cmd[4])
+        except Exception as e:
+            logger.error("Display %s failed: %s", NAMES[kind], e)
+        end = ticks_ms()
+        queued = ticks_diff(start, cmd[1])
+        drawn = ticks_diff(end, start)
+        _queue_ms.observe(queued)
+        _draw_ms.observe(drawn)
+        self.results.put((kind, queued, drawn, display.first_glyph_ms))
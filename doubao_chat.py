@@ -1,24 +1,38 @@
 # -*- coding: utf-8 -*-
-import uasyncio as asyncio
-import ujson as json
-import ubinascii
+import asyncio
+import json
 import time
-import _thread
-import sys
 import gc  # 引入垃圾回收模块
-from machine import I2S, Pin
-from collections import deque
-import mix_display
-import gc9a01  # Added import for gc9a01
+# 硬件接口经 hal 取得：设备上是 machine/_thread，CPython 上是 WAV 文件 I2S 与 threading
+from hal import I2S, Pin, thread as _thread, ticks_ms, ticks_diff, mem_free
 
 # 导入自定义库和配置
 from config import (WIFI_SSID, WIFI_PASSWORD, CHUNK, RATE, CHANNELS, BIT_DEPTH,
+                    AUDIO_UPLINK_MODE, WS_BATCH_MAX_BYTES, WS_BATCH_MAX_DELAY_MS,
+                    PLAYBACK_BUFFER_BYTES, PLAYBACK_LOW_WATERMARK, PLAYBACK_HIGH_WATERMARK,
+                    VAD_ENGINE, VAD_THRESHOLD, VAD_MIN_SPEECH_S,
+                    VAD_POST_SPEECH_SILENCE_S, VAD_PREROLL_CHUNKS,
                     MIC_SCK_PIN, MIC_WS_PIN, MIC_SD_PIN,
                     SPK_SCK_PIN, SPK_WS_PIN, SPK_SD_PIN,
-                    API_KEY, WS_URL, HEADERS, VOICE_ID,
+                    API_KEY, WS_URL, HEADERS, VOICE_ID, EVENT_PLUGINS,
+                    LOG_LEVEL, LOG_FILE, LOG_UDP,
+                    METRICS_INTERVAL_S, METRICS_FILE, METRICS_WS_EVENT,
                     instructions) # 确保 VOICE_ID 已导入
 # 假设 aiohttp 库位于同一目录或 sys.path 中
 from aiohttp import ClientSession, WSMsgType
+import audio_uplink
+import audio_playback
+import vad
+import event_sniff
+import events
+import log
+import metrics
+import tracer
+import boot_timeline
+from channel import Channel
+
+log.configure(LOG_LEVEL, LOG_FILE, LOG_UDP)
+logger = log.get_logger("chat")
 
 # --- 全局变量 ---
 audio_in = None         # I2S麦克风实例
@@ -26,29 +40,26 @@ audio_out = None        # I2S扬声器实例
 audio_recording = False # 是否正在录音
 audio_playing = False   # 是否正在播放音频
 session_configured = False # WebSocket会话是否已配置
-message_queue = None    # 消息发送队列 (deque)
-message_queue_lock = None # 消息队列锁
+message_queue = None    # 消息发送通道 (channel.Channel)：dict 为控制事件，bytearray 为待编码的 PCM 音频块
 audio_ws = None         # WebSocket 客户端实例 (供录音线程使用)
+player = None           # 播放阶段 (audio_playback.PlaybackStage)：抖动缓冲 + 播放线程
 waiting_for_response_creation = False  # 是否正在等待response.created事件
 waiting_start_time = 0  # 开始等待response.created的时间戳
 
+# --- 运行时指标 (metrics.py) ---
+_queue_depth = metrics.gauge("chat.queue_depth")
+_heap_free = metrics.gauge("heap.free")
+_commit_latency = metrics.histogram("vad.commit_latency_ms", (100, 200, 300, 500, 800, 1000, 1500, 2000))
+_first_delta = metrics.histogram("turn.first_delta_ms", (200, 500, 800, 1000, 1500, 2000, 3000, 5000, 10000))
+
+
+@metrics.collector
+def _sample_heap():
+    _heap_free.set(mem_free())
+
 # 事件ID计数器
 event_id_counter = 0
 
-#显示模块代码
-display = mix_display.CircularTextDisplay(debug=1)
-async def display_text(text):
-    start_time = time.ticks_ms() if hasattr(time, 'ticks_ms') else time.time() * 1000
-    display.display_text(
-        text=text,
-        color=gc9a01.WRAP_V,
-        bg_color=gc9a01.WHITE,
-        char_delay=0.005
-    )
-    end_time = time.ticks_ms() if hasattr(time, 'ticks_ms') else time.time() * 1000
-    print(f"Total display_text time: {end_time - start_time} ms")
-    print("Memory after display_text:")
-
 # --- 工具函数 ---
 def get_event_id():
     """生成唯一的事件ID"""
@@ -69,11 +80,10 @@ def init_i2s_mic():
         audio_in = I2S(0, sck=Pin(MIC_SCK_PIN), ws=Pin(MIC_WS_PIN), sd=Pin(MIC_SD_PIN),
                       mode=I2S.RX, bits=BIT_DEPTH, format=I2S.MONO if CHANNELS == 1 else I2S.STEREO,
                       rate=RATE, ibuf=CHUNK * 4) # 增加缓冲区大小
-        print("麦克风 I2S 初始化成功")
+        logger.info("麦克风 I2S 初始化成功")
         return audio_in
     except Exception as e:
-        print(f"❌ 初始化麦克风I2S失败: {e}")
-        sys.print_exception(e)
+        logger.exc(e, "❌ 初始化麦克风I2S失败: %s", e)
         audio_in = None
         gc.collect()  # 异常后清理内存
         return None
@@ -86,66 +96,98 @@ def init_i2s_speaker():
         audio_out = I2S(1, sck=Pin(SPK_SCK_PIN), ws=Pin(SPK_WS_PIN), sd=Pin(SPK_SD_PIN),
                        mode=I2S.TX, bits=BIT_DEPTH, format=I2S.MONO if CHANNELS == 1 else I2S.STEREO,
                        rate=RATE, ibuf=CHUNK * 8) # 增加缓冲区大小
-        print("扬声器 I2S 初始化成功")
+        logger.info("扬声器 I2S 初始化成功")
         return audio_out
     except Exception as e:
-        print(f"❌ 初始化扬声器I2S失败: {e}")
-        sys.print_exception(e)
+        logger.exc(e, "❌ 初始化扬声器I2S失败: %s", e)
         audio_out = None
         gc.collect()  # 异常后清理内存
         return None
 
 # --- 消息队列操作 ---
 def add_to_message_queue(message):
-    """将消息添加到队列中"""
-    global message_queue, message_queue_lock
-    if message_queue is None or message_queue_lock is None:
-        print("❌ 消息队列未初始化")
+    """将消息添加到队列中并唤醒发送任务 (可在录音线程中调用)"""
+    global message_queue
+    if message_queue is None:
+        logger.error("❌ 消息队列未初始化")
         return
-    with message_queue_lock:
-        message_queue.append(message)
-        # 如果队列长度超过阈值，触发垃圾回收
-        if len(message_queue) % 50 == 0:
-            gc.collect()
+    message_queue.put(message)
+    _queue_depth.set(len(message_queue))
+    # 如果队列长度超过阈值，触发垃圾回收
+    if len(message_queue) % 50 == 0:
+        gc.collect()
 
 # ... 其他代码保持不变 ...
 
 async def process_message_queue(ws):
-    """处理消息队列中的消息并发送到WebSocket"""
-    global message_queue, message_queue_lock
-    print("启动消息队列处理任务")
+    """
+    处理消息队列中的消息并发送到WebSocket
+    有消息时立即被唤醒，把积压的消息编码进同一个发送批次 (最多 WS_BATCH_MAX_BYTES)，
+    队列取空后 (可选地再等 WS_BATCH_MAX_DELAY_MS) 一次 write + drain；队列为空时挂起等待，不再轮询
+    """
+    global message_queue
+    logger.info("启动消息队列处理任务")
     message_count = 0
+    ws.ws.batch_max_bytes = WS_BATCH_MAX_BYTES
+    # 音频块在发送时才编码，编码器的输出缓冲区只在本任务中复用
+    uplink_encoder = audio_uplink.make_encoder(AUDIO_UPLINK_MODE, CHUNK)
     while True:
-        message = None
-        if message_queue is not None and message_queue_lock is not None:
-            with message_queue_lock:
-                if len(message_queue) > 0:
-                    message = message_queue.popleft()
-
-        if message:
+        await message_queue.wait()
+        batch_start = ticks_ms()
+        while True:
+            message = message_queue.pop()
+            if message is None:
+                # 队列已取空：在合并时限内再等一等后续消息，超时就发送
+                remaining = WS_BATCH_MAX_DELAY_MS - ticks_diff(ticks_ms(), batch_start)
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(message_queue.wait(), remaining / 1000)
+                except asyncio.TimeoutError:
+                    break
+                continue
             try:
-                await ws.send_json(message)
+                if isinstance(message, dict):
+                    await ws.queue_json(message)
+                else:
+                    await audio_uplink.queue_audio(ws, uplink_encoder, message)
                 message_count += 1
                 # 每处理100条消息执行一次垃圾回收
                 if message_count % 100 == 0:
                     gc.collect()
             except Exception as e:
-                print(f"❌ 发送消息时出错 ({message.get('type', '未知类型')}): {e}")
-                sys.print_exception(e)
+                msg_type = message.get('type', '未知类型') if isinstance(message, dict) else 'audio'
+                logger.exc(e, "❌ 发送消息时出错 (%s): %s", msg_type, e)
                 # 发送失败，将消息放回队列头部重试
-                with message_queue_lock:
-                    message_queue.appendleft(message)
+                message_queue.put_front(message)
                 await asyncio.sleep(0.1) # 稍作等待再重试
-        else:
-            # 队列为空，短暂休眠
-            await asyncio.sleep(0.01)
+                break
+        try:
+            await ws.flush()
+        except Exception as e:
+            logger.exc(e, "❌ 发送批次时出错: %s", e)
+            await asyncio.sleep(0.1)
+
+async def report_metrics(ws):
+    """每 METRICS_INTERVAL_S 秒取一次指标快照：按配置追加写入文件、经 WebSocket 发出，并记一条 DEBUG 日志"""
+    while True:
+        await asyncio.sleep(METRICS_INTERVAL_S)
+        try:
+            if METRICS_FILE:
+                metrics.registry.dump(METRICS_FILE)
+            if METRICS_WS_EVENT:
+                await metrics.registry.send(ws, METRICS_WS_EVENT)
+            if logger.enabled(log.DEBUG):
+                logger.debug("📊 指标快照: %s", metrics.registry.to_json())
+        except Exception as e:
+            logger.error("❌ 输出指标快照时出错: %s", e)
 
 # --- 音频录制线程 ---
 def audio_recording_thread(ws_obj):
     """音频录制线程，Client VAD模式"""
     global audio_recording, audio_in, audio_playing, session_configured
 
-    print("🎙️ 录音线程启动，等待会话配置...")
+    logger.info("🎙️ 录音线程启动，等待会话配置...")
     
     # 初始化时执行垃圾回收
     gc.collect()
@@ -153,25 +195,25 @@ def audio_recording_thread(ws_obj):
     # 等待会话配置完成
     while not session_configured:
         time.sleep(0.1)
-    print("✅ 会话已配置，录音线程继续")
+    logger.info("✅ 会话已配置，录音线程继续")
 
     # 初始化麦克风
     audio_in = init_i2s_mic()
     if not audio_in:
-        print("❌ 无法启动录音，麦克风初始化失败")
+        logger.error("❌ 无法启动录音，麦克风初始化失败")
         return
+    if boot_timeline.mark("mic_open"):
+        boot_timeline.report(logger.info)
 
     audio_buffer = bytearray(CHUNK)
-    MIN_VALID_SPEECH_DURATION_S = 0.4  # Minimum duration of speech (e.g., 400ms) to be considered valid
-    POST_SPEECH_SILENCE_THRESHOLD_S = 1.5 # Must be silent for this long after speech to commit
-    SILENCE_THRESHOLD = 80  # 静音阈值 (需要根据实际环境调整)
-
-    had_voice = False # True if voice has been detected in the current ongoing segment
-    current_speech_start_time = 0 # Timestamp when the current continuous speech started
-    last_sound_time = time.time() # Timestamp of the last audio chunk that contained sound
+    # VAD 引擎及参数见 config.py (VAD_ENGINE 等)
+    detector = vad.make_vad(VAD_ENGINE, rate=RATE, threshold=VAD_THRESHOLD,
+                            min_speech_s=VAD_MIN_SPEECH_S,
+                            post_speech_silence_s=VAD_POST_SPEECH_SILENCE_S,
+                            preroll_chunks=VAD_PREROLL_CHUNKS, chunk_size=CHUNK)
     cycle_count = 0
 
-    print("🎙️ 进入录音主循环")
+    logger.info("🎙️ 进入录音主循环")
 
     while True:
         # 周期性执行垃圾回收
@@ -184,21 +226,19 @@ def audio_recording_thread(ws_obj):
             # 如果停止录音（例如正在播放），则短暂休眠
             time.sleep(0.1)
             # 重置VAD状态，以便下次开始录音时重新检测
-            had_voice = False
-            current_speech_start_time = 0
-            last_sound_time = time.time()
+            detector.reset()
             continue
 
         # 确保麦克风已初始化
         if not audio_in:
-            print("🎤 麦克风未初始化，尝试重新初始化...")
+            logger.info("🎤 麦克风未初始化，尝试重新初始化...")
             audio_in = init_i2s_mic()
             if not audio_in:
-                print("❌ 麦克风重初始化失败，暂停录音")
+                logger.error("❌ 麦克风重初始化失败，暂停录音")
                 time.sleep(1)
                 continue
             else:
-                print("🎤 麦克风重初始化成功")
+                logger.info("🎤 麦克风重初始化成功")
 
         # --- 读取音频 ---
         try:
@@ -206,359 +246,422 @@ def audio_recording_thread(ws_obj):
 
             if bytes_read > 0:
                 # --- VAD 静音检测 ---
-                volume = 0
-                for i in range(0, bytes_read, 2):
-                    if i + 1 < bytes_read:
-                        sample = (audio_buffer[i+1] << 8) | audio_buffer[i]
-                        if sample & 0x8000: sample = -((~sample & 0xFFFF) + 1)
-                        volume += abs(sample)
-                avg_volume = volume / (bytes_read // 2) if bytes_read > 0 else 0
-
-                current_time = time.time()
-                is_currently_silent_chunk = avg_volume <= SILENCE_THRESHOLD
-
-                if not is_currently_silent_chunk:
-                    # Current chunk has sound
-                    if not had_voice: # Transitioning from silence/no-voice to sound
-                        print("🎤 检测到声音开始")
-                        had_voice = True
-                        current_speech_start_time = current_time # Mark start of this speech segment
-                    last_sound_time = current_time # Update timestamp of last sound activity
+                state = detector.feed(audio_buffer, bytes_read)
+
+                if state == vad.ONSET:
+                    logger.info("🎤 检测到声音开始 (补发 pre-roll %s 字节)", detector.preroll_bytes)
+                    tracer.begin()
+                    # 起音之前缓存的块与本块合成一条消息整批发送，避免丢掉第一个音节
+                    add_to_message_queue(detector.preroll(audio_buffer, bytes_read))
 
+                elif state == vad.SPEECH:
                     # --- 发送音频数据 ---
-                    audio_b64 = ubinascii.b2a_base64(audio_buffer[:bytes_read]).decode('utf-8').strip()
-                    audio_msg ={
-                        "type": "input_audio_buffer.append",
-                        "audio": audio_b64
+                    # 只拷贝原始 PCM 入队，编码交给发送任务 (见 audio_uplink)
+                    add_to_message_queue(audio_buffer[:bytes_read])
+
+                elif state == vad.COMMIT:
+                    logger.info("🎤 有效语音段结束 (持续: %.2fs, 静音 %.2fs 后提交). 准备提交.", detector.speech_duration, detector.commit_latency)
+                    _commit_latency.observe(int(detector.commit_latency * 1000))
+                    commit_msg ={
+                        "event_id": get_event_id(),
+                        "type": "input_audio_buffer.commit"
                     }
-                    add_to_message_queue(audio_msg)
-                else:
-                    # Current chunk is silent
-                    if had_voice:
-                        # Was in a speech segment, but current chunk is silent.
-                        # Check if criteria met for commit.
-                        duration_of_silence_after_sound = current_time - last_sound_time
-
-                        if duration_of_silence_after_sound >= POST_SPEECH_SILENCE_THRESHOLD_S:
-                            actual_speech_duration = last_sound_time - current_speech_start_time
-                            print(f"🎤 检测到持续静音 >= {POST_SPEECH_SILENCE_THRESHOLD_S}s (实际: {duration_of_silence_after_sound:.2f}s). 前序语音时长: {actual_speech_duration:.2f}s.")
-
-                            if actual_speech_duration >= MIN_VALID_SPEECH_DURATION_S:
-                                print(f"🎤 有效语音段结束 (持续: {actual_speech_duration:.2f}s). 准备提交.")
-                                commit_msg ={
-                                    "type": "input_audio_buffer.commit"
-                                }
-                                add_to_message_queue(commit_msg)
-                                print("✅ 已添加 input_audio_buffer.commit 事件到队列")
-
-                                had_voice = False # Reset VAD state
-                                audio_recording = False
-                                print("⏸️ VAD 提交后暂停录音，等待服务器响应")
-                                # 适当延长暂停时间
-                                time.sleep(0.5)  # 给服务器更多响应时间
-                                gc.collect() # 内存清理
-                            else:
-                                print(f"🎤 语音段过短 (仅 {actual_speech_duration:.2f}s), 未达到 {MIN_VALID_SPEECH_DURATION_S}s. 忽略并重置VAD.")
-                                had_voice = False # Reset VAD state, effectively ignoring the short utterance
-                                current_speech_start_time = 0  # 新增：清除语音起始时间
-                                last_sound_time = current_time  # 新增：更新最后声音时间为当前
-                        # If silence duration is less than POST_SPEECH_SILENCE_THRESHOLD_S, do nothing yet, continue accumulating silence.
+                    # 本轮时延记录以 commit 事件的 event_id 为键
+                    tracer.tag(commit_msg["event_id"])
+                    tracer.mark(tracer.COMMIT)
+                    add_to_message_queue(commit_msg)
+                    logger.info("✅ 已添加 input_audio_buffer.commit 事件到队列")
+
+                    audio_recording = False
+                    logger.info("⏸️ VAD 提交后暂停录音，等待服务器响应")
+                    # 适当延长暂停时间
+                    time.sleep(0.5)  # 给服务器更多响应时间
+                    gc.collect() # 内存清理
+
+                elif state == vad.DISCARD:
+                    tracer.cancel()
+                    logger.info("🎤 语音段过短 (仅 %.2fs), 未达到 %ss. 忽略并重置VAD.", detector.speech_duration, VAD_MIN_SPEECH_S)
             else: # bytes_read == 0
                 time.sleep(0.01)
 
         except Exception as e:
-            print(f"❌ 录音或VAD处理中发生错误: {e}")
-            sys.print_exception(e)
+            logger.exc(e, "❌ 录音或VAD处理中发生错误: %s", e)
             if audio_in:
                 try:
                     audio_in.deinit()
-                    print("麦克风反初始化完成")
+                    logger.info("麦克风反初始化完成")
                 except Exception as deinit_e:
-                    print(f"❌ 反初始化麦克风时出错: {deinit_e}")
+                    logger.error("❌ 反初始化麦克风时出错: %s", deinit_e)
                 audio_in = None
             gc.collect()  # 异常后清理内存
             time.sleep(0.5)
 
-    print("录音线程退出清理")
+    logger.info("录音线程退出清理")
     if audio_in:
         try:
             audio_in.deinit()
-            print("麦克风 I2S 关闭完成")
+            logger.info("麦克风 I2S 关闭完成")
             audio_in = None
         except Exception as e:
-            print(f"关闭麦克风I2S时出错: {e}")
+            logger.error("关闭麦克风I2S时出错: %s", e)
     gc.collect()  # 线程结束时清理内存
 
 # --- 音频播放 ---
-def play_audio_data(audio_data_base64):
-    """解码并播放base64编码的音频数据"""
-    global audio_out, audio_playing
+def ensure_player():
+    """确保扬声器和播放线程就绪，返回 PlaybackStage；失败返回 None"""
+    global audio_out, player
 
     if audio_out is None:
-        print("播放时发现扬声器未初始化，尝试初始化...")
+        logger.info("播放时发现扬声器未初始化，尝试初始化...")
         audio_out = init_i2s_speaker()
         if audio_out is None:
-            print("❌ 无法播放音频，扬声器I2S初始化失败")
-            return False
-        print("扬声器重新初始化成功")
+            logger.error("❌ 无法播放音频，扬声器I2S初始化失败")
+            return None
+        logger.info("扬声器重新初始化成功")
 
+    if player is not None and not player.running and not player.stopped:
+        logger.warning("播放线程尚未退出，丢弃本段音频")
+        return None
+    if player is None or player.sink is not audio_out or not player.running:
+        player = audio_playback.PlaybackStage(audio_out, PLAYBACK_BUFFER_BYTES,
+                                              PLAYBACK_LOW_WATERMARK, PLAYBACK_HIGH_WATERMARK)
+        player.start()
+        logger.info("🔊 播放线程已启动")
+    return player
+
+
+async def stop_player():
+    """
+    停止播放线程并等待其退出，返回 True 后才能安全地反初始化扬声器；
+    超时 (线程仍在 sink.write 里) 返回 False，保留 player 以便之后再等
+    """
+    global player
+    if player is None:
+        return True
+    player.stop()
+    for _ in range(50):
+        if player.stopped:
+            break
+        await asyncio.sleep(0.02)
+    else:
+        logger.error("❌ 播放线程 1 秒内未退出，暂不反初始化扬声器")
+        return False
+    jitter = player.jitter
+    logger.info("播放统计: 欠载 %s 次, 溢出 %s 次, 最高水位 %s 字节", jitter.underruns, jitter.overruns, jitter.max_level)
+    player = None
+    return True
+
+
+async def play_audio_data(audio_data_base64, start=0, end=None):
+    """
+    解码base64编码的音频数据 audio_data_base64[start:end] 并放入播放缓冲，由播放线程写入扬声器
+    audio_data_base64 可以是 str，也可以是原始消息缓冲区 (只解码 delta 所在区间，不拷贝)
+    """
+    global audio_out
+
+    stage = ensure_player()
+    if stage is None:
+        return False
+
+    if end is None:
+        end = len(audio_data_base64)
     try:
         # 检查输入数据的有效性
-        if not audio_data_base64 or len(audio_data_base64) == 0:
-            print("收到空音频数据块，跳过播放")
+        base64_len = end - start
+        if base64_len <= 0:
+            logger.info("收到空音频数据块，跳过播放")
             return True
             
-        # 打印音频数据大小
-        base64_len = len(audio_data_base64)
+        # 打印音频数据大小 (DEBUG 级别)
         if base64_len > 1000:  # 只打印大型音频数据的大小
-            print(f"收到音频数据: {base64_len} 字节 (Base64编码)")
+            logger.throttled(200, log.DEBUG, "收到音频数据: %s 字节 (Base64编码)", base64_len)
         
-        # 解码 Base64 数据为二进制
+        # 按块流式解码 Base64 放入抖动缓冲，这里只入队，不等待扬声器
         try:
-            audio_bytes = ubinascii.a2b_base64(audio_data_base64)
+            total_bytes = await stage.feed(audio_data_base64, start, end)
         except ValueError as e:
-            print(f"❌ Base64 解码失败: {e}")
-            print(f"数据预览: '{audio_data_base64[:50]}...' (长度: {len(audio_data_base64)})")
+            logger.error("❌ Base64 解码失败: %s", e)
+            preview = audio_data_base64[start:min(end, start + 50)]
+            if not isinstance(preview, str):
+                preview = str(bytes(preview), "utf-8")
+            logger.error("数据预览: '%s...' (长度: %s)", preview, base64_len)
             gc.collect()  # 解码失败后清理内存
             return False
-            
-        bin_len = len(audio_bytes)
-        if bin_len > 1000:  # 只打印大型音频数据的大小
-            print(f"解码后音频数据: {bin_len} 字节 (二进制)")
-            
-        if bin_len == 0:
-            print("Base64 解码后得到空数据，跳过播放")
+
+        if total_bytes > 1000:  # 只打印大型音频数据的大小
+            logger.throttled(200, log.DEBUG, "解码后音频数据: %s 字节 (二进制), 播放缓冲 %s 字节", total_bytes, stage.jitter.level)
+
+        if total_bytes == 0:
+            logger.info("Base64 解码后得到空数据，跳过播放")
             return True
-            
-        # 写入音频数据到扬声器
-        chunk_size = 4096  # 使用分块写入以避免可能的缓冲区限制
-        bytes_written = 0
-        total_bytes = len(audio_bytes)
-        offset = 0
-        
-        while offset < total_bytes:
-            chunk = audio_bytes[offset:offset+chunk_size]
-            try:
-                bytes_chunk = audio_out.write(chunk)
-                if bytes_chunk <= 0:
-                    print(f"⚠️ 播放器写入返回 {bytes_chunk}，可能需要丢弃此块")
-                    # 尝试短暂等待后继续
-                    time.sleep(0.01)
-                    continue
-                    
-                bytes_written += bytes_chunk
-                offset += bytes_chunk
-                
-                # 如果写入的字节数少于请求的字节数，可能需要等待一下
-                if bytes_chunk < len(chunk):
-                    print(f"⚠️ 部分写入: {bytes_chunk}/{len(chunk)} 字节")
-                    time.sleep(0.01)  # 短暂等待让扬声器缓冲区清空一些
-                
-            except Exception as write_err:
-                print(f"❌ 写入音频数据失败: {write_err}")
-                sys.print_exception(write_err)
-                # 尝试继续写入剩余数据
-                offset += len(chunk)  # 跳过当前块
-        
-        # 检查是否全部写入
-        if bytes_written < total_bytes:
-            print(f"⚠️ 未能完全写入音频数据: 写入 {bytes_written}/{total_bytes} 字节")
-            # 即使没有完全写入，也认为是部分成功
-            return True if bytes_written > 0 else False
-            
+
         return True
         
     except Exception as e:
-        print(f"❌ 音频解码或播放失败: {e}")
-        sys.print_exception(e)
-        if audio_out:
+        logger.exc(e, "❌ 音频解码或播放失败: %s", e)
+        if await stop_player() and audio_out:
             try:
                 audio_out.deinit()
-                print("扬声器反初始化完成")
+                logger.info("扬声器反初始化完成")
             except Exception as deinit_e:
-                print(f"❌ 反初始化扬声器时出错: {deinit_e}")
+                logger.error("❌ 反初始化扬声器时出错: %s", deinit_e)
             audio_out = None
         gc.collect()  # 异常后清理内存
         return False
 
+
+async def resume_recording_after_playback():
+    """等缓冲中的音频播完后再重新开启录音，避免麦克风录到扬声器的声音"""
+    global audio_recording, audio_playing
+
+    if player is not None:
+        await player.wait_idle()
+        if player.first_write_ms is not None:
+            tracer.mark(tracer.FIRST_PCM, player.first_write_ms)
+    turn = tracer.finish()
+    if turn is not None:
+        tracer.tracer.report_turn(turn, logger.info)
+
+    # Add a small delay before re-enabling recording.
+    # This is a speculative attempt to give the server a moment if it's sensitive
+    # to immediate re-engagement after a response.done.
+    await asyncio.sleep(0.5)  # 增加到0.5秒，给服务器更多缓冲时间
+
+    if audio_playing:
+        audio_playing = False
+        audio_recording = True
+        logger.info("响应完成，设置 audio_playing = False, audio_recording = True")
+    else:
+        # This branch handles cases where response.done might arrive without prior audio_delta
+        if not audio_recording: # Only set to true if it was false
+            audio_recording = True
+            logger.info("响应完成 (无音频播放)，设置 audio_recording = True")
+    gc.collect()  # 响应完成后清理内存
+
 # --- WebSocket 消息处理 ---
-async def handle_message(ws, data):
-    """处理接收到的服务端消息"""
-    global audio_recording, audio_playing, session_configured, waiting_for_response_creation
+# 每种服务端事件一个处理协程，通过 events 分发表按类型查找；显示、工具调用等扩展在插件模块里注册 (config.EVENT_PLUGINS)
+
+@events.on(event_sniff.AUDIO_DELTA)
+async def on_audio_delta(ws, buf, start, end):
+    """处理 response.audio.delta：buf[start:end] 为 base64 音频 (str 或原始消息缓冲区)"""
+    global audio_recording, audio_playing
+    if end <= start:
+        logger.throttled(1000, log.WARNING, "⚠️ 收到空的 response.audio.delta")
+        return True
+    if not audio_playing:
+        logger.info("🔊 检测到音频流开始，设置 audio_playing = True, audio_recording = False")
+        audio_recording = False
+        audio_playing = True
+        turn = tracer.tracer.current
+        if turn is not None and not turn.has(tracer.FIRST_DELTA):
+            tracer.mark(tracer.FIRST_DELTA)
+            ms = turn.span(tracer.COMMIT, tracer.FIRST_DELTA)
+            if ms is not None:
+                _first_delta.observe(ms)
+    if not await play_audio_data(buf, start, end):
+        # 原始区间解码失败时退回 json.loads 取反转义后的 delta 再试一次 (含反斜杠的 delta 分拣时已经走 json.loads)
+        if not isinstance(buf, str):
+            try:
+                delta = event_sniff.loads(buf).get("delta") or ""
+            except (ValueError, AttributeError):
+                delta = ""
+            if delta and await play_audio_data(delta):
+                logger.throttled(1000, log.WARNING, "⚠️ response.audio.delta 原始区间解码失败，已按 json.loads 的结果播放")
+                return True
+        logger.error("❌ 处理 'response.audio.delta' 时播放音频数据失败。")
+        return False # Indicate that this message could not be successfully processed
+    return True
 
-    try:
-        if not isinstance(data, dict):
-            print(f"接收到非JSON格式消息: {data}")
-            return True
 
-        event_type = data.get('type')
-        print(f"收到事件: {event_type}")
-
-        if event_type == 'session.created':
-            print(f"🆕 会话创建成功 (ID: {data.get('session', {}).get('id')})")
-            # 发送会话配置更新
-            session_config = {
-                "type": "session.update",
-                "session": {
-                    "modalities": ["text","audio"],
-                    "instructions": instructions,
-                    "voice": VOICE_ID,
-                    "input_audio_format": "pcm16",
-                    "output_audio_format": "pcm16",
-                    "tools": [{
-                        "type": "function",
-                        "name": "get_weather",
-                        "description": "获取当前天气",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "location": {
-                                    "type": "string"
-                                }
-                            },
-                            "required": ["location"]
+@events.on('session.created')
+async def on_session_created(ws, data):
+    logger.info("🆕 会话创建成功 (ID: %s)", data.get('session', {}).get('id'))
+    # 发送会话配置更新
+    session_config = {
+        "type": "session.update",
+        "session": {
+            "modalities": ["text","audio"],
+            "instructions": instructions,
+            "voice": VOICE_ID,
+            "input_audio_format": "pcm16",
+            "output_audio_format": "pcm16",
+            "tools": [{
+                "type": "function",
+                "name": "get_weather",
+                "description": "获取当前天气",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "location": {
+                            "type": "string"
                         }
-                    }],
+                    },
+                    "required": ["location"]
                 }
-            }
-            await ws.send_json(session_config)
-            print("✅ 已发送会话配置更新")
-            gc.collect()  # 会话创建后清理内存
-
-        elif event_type == 'session.updated':
-            print(f"✅ 会话配置已更新: {data.get('session')}")
-            if not session_configured:
-                session_configured = True
-                audio_recording = True
-                print("✅ 会话配置完成，设置 audio_recording = True")
-                _thread.start_new_thread(audio_recording_thread, (ws,))
-                print("✅ 已启动录音线程")
-                gc.collect()  # 会话配置完成后清理内存
-
-        elif event_type == 'response.audio.delta':
-            audio_delta = data.get('delta')
-            if audio_delta:
-                if not audio_playing:
-                    print("🔊 检测到音频流开始，设置 audio_playing = True, audio_recording = False")
-                    audio_recording = False
-                    audio_playing = True
-                if not play_audio_data(audio_delta):
-                    print("❌ 处理 'response.audio.delta' 时播放音频数据失败。")
-                    return False # Indicate that this message could not be successfully processed
-            else:
-                print("⚠️ 收到空的 response.audio.delta")
+            }],
+        }
+    }
+    await ws.send_json(session_config)
+    logger.info("✅ 已发送会话配置更新")
+    gc.collect()  # 会话创建后清理内存
+
+
+@events.on('session.updated')
+async def on_session_updated(ws, data):
+    global audio_recording, session_configured
+    logger.info("✅ 会话配置已更新: %s", data.get('session'))
+    if not session_configured:
+        session_configured = True
+        audio_recording = True
+        boot_timeline.mark("session_updated")
+        logger.info("✅ 会话配置完成，设置 audio_recording = True")
+        _thread.start_new_thread(audio_recording_thread, (ws,))
+        logger.info("✅ 已启动录音线程")
+        gc.collect()  # 会话配置完成后清理内存
+
+
+@events.on('response.audio.done')
+async def on_audio_done(ws, data):
+    logger.info("✅ 音频片段接收完成 (response.audio.done)")
+    tracer.mark(tracer.AUDIO_DONE)
+    if player is not None:
+        player.end_of_stream()
+    gc.collect()  # 音频播放完成后清理内存
+
+
+@events.on('response.done')
+async def on_response_done(ws, data):
+    logger.info("✅✅✅ 服务端响应完成 (response.done)")
+    tracer.mark(tracer.RESPONSE_DONE)
+    if player is not None:
+        player.end_of_stream()
+    # 在后台等待播放结束再恢复录音，接收循环继续处理消息
+    asyncio.create_task(resume_recording_after_playback())
+
+
+@events.on('conversation.item.input_audio_transcription.completed')
+async def on_input_transcription(ws, data):
+    transcript = data.get('transcript')
+    logger.info("📝 语音转文字结果: %s", transcript)
+
+
+@events.on('input_audio_buffer.committed')
+async def on_input_committed(ws, data):
+    global waiting_for_response_creation
+    item_id = data.get('item_id')
+    logger.info("✅ 服务端已确认音频提交 (Item ID: %s)", item_id)
+    tracer.mark(tracer.COMMITTED)
+    waiting_for_response_creation = True
+    
+    # 立即发送response.create消息，不依赖消息队列，避免延迟
+    response_create_msg = {
+        "type": "response.create",
+        "response": {
+            "modalities": ["text","audio"],
+            "voice": VOICE_ID
+        }
+    }
+    try:
+        # 直接发送，而不是加入队列，减少延迟
+        await ws.send_json(response_create_msg)
+        tracer.mark(tracer.CREATE_SENT)
+        logger.info("✅ 已直接发送 response.create 事件")
+    except Exception as e:
+        logger.error("❌ 发送 response.create 消息时出错: %s", e)
+        # 如果直接发送失败，再尝试加入队列
+        add_to_message_queue(response_create_msg)
 
-        elif event_type == 'response.audio.done':
-            print("✅ 音频片段播放完成 (response.audio.done)")
-            gc.collect()  # 音频播放完成后清理内存
 
-        elif event_type == 'response.done':
-            print("✅✅✅ 服务端响应完成 (response.done)")
+@events.on('error')
+async def on_error(ws, data):
+    error_info = data.get('error', {})
+    logger.error("❌ 服务端错误: %s - %s - %s", error_info.get('type'), error_info.get('code'), error_info.get('message'))
+    gc.collect()  # 错误发生后清理内存
 
-            # Add a small delay before re-enabling recording.
-            # This is a speculative attempt to give the server a moment if it's sensitive
-            # to immediate re-engagement after a response.done.
-            await asyncio.sleep(0.5)  # 增加到0.5秒，给服务器更多缓冲时间
 
-            if audio_playing:
-                audio_playing = False
-                audio_recording = True
-                print("响应完成，设置 audio_playing = False, audio_recording = True")
-            else:
-                # This branch handles cases where response.done might arrive without prior audio_delta
-                if not audio_recording: # Only set to true if it was false
-                    audio_recording = True
-                    print("响应完成 (无音频播放)，设置 audio_recording = True")
-            gc.collect()  # 响应完成后清理内存
-
-        elif event_type == 'conversation.item.input_audio_transcription.completed':
-            transcript = data.get('transcript')
-            print(f"📝 语音转文字结果: {transcript}")
-
-        elif event_type == 'input_audio_buffer.committed':
-            item_id = data.get('item_id')
-            print(f"✅ 服务端已确认音频提交 (Item ID: {item_id})")
-            waiting_for_response_creation = True
-            
-            # 立即发送response.create消息，不依赖消息队列，避免延迟
-            response_create_msg = {
-                "type": "response.create",
-                "response": {
-                    "modalities": ["text","audio"],
-                    "voice": VOICE_ID
-                }
-            }
-            try:
-                # 直接发送，而不是加入队列，减少延迟
-                await ws.send_json(response_create_msg)
-                print("✅ 已直接发送 response.create 事件")
-            except Exception as e:
-                print(f"❌ 发送 response.create 消息时出错: {e}")
-                # 如果直接发送失败，再尝试加入队列
-                add_to_message_queue(response_create_msg)
-
-        elif event_type == 'error':
-            error_info = data.get('error', {})
-            print(f"❌ 服务端错误: {error_info.get('type')} - {error_info.get('code')} - {error_info.get('message')}")
-            gc.collect()  # 错误发生后清理内存
-
-        elif event_type == 'response.audio_transcript.delta':
-            delta_text = data.get('delta')
-            print(f"💬 文本增量: {delta_text}")
-
-        elif event_type == 'response.audio_transcript.done':
-            final_text = data.get('transcript')
-            print(f"✅ 文本响应完成: {final_text}")
-            # 显示文本
-            #display.clear_screen()
-            asyncio.create_task(display_text(final_text))
-            gc.collect()  # 文本响应完成后清理内存
-
-        elif event_type == 'response.created':
-            waiting_for_response_creation = False
-            print(f"✅ 服务端响应流已创建: {data.get('response', {}).get('id')}")
-            # No specific action needed by client for basic audio chat, but event is acknowledged
-
-        elif event_type == 'response.output_item.added':
-            item_info = data.get('item', {})
-            item_type = item_info.get('type')
-            print(f"ℹ️ 服务端已添加输出项 (ID: {item_info.get('id')}, Type: {item_type})")
-            # No specific action needed by client for basic audio chat, but event is acknowledged
-            # If item_type is 'function_call', you might log more details or prepare for function call data
-
-        elif event_type == 'response.output_item.done':
-            item_info = data.get('item', {})
-            item_type = item_info.get('type')
-            print(f"✅ 服务端输出项完成 (ID: {item_info.get('id')}, Type: {item_type})")
-            # No specific action needed by client for basic audio chat, but event is acknowledged
-
-        else:
-            print(f"❓ 收到未处理/未知事件: {event_type} - {json.dumps(data)}")
+@events.on('response.audio_transcript.delta')
+async def on_transcript_delta(ws, data):
+    delta_text = data.get('delta')
+    logger.info("💬 文本增量: %s", delta_text)
+
+
+@events.on('response.audio_transcript.done')
+async def on_transcript_done(ws, data):
+    # 屏幕显示由 display_events 插件注册的处理函数负责
+    final_text = data.get('transcript')
+    logger.info("✅ 文本响应完成: %s", final_text)
+    gc.collect()  # 文本响应完成后清理内存
+
+
+@events.on('response.created')
+async def on_response_created(ws, data):
+    global waiting_for_response_creation
+    waiting_for_response_creation = False
+    tracer.mark(tracer.CREATED)
+    logger.info("✅ 服务端响应流已创建: %s", data.get('response', {}).get('id'))
+    # No specific action needed by client for basic audio chat, but event is acknowledged
+
+
+@events.on('response.output_item.added')
+async def on_output_item_added(ws, data):
+    item_info = data.get('item', {})
+    item_type = item_info.get('type')
+    logger.info("ℹ️ 服务端已添加输出项 (ID: %s, Type: %s)", item_info.get('id'), item_type)
+    # No specific action needed by client for basic audio chat, but event is acknowledged
+    # If item_type is 'function_call', you might log more details or prepare for function call data
+
+
+@events.on('response.output_item.done')
+async def on_output_item_done(ws, data):
+    item_info = data.get('item', {})
+    item_type = item_info.get('type')
+    logger.info("✅ 服务端输出项完成 (ID: %s, Type: %s)", item_info.get('id'), item_type)
+    # No specific action needed by client for basic audio chat, but event is acknowledged
+
+
+@events.fallback
+async def on_unknown_event(ws, event_type, data):
+    logger.warning("❓ 收到未处理/未知事件: %s - %s", event_type, json.dumps(data))
+
+
+# 插件模块在导入时注册各自的处理函数 (例如 display_events 在屏幕上显示回复文本)
+events.load_plugins(EVENT_PLUGINS)
+
+
+async def handle_message(ws, data):
+    """处理接收到的服务端消息 (已 json.loads 的 dict)，按事件类型查表分发"""
+    try:
+        if not isinstance(data, dict):
+            logger.info("接收到非JSON格式消息: %s", data)
+            return True
+
+        event_type = data.get('type')
+        if event_type == event_sniff.AUDIO_DELTA:
+            # 音频增量处理函数统一接收 (buf, start, end)
+            audio_delta = data.get('delta') or ''
+            return await events.router.dispatch(event_type, ws, audio_delta, 0, len(audio_delta))
+        return await events.router.dispatch(event_type, ws, data)
 
     except Exception as e:
-        print(f"❌ 处理消息时发生异常: {e}")
-        sys.print_exception(e)
+        logger.exc(e, "❌ 处理消息时发生异常: %s", e)
         gc.collect()  # 异常后清理内存
         return False
 
-    return True
-
 # --- 主客户端逻辑 ---
 async def chat_client():
-    global audio_recording, audio_playing, message_queue, message_queue_lock
+    global audio_recording, audio_playing, message_queue
     global audio_in, audio_out, session_configured, audio_ws, waiting_for_response_creation
     global waiting_start_time
 
-    print("启动 chat_client")
+    logger.info("启动 chat_client")
     
     # 启动时执行垃圾回收
     gc.collect()
-    print(f"初始可用内存: {gc.mem_free()} 字节")
+    logger.info("初始可用内存: %s 字节", mem_free())
 
-    # 初始化消息队列和锁
-    message_queue = deque([], 1024)
-    message_queue_lock = _thread.allocate_lock()
-    print("消息队列和锁初始化完成")
+    # 初始化消息通道 (内部自带锁)
+    message_queue = Channel(1024)
+    logger.info("消息队列初始化完成")
     
     # 主连接循环，允许断线重连
     connection_attempts = 0
@@ -576,25 +679,28 @@ async def chat_client():
         audio_ws = None
 
         try:
-            print(f"尝试连接到: {WS_URL} (第{connection_attempts}次尝试)")
+            logger.info("尝试连接到: %s (第%s次尝试)", WS_URL, connection_attempts)
             async with ClientSession(headers=HEADERS) as session:
-                print("ClientSession 创建成功")
+                logger.info("ClientSession 创建成功")
                 async with session.ws_connect(WS_URL) as ws:
-                    print("✅ WebSocket 连接成功!")
+                    logger.info("✅ WebSocket 连接成功!")
+                    boot_timeline.mark("ws_open")
                     audio_ws = ws
+                    ws.ws.raw_text = True  # TEXT 消息交给 event_sniff 分拣，不在协议层解码成 str
 
                     # 启动消息队列处理任务
                     queue_task = asyncio.create_task(process_message_queue(ws))
-                    print("消息队列处理任务已创建")
+                    logger.info("消息队列处理任务已创建")
+                    metrics_task = asyncio.create_task(report_metrics(ws)) if METRICS_INTERVAL_S > 0 else None
 
                     # 消息接收循环
                     keep_running = True
-                    print("👂 开始监听 WebSocket 消息...")
+                    logger.info("👂 开始监听 WebSocket 消息...")
                     loop_count = 0
                     
                     # 此连接成功，重置连接尝试计数
                     if connection_attempts > 0:
-                        print(f"连接建立成功，重置连接尝试计数")
+                        logger.info("连接建立成功，重置连接尝试计数")
                         connection_attempts = 0
                     
                     while keep_running:
@@ -604,13 +710,15 @@ async def chat_client():
                             if loop_count >= 100:  # 每100次循环执行一次垃圾回收
                                 gc.collect()
                                 loop_count = 0
-                                print(f"当前可用内存: {gc.mem_free()} 字节")
+                                free = mem_free()
+                                _heap_free.set(free)
+                                logger.info("当前可用内存: %s 字节", free)
                                 
                                 # 检查是否在等待response.created但长时间未收到
                                 if waiting_for_response_creation:
                                     waiting_time = time.time() - waiting_start_time
                                     if waiting_time > 15.0:  # 如果等待超过15秒，认为服务器可能卡住
-                                        print(f"⚠️ 已等待response.created事件 {waiting_time:.1f}秒，可能需要重置连接")
+                                        logger.warning("⚠️ 已等待response.created事件 %.1f秒，可能需要重置连接", waiting_time)
                                         waiting_for_response_creation = False
                                         keep_running = False  # 通知主循环结束连接
                                         break  # 退出当前循环
@@ -624,154 +732,168 @@ async def chat_client():
                             async def receive_with_timeout():
                                 async for msg in ws:
                                     if msg.type == WSMsgType.TEXT:
+                                        # msg.data 是原始 UTF-8 载荷 (ws.ws.raw_text)：先按 "type" 分拣，
+                                        # 音频增量直接解码 delta 区间，其余事件才做 json.loads
                                         try:
-                                            data = json.loads(msg.data)
+                                            event_type, data, start, end = event_sniff.parse(msg.data)
                                         except ValueError as json_err:
-                                            print(f"❌ JSON 解码失败: {json_err}")
+                                            logger.error("❌ JSON 解码失败: %s", json_err)
                                             actual_len = len(msg.data)
-                                            print(f"接收到无法解析的文本消息 (实际长度 {actual_len}):")
-                                            print(f"  Data (first 200 chars): {msg.data[:200]}")
+                                            logger.error("接收到无法解析的文本消息 (实际长度 %s):", actual_len)
+                                            logger.error("  Data (first 200 chars): %s", bytes(msg.data[:200]))
                                             if actual_len > 200: # Ensure there's more data to print
                                                 # Print last 100 characters, ensure it doesn't go out of bounds if actual_len is e.g. 250
-                                                print(f"  Data (last 100 chars): {msg.data[max(200, actual_len - 100):]}")
+                                                logger.error("  Data (last 100 chars): %s", bytes(msg.data[max(200, actual_len - 100):]))
                                             return False # Critical error, stop processing
 
                                         # If JSON decoding was successful, then call handle_message
                                         try:
-                                            if not await handle_message(ws, data):
-                                                print("handle_message 返回 False, 表示处理消息时发生错误。")
+                                            if data is None:
+                                                handled = await events.router.dispatch(event_type, ws, msg.data, start, end)
+                                            else:
+                                                handled = await handle_message(ws, data)
+                                            if not handled:
+                                                logger.warning("handle_message 返回 False, 表示处理消息时发生错误。")
                                                 return False # Propagate error from handle_message
                                             # If handle_message returns True, it means it handled it and we can expect more messages or actions
                                             # Thus, we should return True from receive_with_timeout to signal to wait_for to continue waiting for the next message.
                                             return True
                                         except Exception as e:
-                                            print(f"❌ 调用 handle_message 时发生意外错误: {e}")
-                                            sys.print_exception(e)
+                                            logger.exc(e, "❌ 调用 handle_message 时发生意外错误: %s", e)
                                             return False # Critical error in handler
 
                                     elif msg.type == WSMsgType.BINARY:
-                                        print("接收到二进制消息 (当前未处理)。")
+                                        logger.info("接收到二进制消息 (当前未处理)。")
                                         # Depending on protocol, might be an error or expected. Assuming not fatal for now.
                                         return True
                                     elif msg.type == WSMsgType.ERROR: # This enum member seems to be available
-                                        print(f"WebSocket 错误事件: {ws.exception()}")
+                                        logger.error("WebSocket 错误事件: %s", ws.exception())
                                         return False # WebSocket layer error, stop processing
                                     else:
                                         # This 'else' block is for types other than TEXT, BINARY, ERROR.
                                         # Example: PING, PONG, or an integer type for CLOSE if not mapped in WSMsgType.
-                                        print(f"❓ 接收到未知/未显式处理的 WebSocket 消息类型: {msg.type} (原始值: {repr(msg.type)}) 类型: {type(msg.type)}")
+                                        logger.warning("❓ 接收到未知/未显式处理的 WebSocket 消息类型: %s (原始值: %r) 类型: %s", msg.type, msg.type, type(msg.type))
                                         # Standard WebSocket close opcode is 8.
                                         # If msg.type is this integer, it means a close frame.
                                         if isinstance(msg.type, int) and msg.type == 8:
-                                             print("WebSocket 连接已关闭 (OpCode 8 received directly). 表明连接应终止。")
+                                             logger.info("WebSocket 连接已关闭 (OpCode 8 received directly). 表明连接应终止。")
                                              return False # Treat as a signal to close down.
                                         
                                         # If it's not a known type (TEXT, BINARY, ERROR) and not an explicit close opcode (8),
                                         # it's unexpected for this application's message handling logic.
                                         # PING/PONG should ideally be handled by the library transparently.
                                         # If we reach here, it implies a message type we are not equipped to handle.
-                                        print("❗️ 未知或非预期的 WebSocket 消息类型，终止连接以确保安全。")
+                                        logger.warning("❗️ 未知或非预期的 WebSocket 消息类型，终止连接以确保安全。")
                                         return False
 
                                 # If the loop 'async for msg in ws:' finishes, it implies the connection was closed cleanly by the other side.
-                                print("WebSocket async for msg in ws loop naturally terminated (connection likely closed by server or client).")
+                                logger.info("WebSocket async for msg in ws loop naturally terminated (connection likely closed by server or client).")
                                 return False # Signal that the connection is done.
 
                             timeout_value = 120.0 # Increased from 60.0
                             keep_running = await asyncio.wait_for(receive_with_timeout(), timeout=timeout_value)
 
                         except asyncio.TimeoutError:
-                            print("⏰ WebSocket 接收超时")
+                            logger.warning("⏰ WebSocket 接收超时")
                             keep_running = False
                             gc.collect()  # 超时后清理内存
                         except Exception as e:
-                            print(f"❌ 消息接收循环中发生错误: {e}")
-                            sys.print_exception(e)
+                            logger.exc(e, "❌ 消息接收循环中发生错误: %s", e)
                             keep_running = False
                             gc.collect()  # 异常后清理内存
 
                     # --- 清理工作 ---
-                    print("WebSocket 循环结束，开始清理...")
+                    logger.info("WebSocket 循环结束，开始清理...")
                     audio_recording = False
                     audio_playing = False
                     session_configured = False
-                    print("状态变量已重置")
+                    logger.info("状态变量已重置")
 
                     if queue_task:
-                        print("准备取消消息队列任务")
+                        logger.info("准备取消消息队列任务")
                         queue_task.cancel()
                         try:
                             await queue_task
                         except asyncio.CancelledError:
-                            print("消息队列任务已取消")
+                            logger.info("消息队列任务已取消")
                         except Exception as e:
-                             print(f"等待队列任务结束时出错: {e}")
-
-                    print("等待录音线程退出...")
+                             logger.error("等待队列任务结束时出错: %s", e)
+                        stats = ws.ws.flush_stats()
+                        logger.info("发送统计: %s 次 flush, 平均每次 %.1f 帧 / %.0f 字节, 最多 %s 帧", stats['flushes'], stats['frames_per_flush'], stats['bytes_per_flush'], stats['max_frames_per_flush'])
+                    if metrics_task:
+                        metrics_task.cancel()
+                    logger.info("📊 运行指标: %s", metrics.registry.to_json())
+                    logger.info("事件处理耗时统计:")
+                    events.router.report(logger.info)
+                    logger.info("对话时延统计 (最近 %s 轮):", tracer.tracer.count)
+                    tracer.tracer.report(logger.info)
+
+                    logger.info("等待录音线程退出...")
                     await asyncio.sleep(0.5)
-                    print("录音线程等待结束")
+                    logger.info("录音线程等待结束")
 
                     if audio_in:
                         try:
-                            print("正在关闭麦克风 I2S...")
+                            logger.info("正在关闭麦克风 I2S...")
                             audio_in.deinit()
                             audio_in = None
-                            print("麦克风 I2S 已关闭")
+                            logger.info("麦克风 I2S 已关闭")
                         except Exception as e:
-                            print(f"❌ 关闭麦克风I2S时出错: {e}")
-                    if audio_out:
+                            logger.error("❌ 关闭麦克风I2S时出错: %s", e)
+                    if await stop_player() and audio_out:
                         try:
-                            print("正在关闭扬声器 I2S...")
+                            logger.info("正在关闭扬声器 I2S...")
                             audio_out.deinit()
                             audio_out = None
-                            print("扬声器 I2S 已关闭")
+                            logger.info("扬声器 I2S 已关闭")
                         except Exception as e:
-                            print(f"❌ 关闭扬声器I2S时出错: {e}")
+                            logger.error("❌ 关闭扬声器I2S时出错: %s", e)
 
                     gc.collect()  # 清理完成后执行最终垃圾回收
-                    print(f"清理后可用内存: {gc.mem_free()} 字节")
-                    print("WebSocket 客户端正常退出清理完成")
+                    logger.info("清理后可用内存: %s 字节", mem_free())
+                    logger.info("WebSocket 客户端正常退出清理完成")
 
             # 清理工作完成，如果是主动关闭或完成了正常交互，则退出主循环
             # 如果是由于服务器异常或超时导致的断开，则尝试重连
             if connection_attempts > 0:
-                print(f"连接异常终止，将在3秒后尝试重新连接...")
+                logger.warning("连接异常终止，将在3秒后尝试重新连接...")
                 await asyncio.sleep(3)  # 等待一段时间再重连
             else:
-                print("客户端正常退出，不再尝试重连")
+                logger.info("客户端正常退出，不再尝试重连")
                 break
                 
         except Exception as e:
-            print(f"❌ WebSocket 连接或主循环发生严重错误: {e}")
-            sys.print_exception(e)
+            logger.exc(e, "❌ WebSocket 连接或主循环发生严重错误: %s", e)
+            log.dump()  # 输出最近的日志记录 (含级别低于输出级别、未打印的记录)，便于定位问题
             
             # 执行清理...
+            player_stopped = await stop_player()
             if audio_in:
                 try:
-                    print("异常清理：关闭麦克风 I2S...")
+                    logger.info("异常清理：关闭麦克风 I2S...")
                     audio_in.deinit()
-                    print("异常清理：麦克风 I2S 已关闭")
+                    logger.info("异常清理：麦克风 I2S 已关闭")
                 except Exception as deinit_e:
-                    print(f"❌ 异常清理中关闭麦克风I2S出错: {deinit_e}")
+                    logger.error("❌ 异常清理中关闭麦克风I2S出错: %s", deinit_e)
                 audio_in = None
-            if audio_out:
+            if audio_out and player_stopped:
                 try:
-                    print("异常清理：关闭扬声器 I2S...")
+                    logger.info("异常清理：关闭扬声器 I2S...")
                     audio_out.deinit()
-                    print("异常清理：扬声器 I2S 已关闭")
+                    logger.info("异常清理：扬声器 I2S 已关闭")
                 except Exception as deinit_e:
-                    print(f"❌ 异常清理中关闭扬声器I2S出错: {deinit_e}")
+                    logger.error("❌ 异常清理中关闭扬声器I2S出错: %s", deinit_e)
                 audio_out = None
             gc.collect()  # 异常退出后执行垃圾回收
             
-            print(f"异常退出后可用内存: {gc.mem_free()} 字节")
-            print(f"异常退出清理完成，将在5秒后尝试重新连接...")
+            logger.info("异常退出后可用内存: %s 字节", mem_free())
+            logger.info("异常退出清理完成，将在5秒后尝试重新连接...")
             await asyncio.sleep(5)  # 异常情况下等待更长时间再重连
             
             # 在chat_client函数中增加错误检测
             if not handle_message(ws, data):
-                print("检测到WebSocket连接问题，准备重新连接...")
+                logger.info("检测到WebSocket连接问题，准备重新连接...")
                 # 通过设置keep_running=False触发重连
                 keep_running = False
             
-    print("已达到最大重连尝试次数，程序退出")
+    logger.info("已达到最大重连尝试次数，程序退出")
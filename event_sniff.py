@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# 服务端事件快速分拣：直接在原始 UTF-8 字节上读取顶层 "type"，
+# 音频增量只定位 "delta" 字符串的边界交给 base64 解码器，不做完整的 json.loads
+# (delta 中含转义 (例如 JSON 允许的 \/) 时原始字节不是合法的 base64，这种消息仍走 json.loads)
+import sys
+import json
+
+# viper 代码只在 MicroPython 下执行，CPython 不会求值装饰器和类型注解
+_VIPER = sys.implementation.name == "micropython"
+
+# 只走快速路径的事件类型 (其余事件体积小，json.loads 的开销可以忽略)
+AUDIO_DELTA = "response.audio.delta"
+
+_QUOTE = 0x22
+_BACKSLASH = 0x5C
+_SPACES = (0x20, 0x09, 0x0A, 0x0D)
+
+if _VIPER:
+    import micropython
+
+    @micropython.viper
+    def _string_end_viper(buf: ptr8, pos: int, end: int) -> int:
+        while pos < end:
+            c = buf[pos]
+            if c == 0x5C:  # 跳过转义字符
+                pos += 2
+                continue
+            if c == 0x22:
+                return pos
+            pos += 1
+        return -1
+
+    @micropython.viper
+    def _has_escape_viper(buf: ptr8, pos: int, end: int) -> int:
+        while pos < end:
+            if buf[pos] == 0x5C:
+                return 1
+            pos += 1
+        return 0
+
+    def _searchable(buf):
+        return buf
+
+    def _string_end(buf, pos, end):
+        """buf[pos:end] 中第一个未转义的双引号的位置，找不到返回 -1"""
+        return int(_string_end_viper(buf, pos, end))
+
+    def _has_escape(buf, pos, end):
+        """buf[pos:end] 中是否有反斜杠"""
+        return bool(_has_escape_viper(buf, pos, end))
+
+else:
+    def _searchable(buf):
+        # CPython 的 memoryview 没有 find()：整块视图直接取底层的 bytearray，其余情况才拷贝
+        if isinstance(buf, memoryview):
+            obj = buf.obj
+            if isinstance(obj, (bytes, bytearray)) and len(obj) == buf.nbytes:
+                return obj
+            return buf.tobytes()
+        return buf
+
+    def _string_end(buf, pos, end):
+        """buf[pos:end] 中第一个未转义的双引号的位置，找不到返回 -1"""
+        while True:
+            q = buf.find(b'"', pos, end)
+            if q < 0:
+                return -1
+            k = q - 1
+            while k >= pos and buf[k] == _BACKSLASH:
+                k -= 1
+            if (q - 1 - k) & 1 == 0:  # 前面的反斜杠成对出现，引号未被转义
+                return q
+            pos = q + 1
+
+    def _has_escape(buf, pos, end):
+        """buf[pos:end] 中是否有反斜杠"""
+        return buf.find(b"\\", pos, end) >= 0
+
+
+def _skip_space(buf, pos, end):
+    while pos < end and buf[pos] in _SPACES:
+        pos += 1
+    return pos
+
+
+def _skip_value(buf, pos, end):
+    """跳过从 buf[pos] 开始的一个非字符串 JSON 值 (对象/数组/数字/字面量)，返回其后的位置"""
+    depth = 0
+    while pos < end:
+        c = buf[pos]
+        if c == _QUOTE:
+            pos = _string_end(buf, pos + 1, end)
+            if pos < 0:
+                return -1
+        elif c == 0x7B or c == 0x5B:  # { [
+            depth += 1
+        elif c == 0x7D or c == 0x5D:  # } ]
+            if depth == 0:
+                return pos
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        elif c == 0x2C and depth == 0:  # ,
+            return pos
+        pos += 1
+    return -1
+
+
+def sniff(buf):
+    """
+    扫描顶层 JSON 对象，返回 (type, start, end)
+    type 为 AUDIO_DELTA 时 buf[start:end] 是 "delta" 字符串的内容 (base64)，否则 start = end = -1；
+    delta 含转义时也返回 start = end = -1 (原始字节要先反转义)
+    不是对象或格式不合预期时返回 (None, -1, -1)，调用方应退回 json.loads
+    """
+    buf = _searchable(buf)
+    end = len(buf)
+    pos = _skip_space(buf, 0, end)
+    if pos >= end or buf[pos] != 0x7B:
+        return None, -1, -1
+    event_type = None
+    d_start = d_end = -1
+    pos += 1
+    while True:
+        pos = _skip_space(buf, pos, end)
+        if pos >= end or buf[pos] != _QUOTE:
+            break
+        k_end = _string_end(buf, pos + 1, end)
+        if k_end < 0:
+            break
+        key = bytes(buf[pos + 1:k_end])
+        pos = _skip_space(buf, k_end + 1, end)
+        if pos >= end or buf[pos] != 0x3A:  # :
+            break
+        pos = _skip_space(buf, pos + 1, end)
+        if pos >= end:
+            break
+        if buf[pos] == _QUOTE:
+            v_end = _string_end(buf, pos + 1, end)
+            if v_end < 0:
+                break
+            if key == b"type":
+                event_type = str(bytes(buf[pos + 1:v_end]), "utf-8")
+                if event_type != AUDIO_DELTA:
+                    return event_type, -1, -1
+                if d_start >= 0:
+                    break
+            elif key == b"delta":
+                d_start, d_end = pos + 1, v_end
+                if event_type is not None:
+                    break
+            pos = v_end + 1
+        else:
+            pos = _skip_value(buf, pos, end)
+            if pos < 0:
+                break
+        pos = _skip_space(buf, pos, end)
+        if pos >= end or buf[pos] != 0x2C:  # 对象结束 (或格式错误)
+            break
+        pos += 1
+    if event_type == AUDIO_DELTA and d_start >= 0 and not _has_escape(buf, d_start, d_end):
+        return event_type, d_start, d_end
+    return event_type, -1, -1
+
+
+def loads(buf):
+    """完整解析一条 TEXT 消息，JSON 非法时抛出 ValueError"""
+    return json.loads(str(buf, "utf-8"))
+
+
+def parse(buf):
+    """
+    分拣一条 TEXT 消息 (bytes/bytearray/memoryview)，返回 (type, data, start, end)
+    - 音频增量：data 为 None，buf[start:end] 为 base64 区间，可直接交给 b64codec.decode_into
+    - 其他事件 (以及 delta 含转义的音频增量)：data 为 json.loads 的结果 (dict)，start = end = -1
+    JSON 非法时抛出 ValueError
+    """
+    event_type, start, end = sniff(buf)
+    if start >= 0:
+        return event_type, None, start, end
+    data = loads(buf)
+    if isinstance(data, dict):
+        event_type = data.get("type")
+    return event_type, data, -1, -1
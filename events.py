@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# 服务端事件分发表：事件类型 -> 处理协程，按类型统计次数与耗时
+# 其他模块 import events 后用 @events.on("...") 注册处理函数即可接入，不需要修改 doubao_chat.py
+from hal import ticks_us, ticks_diff
+import log
+
+logger = log.get_logger("events")
+
+
+class EventRouter:
+    """
+    事件类型到处理协程的字典，同一类型可以注册多个处理函数 (按注册顺序调用)
+    处理函数签名由事件决定：一般事件为 handler(ws, data)，data 是 json.loads 得到的 dict；
+    response.audio.delta 为 handler(ws, buf, start, end)，buf[start:end] 是 base64 音频
+    处理函数返回 False 表示处理失败，返回 None/True 视为成功
+    """
+
+    def __init__(self):
+        self._handlers = {}
+        self._fallback = None
+        self.stats = {}  # 事件类型 -> [次数, 总耗时 us, 最大耗时 us]
+
+    def register(self, event_type, handler):
+        handlers = self._handlers.get(event_type)
+        if handlers is None:
+            self._handlers[event_type] = [handler]
+        else:
+            handlers.append(handler)
+        return handler
+
+    def on(self, *event_types):
+        """装饰器：@router.on("response.done") 或一次注册多个类型"""
+        def decorator(handler):
+            for event_type in event_types:
+                self.register(event_type, handler)
+            return handler
+        return decorator
+
+    def fallback(self, handler):
+        """装饰器：没有注册处理函数的事件交给 handler(ws, event_type, data)"""
+        self._fallback = handler
+        return handler
+
+    def handlers(self, event_type):
+        return self._handlers.get(event_type, ())
+
+    async def dispatch(self, event_type, ws, *args):
+        """调用 event_type 的所有处理函数，任一返回 False 则返回 False"""
+        handlers = self._handlers.get(event_type)
+        start = ticks_us()
+        ok = True
+        if handlers is None:
+            if self._fallback is not None:
+                ok = await self._fallback(ws, event_type, *args) is not False
+        else:
+            for handler in handlers:
+                if await handler(ws, *args) is False:
+                    ok = False
+        elapsed = ticks_diff(ticks_us(), start)
+        stat = self.stats.get(event_type)
+        if stat is None:
+            self.stats[event_type] = [1, elapsed, elapsed]
+        else:
+            stat[0] += 1
+            stat[1] += elapsed
+            if elapsed > stat[2]:
+                stat[2] = elapsed
+        return ok
+
+    def reset_stats(self):
+        self.stats = {}
+
+    def report(self, out=None):
+        """按总耗时从高到低打印每种事件的次数、平均与最大处理耗时"""
+        out = out or logger.info
+        out("{:<52} {:>6} {:>10} {:>10}".format("event", "count", "avg ms", "max ms"))
+        rows = sorted(self.stats.items(), key=lambda kv: kv[1][1], reverse=True)
+        for event_type, (count, total, peak) in rows:
+            out("{:<52} {:>6} {:>10.2f} {:>10.2f}".format(
+                str(event_type), count, total / count / 1000, peak / 1000))
+
+
+# 默认分发表，doubao_chat 与插件模块共用
+router = EventRouter()
+on = router.on
+register = router.register
+fallback = router.fallback
+
+
+plugins = []  # 已加载的插件模块
+
+
+def load_plugins(names):
+    """按名字导入插件模块 (config.EVENT_PLUGINS)，模块在导入时用 @events.on 注册自己的处理函数"""
+    for name in names:
+        try:
+            plugins.append(__import__(name))
+        except Exception as e:
+            logger.exc(e, "❌ 加载事件插件 %s 失败: %s", name, e)
+
+
+async def start_plugins():
+    """依次调用插件的 start() 协程 (如果有)，用于把耗时的初始化 (屏幕、字库) 移出导入路径、与联网并行"""
+    for module in plugins:
+        start = getattr(module, "start", None)
+        if start is None:
+            continue
+        try:
+            await start()
+        except Exception as e:
+            logger.exc(e, "❌ 启动事件插件 %s 失败: %s", module.__name__, e)
+
+
+async def replay(lines, router=router, ws=None):
+    """
+    离线回放：按顺序分拣并分发一组原始服务端事件 (每项一个 JSON 文本，bytes/bytearray)，
+    例如逐行读取的 JSONL 抓包；返回处理失败的事件数，耗时统计见 router.stats
+    """
+    import event_sniff
+    failures = 0
+    for line in lines:
+        event_type, data, start, end = event_sniff.parse(line)
+        if data is None:
+            ok = await router.dispatch(event_type, ws, line, start, end)
+        elif event_type == event_sniff.AUDIO_DELTA:
+            delta = data.get("delta") or ""
+            ok = await router.dispatch(event_type, ws, delta, 0, len(delta))
+        else:
+            ok = await router.dispatch(event_type, ws, data)
+        if not ok:
+            failures += 1
+    return failures
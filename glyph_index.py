@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+码点 -> 字形序号的查找表，代替 MAP.index / `in MAP` 的线性扫描
+
+每个字体建一次：ASCII 直接查 128 项的表，其余在升序的 array('H') 码点上二分 (3500 字约 12 次比较)；
+字宽按字形序号存在同一结构里，取宽度不再调用 tft.write_len
+"""
+import sys
+from array import array
+
+# viper 代码只在 MicroPython 下执行，CPython 不会求值装饰器和类型注解
+_VIPER = sys.implementation.name == "micropython"
+
+MISSING = -1
+
+if _VIPER:
+    import micropython
+
+    @micropython.viper
+    def _search_viper(codes: ptr16, n: int, code: int) -> int:
+        lo = 0
+        hi = n
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            c = codes[mid]
+            if c < code:
+                lo = mid + 1
+            elif c > code:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def _search(codes, code):
+        """升序 codes 中 code 的位置，找不到返回 -1"""
+        return int(_search_viper(codes, len(codes), code))
+
+else:
+    def _search(codes, code):
+        lo = 0
+        hi = len(codes)
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            c = codes[mid]
+            if c < code:
+                lo = mid + 1
+            elif c > code:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+
+class GlyphIndex:
+    def __init__(self, codes, glyphs, widths):
+        """
+        codes: 升序码点 array('H')；glyphs: 对应的字形序号 array('H')，None 表示与位置相同；
+        widths: 按字形序号的字宽 (bytearray/bytes)
+        """
+        self.codes = codes
+        self.glyphs = glyphs
+        self.widths = widths
+        self.ascii = array("h", [MISSING] * 128)
+        for pos in range(len(codes)):
+            if codes[pos] >= 128:
+                break
+            self.ascii[codes[pos]] = pos if glyphs is None else glyphs[pos]
+
+    def find(self, ch):
+        """ch 的字形序号，不在字库中返回 MISSING"""
+        code = ord(ch)
+        if code < 128:
+            return self.ascii[code]
+        if code > 0xFFFF:
+            return MISSING
+        pos = _search(self.codes, code)
+        if pos < 0 or self.glyphs is None:
+            return pos
+        return self.glyphs[pos]
+
+    def width(self, ch):
+        i = self.find(ch)
+        return self.widths[i] if i >= 0 else 0
+
+
+def from_map(font_map, widths=None, width=0):
+    """
+    由字体模块的 MAP 建表：write 字体传 WIDTHS，等宽的 bitmap 字体传 width
+    MAP 中重复的字符取第一个 (与 MAP.index 一致)
+    """
+    pairs = {}
+    for i, ch in enumerate(font_map):
+        code = ord(ch)
+        if code <= 0xFFFF and code not in pairs:
+            pairs[code] = i
+    codes = array("H", sorted(pairs))
+    glyphs = array("H", [pairs[c] for c in codes])
+    if widths is None:
+        widths = bytes([width]) * len(font_map)
+    return GlyphIndex(codes, glyphs, widths)
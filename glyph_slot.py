@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+# binfont 的单字形代理字体：gc9a01 C 驱动的 write() 只从模块的全局变量读取字体数据，
+# BinFont.write 每画一个字先把该字形写进这里 (MAP 只含这一个字，偏移为 0)，再把本模块交给 tft.write
+MAP = ""
+BPP = 1
+HEIGHT = 0
+MAX_WIDTH = 0
+OFFSET_WIDTH = 1
+WIDTHS = bytearray(1)
+OFFSETS = bytes(1)
+BITMAPS = b""
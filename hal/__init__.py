@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+# 硬件抽象层：设备代码从这里取 I2S/Pin/SPI、屏幕驱动、线程、时钟与内存接口
+# MicroPython 上直接是固件模块；CPython 上换成 hal.host_* 的实现 (WAV 文件 I2S、帧缓冲屏幕、threading 线程)，
+# 整套代码可以在工作站上运行、用 cProfile / py-spy 分析
+# 包名不用 platform，避免遮蔽 CPython 标准库的 platform 模块
+import sys
+
+MICROPYTHON = sys.implementation.name == "micropython"
+
+if MICROPYTHON:
+    from machine import I2S, Pin, SPI
+    import gc9a01
+    import _thread as thread
+    from time import ticks_ms, ticks_us, ticks_diff, sleep_ms
+    from gc import mem_free
+    from micropython import mem_info
+    from asyncio import open_connection
+else:
+    from .host import (Pin, SPI, ticks_ms, ticks_us, ticks_diff, sleep_ms,
+                       mem_free, mem_info, open_connection, configure)
+    from .host_i2s import I2S
+    from . import host_gc9a01 as gc9a01
+    from . import host_thread as thread
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# CPython 实现：Pin/SPI (空操作)、ticks_* 时钟、按 tracemalloc 估算的内存接口、MicroPython 风格的网络流
+import asyncio
+import time
+import tracemalloc
+
+HEAP_BYTES = 8 * 1024 * 1024  # mem_free 的参考堆大小 (ESP32-S3 PSRAM)
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    PULL_UP = 2
+    PULL_DOWN = 3
+
+    def __init__(self, id, mode=None, pull=None, value=None):
+        self.id = id
+        self._value = value or 0
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        self._value = v
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+
+class SPI:
+    def __init__(self, id, baudrate=0, sck=None, mosi=None, miso=None, **kwargs):
+        self.id = id
+        self.baudrate = baudrate
+
+    def write(self, buf):
+        pass
+
+
+def ticks_ms():
+    return int(time.monotonic() * 1000)
+
+
+def ticks_us():
+    return time.perf_counter_ns() // 1000
+
+
+def ticks_diff(a, b):
+    return a - b
+
+
+def sleep_ms(ms):
+    time.sleep(ms / 1000)
+
+
+def mem_free():
+    """HEAP_BYTES 减去 tracemalloc 统计的当前分配量 (未开启 tracemalloc 时即 HEAP_BYTES)"""
+    used = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+    return HEAP_BYTES - used
+
+
+def mem_info(verbose=0):
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        print("mem: current %d, peak %d (tracemalloc)" % (current, peak))
+
+
+class Stream:
+    """把 asyncio 的 (StreamReader, StreamWriter) 合成 MicroPython asyncio 的 Stream (读写同一对象，带 awrite/aclose)"""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    async def read(self, n=-1):
+        return await self._reader.read(n)
+
+    async def readline(self):
+        return await self._reader.readline()
+
+    async def readexactly(self, n):
+        return await self._reader.readexactly(n)
+
+    def write(self, buf):
+        self._writer.write(buf)
+
+    async def drain(self):
+        await self._writer.drain()
+
+    async def awrite(self, buf, off=0, sz=-1):
+        if off or sz != -1:
+            buf = memoryview(buf)[off:None if sz == -1 else off + sz]
+        self._writer.write(buf)
+        await self._writer.drain()
+
+    def close(self):
+        self._writer.close()
+
+    async def wait_closed(self):
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    async def aclose(self):
+        self.close()
+        await self.wait_closed()
+
+
+async def open_connection(host, port, ssl=None):
+    reader, writer = await asyncio.open_connection(host, port, ssl=ssl or None)
+    stream = Stream(reader, writer)
+    return stream, stream
+
+
+def configure(speed=None, mic_wav=None, speaker_wav=None, heap_bytes=None):
+    """
+    设置 CPython 后端：speed 为 I2S 时钟倍率，mic_wav 为麦克风读取的 WAV 文件，
+    speaker_wav 为扬声器输出写入的 WAV 文件，heap_bytes 为 mem_free 的参考堆大小
+    """
+    global HEAP_BYTES
+    from . import host_i2s
+    if speed is not None:
+        host_i2s.speed = speed
+    if mic_wav is not None:
+        host_i2s.mic_wav = mic_wav
+    if speaker_wav is not None:
+        host_i2s.speaker_wav = speaker_wav
+    if heap_bytes is not None:
+        HEAP_BYTES = heap_bytes
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+CPython 上的 gc9a01 驱动：绘制到内存中的 RGB565 帧缓冲，可以 save_png() 存成截图
+
+接口与 C 驱动一致 (fill / fill_rect / pixel / blit_buffer / bitmap / write / write_len / jpg)，
+字体按驱动的格式解码 (write 字体：MAP/WIDTHS/OFFSETS 位偏移；bitmap 字体：BITMAP/PALETTE/BPP)
+垂直滚动 (vscrdef / vscsad) 只改变扫描输出：帧缓冲对应显存，save_png() 按滚动后屏幕上看到的内容输出
+另外按 SPI 传输量 (每像素 16 位，60MHz) 统计估算耗时，供比较不同绘制方式
+"""
+import struct
+import sys
+import zlib
+from array import array
+
+BLACK = 0x0000
+BLUE = 0x001F
+RED = 0xF800
+GREEN = 0x07E0
+CYAN = 0x07FF
+MAGENTA = 0xF81F
+YELLOW = 0xFFE0
+WHITE = 0xFFFF
+
+# 与 C 驱动一致的选项常量 (本项目把 WRAP_V 当文字颜色用)
+WRAP = 0x03
+WRAP_H = 0x01
+WRAP_V = 0x02
+
+SPI_HZ = 60000000
+
+
+def color565(r, g, b):
+    return (r & 0xF8) << 8 | (g & 0xFC) << 3 | b >> 3
+
+
+class GC9A01:
+    def __init__(self, spi, width, height, reset=None, cs=None, dc=None, backlight=None,
+                 rotation=0, options=0, buffer_size=0):
+        self.spi = spi
+        self._width = width
+        self._height = height
+        self.rotation_value = rotation
+        self.framebuffer = array("H", bytes(2 * width * height))
+        self.tfa = 0          # 垂直滚动：顶部固定行数、滚动区行数、滚动区第一行显示的显存行
+        self.vsa = height
+        self.vssa = 0
+        self.calls = {}
+        self.pixels = 0       # 传输的像素总数
+        self.spi_us = 0.0     # 按 SPI 时钟估算的传输耗时
+
+    def _cost(self, name, pixels):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.pixels += pixels
+        self.spi_us += pixels * 16 * 1000000 / SPI_HZ
+
+    def init(self):
+        self._cost("init", 0)
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def rotation(self, r):
+        self.rotation_value = r
+
+    def vscrdef(self, tfa, vsa, bfa):
+        self.tfa = tfa
+        self.vsa = vsa
+        self._cost("vscrdef", 0)
+
+    def vscsad(self, vssa):
+        self.vssa = vssa
+        self._cost("vscsad", 0)
+
+    def _scan_row(self, row):
+        """屏幕第 row 行显示的显存行"""
+        tfa = self.tfa
+        if tfa <= row < tfa + self.vsa and self.vssa >= tfa:
+            return tfa + (self.vssa - tfa + row - tfa) % self.vsa
+        return row
+
+    # --- 绘制 ---
+    def _rect(self, x, y, w, h, color):
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = min(self._width, x + w)
+        y1 = min(self._height, y + h)
+        if x1 <= x0 or y1 <= y0:
+            return
+        row = array("H", [color]) * (x1 - x0)
+        fb = self.framebuffer
+        for yy in range(y0, y1):
+            base = yy * self._width
+            fb[base + x0:base + x1] = row
+
+    def _put(self, x, y, color):
+        if 0 <= x < self._width and 0 <= y < self._height:
+            self.framebuffer[y * self._width + x] = color
+
+    def fill(self, color):
+        self._rect(0, 0, self._width, self._height, color)
+        self._cost("fill", self._width * self._height)
+
+    def fill_rect(self, x, y, w, h, color):
+        self._rect(x, y, w, h, color)
+        self._cost("fill_rect", max(0, w) * max(0, h))
+
+    def pixel(self, x, y, color):
+        self._put(x, y, color)
+        self._cost("pixel", 1)
+
+    def blit_buffer(self, buf, x, y, w, h):
+        """buf 为 w*h 个大端 RGB565 像素 (与发往屏幕的字节序一致)"""
+        pixels = array("H", bytes(buf[:2 * w * h]))
+        if sys.byteorder == "little":
+            pixels.byteswap()
+        for row in range(h):
+            yy = y + row
+            if not 0 <= yy < self._height:
+                continue
+            for col in range(w):
+                self._put(x + col, yy, pixels[row * w + col])
+        self._cost("blit_buffer", w * h)
+
+    def bitmap(self, bitmap, x, y, index=0):
+        """bitmap 字体/图片模块：BITMAP 为连续位流，每个像素 BPP 位，颜色查 PALETTE"""
+        w = bitmap.WIDTH
+        h = bitmap.HEIGHT
+        bpp = bitmap.BPP
+        data = bitmap.BITMAP
+        palette = bitmap.PALETTE
+        bit = index * w * h * bpp
+        for yy in range(h):
+            for xx in range(w):
+                ci = 0
+                for _ in range(bpp):
+                    ci = (ci << 1) | ((data[bit >> 3] >> (7 - (bit & 7))) & 1)
+                    bit += 1
+                self._put(x + xx, y + yy, palette[ci])
+        self._cost("bitmap", w * h)
+
+    def jpg(self, path, x, y, method=0):
+        """不解码图片：从 SOF 段读出尺寸，用灰色占位填充该区域并按整幅图计传输量"""
+        with open(path, "rb") as f:
+            data = f.read()
+        pos = 2
+        w = h = 0
+        while pos + 4 <= len(data):
+            marker = data[pos + 1]
+            size = data[pos + 2] << 8 | data[pos + 3]
+            if 0xC0 <= marker <= 0xC3:
+                h, w = struct.unpack(">HH", data[pos + 5:pos + 9])
+                break
+            pos += 2 + size
+        self._rect(x, y, w, h, 0x8410)
+        self._cost("jpg", w * h)
+
+    def _glyph(self, font, ch):
+        """write 字体中 ch 的 (宽度, 起始位偏移)，不在字库中返回 None"""
+        i = font.MAP.find(ch)
+        if i < 0:
+            return None
+        ow = font.OFFSET_WIDTH
+        offset = 0
+        for b in font.OFFSETS[i * ow:(i + 1) * ow]:
+            offset = (offset << 8) | b
+        return font.WIDTHS[i], offset
+
+    def write_len(self, font, s):
+        total = 0
+        for ch in s:
+            glyph = self._glyph(font, ch)
+            if glyph is not None:
+                total += glyph[0]
+        return total
+
+    def write(self, font, s, x, y, fg=WHITE, bg=BLACK):
+        """用 write 字体 (1 bpp 位流) 画字符串，返回绘制的总宽度"""
+        data = font.BITMAPS
+        h = font.HEIGHT
+        start = x
+        for ch in s:
+            glyph = self._glyph(font, ch)
+            if glyph is None:
+                continue
+            w, bit = glyph
+            for yy in range(h):
+                for xx in range(w):
+                    on = (data[bit >> 3] >> (7 - (bit & 7))) & 1
+                    self._put(x + xx, y + yy, fg if on else bg)
+                    bit += 1
+            x += w
+        self._cost("write", (x - start) * h)
+        return x - start
+
+    # --- 截图 ---
+    def screen(self):
+        """屏幕上看到的像素 (按垂直滚动映射显存行)"""
+        w = self._width
+        fb = self.framebuffer
+        out = array("H")
+        for y in range(self._height):
+            m = self._scan_row(y)
+            out.extend(fb[m * w:(m + 1) * w])
+        return out
+
+    def save_png(self, path):
+        """把屏幕上看到的内容存成 PNG (RGB888)"""
+        w = self._width
+        raw = bytearray()
+        fb = self.screen()
+        for y in range(self._height):
+            raw.append(0)  # 行过滤类型：None
+            for v in fb[y * w:(y + 1) * w]:
+                raw.append((v >> 11) * 255 // 31)
+                raw.append(((v >> 5) & 0x3F) * 255 // 63)
+                raw.append((v & 0x1F) * 255 // 31)
+
+        def chunk(kind, body):
+            return struct.pack("!I", len(body)) + kind + body + struct.pack("!I", zlib.crc32(kind + body) & 0xFFFFFFFF)
+
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(chunk(b"IHDR", struct.pack("!IIBBBBB", w, self._height, 8, 2, 0, 0, 0)))
+            f.write(chunk(b"IDAT", zlib.compress(bytes(raw), 6)))
+            f.write(chunk(b"IEND", b""))
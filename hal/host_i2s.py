@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+CPython 上的 machine.I2S：用 WAV 文件代替麦克风和扬声器，按采样率模拟 DMA 节拍
+
+- RX：从 mic_wav 循环读取 PCM (格式须与 I2S 参数一致)；未配置时循环播放合成的
+  "静音 - 说话 (正弦波) - 静音" 片段，足以触发 VAD 的起音与提交
+- TX：模拟 ibuf 大小的 DMA 缓冲，写满后按采样率阻塞；配置了 speaker_wav 时把写入的 PCM 存成 WAV
+  (同一进程里多次初始化扬声器时依次写 name.wav、name-1.wav ...)
+- speed > 1 时按倍速运行，缩短测试时间
+"""
+import math
+import time
+import wave
+from array import array
+
+speed = 1.0        # 时钟倍率
+mic_wav = None     # 麦克风输入 WAV 路径
+speaker_wav = None  # 扬声器输出 WAV 路径
+
+_speaker_files = 0
+
+
+def speech_pattern(rate, silence_ms=300, speech_ms=1000, pause_ms=2000, amplitude=3000):
+    """生成一段循环的麦克风 PCM：silence_ms 静音 + speech_ms 的 220Hz 正弦 + pause_ms 静音"""
+    total = (silence_ms + speech_ms + pause_ms) * rate // 1000
+    onset = silence_ms * rate // 1000
+    offset = (silence_ms + speech_ms) * rate // 1000
+    samples = array("h", [0] * total)
+    for i in range(onset, offset):
+        samples[i] = int(amplitude * math.sin(2 * math.pi * 220 * i / rate))
+    return bytes(samples)
+
+
+def _read_wav(path, rate, bits, channels):
+    with wave.open(path, "rb") as f:
+        if (f.getframerate(), f.getsampwidth() * 8, f.getnchannels()) != (rate, bits, channels):
+            raise ValueError("WAV {} is {} Hz / {} bit / {} ch, I2S expects {} Hz / {} bit / {} ch".format(
+                path, f.getframerate(), f.getsampwidth() * 8, f.getnchannels(), rate, bits, channels))
+        return f.readframes(f.getnframes())
+
+
+def _next_speaker_path():
+    global _speaker_files
+    path = speaker_wav
+    if _speaker_files:
+        stem, dot, ext = path.rpartition(".")
+        path = "{}-{}.{}".format(stem, _speaker_files, ext) if dot else "{}-{}".format(path, _speaker_files)
+    _speaker_files += 1
+    return path
+
+
+class I2S:
+    RX = 0
+    TX = 1
+    MONO = 0
+    STEREO = 1
+
+    instances = []  # 创建过的实例，测试结束后读取统计
+
+    def __init__(self, id, sck=None, ws=None, sd=None, mode=RX, bits=16, format=MONO, rate=16000, ibuf=4096):
+        self.id = id
+        self.mode = mode
+        self.rate = rate
+        self.bits = bits
+        self.channels = 2 if format == self.STEREO else 1
+        self.bytes_per_sec = rate * (bits // 8) * self.channels
+        self.ibuf = ibuf
+        self.closed = False
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.write_calls = 0
+        self._wav = None
+        if mode == self.RX:
+            self._source = _read_wav(mic_wav, rate, bits, self.channels) if mic_wav else speech_pattern(rate)
+            self._pos = 0
+        elif speaker_wav:
+            self._wav = wave.open(_next_speaker_path(), "wb")
+            self._wav.setnchannels(self.channels)
+            self._wav.setsampwidth(bits // 8)
+            self._wav.setframerate(rate)
+        # TX：DMA 中尚未播完的字节按时钟消耗
+        self._queued = 0
+        self._clock = time.monotonic()
+        I2S.instances.append(self)
+
+    def _drain_clock(self):
+        now = time.monotonic()
+        played = int((now - self._clock) * self.bytes_per_sec * speed)
+        self._clock = now
+        self._queued = max(0, self._queued - played)
+
+    def readinto(self, buf):
+        """填满 buf 并按实时节拍返回 (模拟 DMA 每块到达的间隔)"""
+        n = len(buf)
+        src = self._source
+        size = len(src)
+        off = 0
+        while off < n:
+            take = min(n - off, size - self._pos)
+            buf[off:off + take] = src[self._pos:self._pos + take]
+            self._pos = (self._pos + take) % size
+            off += take
+        time.sleep(n / self.bytes_per_sec / speed)
+        self.bytes_read += n
+        return n
+
+    def write(self, buf):
+        """写入 DMA 缓冲，缓冲满时阻塞到有空间 (与硬件 I2S.write 的阻塞行为一致)"""
+        n = len(buf)
+        self._drain_clock()
+        over = self._queued + n - self.ibuf
+        if over > 0:
+            time.sleep(over / self.bytes_per_sec / speed)
+            self._drain_clock()
+        self._queued += n
+        self.bytes_written += n
+        self.write_calls += 1
+        if self._wav is not None:
+            self._wav.writeframes(buf)
+        return n
+
+    def deinit(self):
+        self.closed = True
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# CPython 上的 _thread：用 threading 实现 (守护线程、带名字)，cProfile/py-spy 能看到各线程
+import threading
+
+LockType = type(threading.Lock())
+
+
+def allocate_lock():
+    return threading.Lock()
+
+
+def start_new_thread(function, args, kwargs=None):
+    thread = threading.Thread(target=function, args=args, kwargs=kwargs or {},
+                              name=getattr(function, "__name__", None), daemon=True)
+    thread.start()
+    return thread.ident
+
+
+def get_ident():
+    return threading.get_ident()
+
+
+def stack_size(size=0):
+    return 0
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# 行缓冲渲染：把一行文字在内存里合成为 RGB565 (大端，与发往屏幕的字节序一致)，再用一次 tft.blit_buffer 发出，
+# 代替每个字一次 fill_rect + write/bitmap (每次都要设置地址窗口、单独一次 SPI 传输)
+import sys
+from array import array
+
+# viper 代码只在 MicroPython 下执行，CPython 不会求值装饰器和类型注解
+_VIPER = sys.implementation.name == "micropython"
+
+# 展开参数：目标起始字节, 行跨度 (字节), 起始位, 字宽, 字高, 前景色, 背景色
+# (viper 函数参数个数有限，打包进预分配的 array 传递)
+_args = array('i', [0] * 7)
+
+if _VIPER:
+    import micropython
+
+    @micropython.viper
+    def _expand_viper(dst: ptr8, src: ptr8, args: ptr32):
+        off = args[0]
+        stride = args[1]
+        bit = args[2]
+        w = args[3]
+        h = args[4]
+        fh = (args[5] >> 8) & 0xFF
+        fl = args[5] & 0xFF
+        bh = (args[6] >> 8) & 0xFF
+        bl = args[6] & 0xFF
+        row = 0
+        while row < h:
+            p = off + row * stride
+            col = 0
+            while col < w:
+                if (src[bit >> 3] >> (7 - (bit & 7))) & 1:
+                    dst[p] = fh
+                    dst[p + 1] = fl
+                else:
+                    dst[p] = bh
+                    dst[p + 1] = bl
+                p += 2
+                bit += 1
+                col += 1
+            row += 1
+
+    def _expand(dst, src, args):
+        _expand_viper(dst, src, args)
+
+else:
+    def _expand(dst, src, args):
+        off, stride, bit, w, h, fg, bg = args
+        fg = bytes((fg >> 8 & 0xFF, fg & 0xFF))
+        bg = bytes((bg >> 8 & 0xFF, bg & 0xFF))
+        for row in range(h):
+            p = off + row * stride
+            for _ in range(w):
+                dst[p:p + 2] = fg if (src[bit >> 3] >> (7 - (bit & 7))) & 1 else bg
+                p += 2
+                bit += 1
+
+
+class LineBuffer:
+    """最多 width x height 像素的可复用行缓冲；每行用 start() 按本行宽度重新划分，glyph() 逐字展开"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.buf = bytearray(width * height * 2)
+        self._view = memoryview(self.buf)
+        self.stride = 0
+        self.x = 0  # 下一个字在行内的 x (像素)
+
+    def start(self, width, bg):
+        """开始新的一行 (width 像素宽)，用背景色填满"""
+        self.stride = min(width, self.width)
+        self.x = 0
+        n = self.stride * self.height * 2
+        if n == 0:
+            return
+        buf = self.buf
+        buf[0] = bg >> 8 & 0xFF
+        buf[1] = bg & 0xFF
+        filled = 2
+        view = self._view
+        while filled < n:  # 倍增复制，log2(n) 次切片赋值
+            k = min(filled, n - filled)
+            view[filled:filled + k] = view[0:k]
+            filled += k
+
+    def glyph(self, data, bit, w, h, fg, bg):
+        """把从第 bit 位开始的 1bpp 字形 (w x h，行优先、高位在前) 展开到当前位置，放不下时返回 False"""
+        if self.x + w > self.stride:
+            return False
+        args = _args
+        args[0] = self.x * 2
+        args[1] = self.stride * 2
+        args[2] = bit
+        args[3] = w
+        args[4] = min(h, self.height)
+        args[5] = fg
+        args[6] = bg
+        _expand(self.buf, data, args)
+        self.x += w
+        return True
+
+    def view(self):
+        """本行已合成部分的像素 (stride x height)"""
+        return self._view[:self.stride * self.height * 2]
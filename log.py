@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+# 轻量日志：级别过滤、惰性格式化、最近记录的预分配环形缓冲、按调用点限速、可选文件/UDP 输出
+# 用法：logger = log.get_logger("chat"); logger.info("收到 %d 字节", n)
+# 消息用 % 格式化且只在确实要输出时才格式化，级别关闭时调用几乎没有开销 (不构造字符串)
+import sys
+from hal import ticks_ms, ticks_diff
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+_LEVEL_NAMES = {DEBUG: "D", INFO: "I", WARNING: "W", ERROR: "E"}
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR, "off": OFF}
+
+
+def _format(fmt, args):
+    if not args:
+        return fmt
+    try:
+        return fmt % args
+    except Exception:
+        return "%s %r" % (fmt, args)
+
+
+class RecordRing:
+    """
+    最近 N 条日志记录的环形缓冲，槽位预先分配，写入时只替换字段引用，不做格式化
+    出问题时用 dump() 输出，包括级别低于控制台输出级别、没有打印出来的记录
+    """
+
+    def __init__(self, size=64):
+        self._slots = [[0, 0, None, None, None] for _ in range(size)]
+        self._head = 0
+        self.count = 0
+
+    def add(self, ticks, level, name, fmt, args):
+        slot = self._slots[self._head]
+        slot[0] = ticks
+        slot[1] = level
+        slot[2] = name
+        slot[3] = fmt
+        slot[4] = args
+        self._head = (self._head + 1) % len(self._slots)
+        if self.count < len(self._slots):
+            self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    def records(self):
+        """按旧到新依次产出 (ticks, level, name, message)"""
+        size = len(self._slots)
+        i = (self._head - self.count) % size
+        for _ in range(self.count):
+            ticks, level, name, fmt, args = self._slots[i]
+            yield ticks, level, name, _format(fmt, args)
+            i = (i + 1) % size
+
+
+class FileSink:
+    """追加写入日志文件 (例如 flash 上的 /log.txt)，每 flush_every 行刷新一次"""
+
+    def __init__(self, path, flush_every=8):
+        self._file = open(path, "a")
+        self.flush_every = flush_every
+        self._pending = 0
+
+    def write(self, line):
+        self._file.write(line)
+        self._file.write("\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        self._pending = 0
+
+    def close(self):
+        self._file.close()
+
+
+class UdpSink:
+    """把每条日志作为一个 UDP 数据报发给收集端 (例如 nc -ul 5140)，发送失败直接丢弃"""
+
+    def __init__(self, host, port):
+        import socket
+        self._addr = socket.getaddrinfo(host, port)[0][-1]
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def write(self, line):
+        try:
+            self._sock.sendto(line.encode(), self._addr)
+        except OSError:
+            pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self._sock.close()
+
+
+# --- 全局状态 ---
+_level = INFO          # 输出到控制台和 sink 的最低级别
+_ring_level = INFO     # 记入环形缓冲的最低级别 (排查问题时可 set_ring_level(DEBUG) 保留调试记录)
+_min_level = INFO      # 二者较小值，低于它的调用立即返回
+_console = True
+_sinks = []
+_ring = RecordRing()
+_limits = {}           # 限速调用点 (格式字符串) -> [上次输出的 ticks, 期间被抑制的条数]
+
+
+def _update_min():
+    global _min_level
+    _min_level = min(_level, _ring_level)
+
+
+def set_level(level):
+    """设置输出级别，可以是 DEBUG/INFO/... 或 "debug"/"info"/... 字符串"""
+    global _level
+    _level = LEVELS[level] if isinstance(level, str) else level
+    _update_min()
+
+
+def set_ring_level(level):
+    global _ring_level
+    _ring_level = LEVELS[level] if isinstance(level, str) else level
+    _update_min()
+
+
+def add_sink(sink):
+    _sinks.append(sink)
+    return sink
+
+
+def configure(level=None, file=None, udp=None, console=True):
+    """按 config.py 的 LOG_* 配置：file 为日志文件路径，udp 为 (host, port)"""
+    global _console
+    if level is not None:
+        set_level(level)
+    _console = console
+    if file:
+        add_sink(FileSink(file))
+    if udp:
+        add_sink(UdpSink(udp[0], udp[1]))
+
+
+def dump(out=None):
+    """输出环形缓冲中最近的记录 (旧到新)"""
+    out = out or print
+    for ticks, level, name, message in _ring.records():
+        out("%d %s %s: %s" % (ticks, _LEVEL_NAMES.get(level, "?"), name, message))
+
+
+def _emit(level, name, fmt, args):
+    ticks = ticks_ms()
+    if level >= _ring_level:
+        _ring.add(ticks, level, name, fmt, args)
+    if level < _level:
+        return
+    message = _format(fmt, args)
+    if _console:
+        print(message)
+    if _sinks:
+        line = "%d %s %s: %s" % (ticks, _LEVEL_NAMES.get(level, "?"), name, message)
+        for sink in _sinks:
+            sink.write(line)
+
+
+def _print_exception(exc):
+    if hasattr(sys, "print_exception"):
+        sys.print_exception(exc)
+    else:
+        import traceback
+        traceback.print_exception(type(exc), exc, exc.__traceback__)
+
+
+class Logger:
+    def __init__(self, name):
+        self.name = name
+
+    def enabled(self, level):
+        """level 的消息是否会被输出 (需要额外计算参数时先判断)"""
+        return level >= _level
+
+    def log(self, level, fmt, *args):
+        if level >= _min_level:
+            _emit(level, self.name, fmt, args)
+
+    def debug(self, fmt, *args):
+        if DEBUG >= _min_level:
+            _emit(DEBUG, self.name, fmt, args)
+
+    def info(self, fmt, *args):
+        if INFO >= _min_level:
+            _emit(INFO, self.name, fmt, args)
+
+    def warning(self, fmt, *args):
+        if WARNING >= _min_level:
+            _emit(WARNING, self.name, fmt, args)
+
+    def error(self, fmt, *args):
+        if ERROR >= _min_level:
+            _emit(ERROR, self.name, fmt, args)
+
+    def exc(self, exc, fmt, *args):
+        """ERROR 级别记录一条消息，并在控制台打印异常堆栈"""
+        if ERROR >= _min_level:
+            _emit(ERROR, self.name, fmt, args)
+        if ERROR >= _level and _console:
+            _print_exception(exc)
+
+    def throttled(self, interval_ms, level, fmt, *args):
+        """
+        按调用点 (格式字符串) 限速：interval_ms 内同一调用点最多输出一次，
+        被抑制的条数在下一次输出时附在末尾
+        """
+        if level < _min_level:
+            return
+        now = ticks_ms()
+        state = _limits.get(fmt)
+        if state is None:
+            _limits[fmt] = [now, 0]
+        elif ticks_diff(now, state[0]) < interval_ms:
+            state[1] += 1
+            return
+        else:
+            state[0] = now
+            if state[1]:
+                suppressed = state[1]
+                state[1] = 0
+                _emit(level, self.name, fmt + " (已抑制 %d 条)", args + (suppressed,))
+                return
+        _emit(level, self.name, fmt, args)
+
+
+_loggers = {}
+
+
+def get_logger(name):
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = Logger(name)
+    return logger
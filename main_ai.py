@@ -1,38 +1,56 @@
+import boot_timeline
 import asyncio
-from doubao_chat import chat_client
 from config import WIFI_SSID, WIFI_PASSWORD
+import log
 
+logger = log.get_logger("main")
+boot_timeline.mark("main")
 
-def do_connect():
+
+def start_wifi():
+    """发起 WiFi 连接后立即返回，关联和 DHCP 在后台进行，期间可以继续导入模块、初始化屏幕"""
     import network
-    import time
-    
+
     sta_if = network.WLAN(network.STA_IF)
     sta_if.active(True)  # 确保 WiFi 已激活
-    
+
     if not sta_if.isconnected():
-        print(f"Connecting to: {WIFI_SSID}...")
+        logger.info("Connecting to: %s...", WIFI_SSID)
         sta_if.connect(WIFI_SSID, WIFI_PASSWORD)
-        
-        # 等待 10 秒，避免无限循环
-        for _ in range(10):
-            if sta_if.isconnected():
-                break
-            time.sleep(2)
-            print("Waiting for connection...")
-        
-        if not sta_if.isconnected():
-            print("Failed to connect!")
-            print("Scan available networks:", sta_if.scan())  # 扫描可用 WiFi
+    return sta_if
+
+
+async def wait_wifi(sta_if, timeout_ms=20000):
+    # 最多等待 20 秒，避免无限循环；等待期间让出事件循环给插件初始化
+    waited = 0
+    while not sta_if.isconnected():
+        if waited >= timeout_ms:
+            logger.error("Failed to connect!")
+            logger.info("Scan available networks: %s", sta_if.scan())  # 扫描可用 WiFi
             raise RuntimeError("WiFi connection failed")
-    
-    print("Connected! IP:", sta_if.ifconfig()[0])
+        await asyncio.sleep_ms(100)
+        waited += 100
+        if waited % 2000 == 0:
+            logger.info("Waiting for connection...")
+
+    boot_timeline.mark("wifi")
+    logger.info("Connected! IP: %s", sta_if.ifconfig()[0])
+
+
+async def main(sta_if):
+    # 屏幕初始化和字库加载与 WiFi 连接、WebSocket 握手并行，不再挡在开始录音之前
+    asyncio.create_task(events.start_plugins())
+    await wait_wifi(sta_if)
+    logger.info("Init Chat !!")
+    await chat_client()
 
 
-do_connect()
-print("Init Chat !!")
+sta_if = start_wifi()
+# 导入 doubao_chat (及其依赖) 与 WiFi 关联同时进行
+from doubao_chat import chat_client  # noqa: E402
+import events  # noqa: E402
 
 try:
-    asyncio.run(chat_client())
+    asyncio.run(main(sta_if))
 except Exception as e:
-    print(f"发生错误: {e}")
+    logger.exc(e, "发生错误: %s", e)
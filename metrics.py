@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# 运行时指标：计数器、仪表、固定分桶直方图，按名字注册在全局表里
+# 记录路径 (inc/set/observe) 只改预分配的整数字段，不分配内存，可以在录音/播放线程和事件循环里随手调用
+# 快照 snapshot() 才构造 dict，可以 json 发到 WebSocket (send) 或写到 flash (dump)；CPython 下行为一致
+from hal import ticks_ms
+from array import array
+
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+# 常用的毫秒分桶上界 (最后一个桶收集超过最大上界的值)
+MS_BUCKETS = (5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Counter:
+    """单调递增计数"""
+
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+
+    def inc(self, n=1):
+        self.value += n
+
+    def reset(self):
+        self.value = 0
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+    """当前值，同时记录出现过的最小/最大值"""
+
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+        self.min = None
+        self.max = None
+
+    def set(self, v):
+        self.value = v
+        if self.max is None or v > self.max:
+            self.max = v
+        if self.min is None or v < self.min:
+            self.min = v
+
+    def reset(self):
+        self.value = 0
+        self.min = None
+        self.max = None
+
+    def snapshot(self):
+        return {"value": self.value, "min": self.min, "max": self.max}
+
+
+class Histogram:
+    """
+    固定分桶直方图：bounds 为递增的整数上界，值 v 落入第一个 v <= bounds[i] 的桶，
+    大于所有上界的落入最后一个溢出桶；分位数按桶上界估算
+    """
+
+    def __init__(self, name, bounds=MS_BUCKETS):
+        self.name = name
+        self.bounds = array("l", bounds)
+        self.counts = array("L", [0] * (len(bounds) + 1))
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def observe(self, v):
+        bounds = self.bounds
+        n = len(bounds)
+        i = 0
+        while i < n and v > bounds[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += v
+        if v > self.max:
+            self.max = v
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def percentile(self, p):
+        """估算第 p 百分位 (0-100)：返回累计计数首次达到该比例的桶上界，溢出桶返回最大值"""
+        if not self.count:
+            return None
+        target = self.count * p / 100
+        seen = 0
+        for i in range(len(self.bounds)):
+            seen += self.counts[i]
+            if seen >= target:
+                return min(self.bounds[i], self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "bounds": list(self.bounds),
+            "counts": list(self.counts),
+        }
+
+
+class Registry:
+    """名字 -> 指标；同名重复注册返回同一个对象，模块可以在导入时各自取用"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+
+    def _get(self, cls, name, *args):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, *args)
+        elif not isinstance(metric, cls):
+            raise ValueError("Metric {} already registered as {}".format(name, type(metric).__name__))
+        return metric
+
+    def counter(self, name):
+        return self._get(Counter, name)
+
+    def gauge(self, name):
+        return self._get(Gauge, name)
+
+    def histogram(self, name, bounds=MS_BUCKETS):
+        return self._get(Histogram, name, bounds)
+
+    def collector(self, fn):
+        """注册快照前调用的采样函数 (例如读取可用内存写入仪表)，可作装饰器使用"""
+        self._collectors.append(fn)
+        return fn
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def snapshot(self):
+        """先运行采样函数，再返回 {名字: 值} 的 dict，带采样时间 ticks_ms"""
+        for fn in self._collectors:
+            fn()
+        out = {"ticks_ms": ticks_ms()}
+        for name, metric in self._metrics.items():
+            out[name] = metric.snapshot()
+        return out
+
+    def to_json(self):
+        return json.dumps(self.snapshot())
+
+    def dump(self, path):
+        """把快照作为一行 JSON 追加到文件 (例如 flash 上的 /metrics.jsonl)"""
+        line = self.to_json()
+        with open(path, "a") as f:
+            f.write(line)
+            f.write("\n")
+
+    async def send(self, ws, event_type="client.metrics"):
+        """把快照作为一个 JSON 事件经已有的 WebSocket 发出 (ws 需提供 send_json)"""
+        await ws.send_json({"type": event_type, "metrics": self.snapshot()})
+
+
+# 默认指标表，各模块共用
+registry = Registry()
+counter = registry.counter
+gauge = registry.gauge
+histogram = registry.histogram
+collector = registry.collector
+snapshot = registry.snapshot
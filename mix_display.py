@@ -1,19 +1,47 @@
-import gc9a01
 import tft_config
-import utime
-import proverbs_20 as default_font
-import inconsolata_16 as english_font
-import math
+from hal import gc9a01, ticks_ms, ticks_diff, mem_info
 import gc
-import micropython
+from array import array
 import time
+import log
+import metrics
+import binfont
+import glyph_index
+import linebuf
+import text_layout
+from config import DISPLAY_FONT_FILE, DISPLAY_GLYPH_CACHE, DISPLAY_LINE_BUFFER, DISPLAY_SCROLL, DISPLAY_LAYOUT_CACHE
+
+logger = log.get_logger("display")
+_render_ms = metrics.histogram("display.render_ms", (50, 100, 200, 500, 1000, 2000, 5000, 10000))
+_append_ms = metrics.histogram("display.append_ms", (5, 10, 20, 50, 100, 200, 500))
+
+# 排版结果中每个字用哪种字体
+CHINESE = 0
+ENGLISH = 1
+
+
+def load_chinese_font():
+    """优先打开二进制字库 (只常驻索引)，没有时导入 proverbs_20 模块"""
+    try:
+        return binfont.BinFont(DISPLAY_FONT_FILE, DISPLAY_GLYPH_CACHE)
+    except OSError:
+        logger.warning("Font file %s not found, importing proverbs_20", DISPLAY_FONT_FILE)
+        import proverbs_20
+        return binfont.ModuleFont(proverbs_20)
+
 
 class CircularTextDisplay:
-    def __init__(self, tft=None, debug=0):
+    def __init__(self, tft=None, debug=0, chinese_font=None):
         """Initialize circular text display for ESP32 with GC9A01.
-        debug: 0 = no debug, 1 = minimal, 2 = verbose"""
+        debug: 0 = no debug, 1 = minimal, 2 = verbose
+        chinese_font: write 字体模块或 binfont.BinFont，默认 load_chinese_font()"""
         self.debug = debug
         self.tft = tft if tft else self._init_display()
+        # 字库在创建显示对象时才加载，不拖慢程序启动
+        default_font = chinese_font or load_chinese_font()
+        if not isinstance(default_font, (binfont.BinFont, binfont.ModuleFont)):
+            default_font = binfont.ModuleFont(default_font)
+        import inconsolata_16 as english_font
         
         # Screen parameters (240x240 circular)
         self.width = 240
@@ -32,68 +60,67 @@ class CircularTextDisplay:
         self.line_spacing = 4
         self.line_height = max(self.chinese_char_height, self.english_char_height) + self.line_spacing
         
-        # Display state
-        self.current_line = 0
-        self.current_y = 20
-        self.current_x = 0
+        # Display state: the layout being drawn and how far pass two has got
+        self._layout = None
+        self._line = 0        # 正在画的行
+        self._drawn = 0       # 已画到第几个字
+        self._drawn_x = 0     # 该行已画内容的右端
+        self._stream = None   # begin_text/append_text 增量排版用的 LayoutEngine (复用)
+        self._layouts = []    # 排版缓存 [(hash, 文本, LayoutEngine)]，最近用过的在前
+        self.first_glyph_ms = None  # 本段文本第一个字画出的时间 (ticks_ms)
         
         # Colors and timing
         self.text_color = gc9a01.WHITE
         self.bg_color = gc9a01.BLUE
         self.char_delay = 0.001  # Reduced from 0.01 to 0.005 seconds
         
-        # Cache for line bounds
-        self._bounds_cache = {}
-        
         # Check TFT capabilities once
         self.has_write = hasattr(self.tft, 'write')
-        self.has_write_len = hasattr(self.tft, 'write_len')
-        self.english_map = getattr(self.english_font, 'MAP', '')
+        # 码点 -> 字形序号表 (中文字体自带)，代替 MAP.index 线性查找
+        self.english_index = glyph_index.from_map(getattr(self.english_font, 'MAP', ''), width=self.english_char_width)
+
+        # 行缓冲渲染：整行合成 RGB565 后一次 blit_buffer (两种字体都须为 1bpp)
+        self.line_buffer = None
+        if (DISPLAY_LINE_BUFFER and hasattr(self.tft, 'blit_buffer')
+                and default_font.BPP == 1 and getattr(english_font, 'BPP', 1) == 1):
+            self.line_buffer = linebuf.LineBuffer(
+                self.width, max(self.chinese_char_height, self.english_char_height))
+
+        # 滚动模式：写满后用 GC9A01 的垂直滚动 (VSCRDEF/VSCSAD) 把内容上移一行，只清新露出的行；
+        # 滚动区为 tft_config.TFA 与 BFA 之间的行，屏幕第 y 行对应显存的行见 _mem_rows
+        self.scroll = DISPLAY_SCROLL and self.line_buffer is not None and hasattr(self.tft, 'vscsad')
+        self.scroll_top = tft_config.TFA
+        self.scroll_height = self.height - tft_config.TFA - tft_config.BFA
+        self.scroll_offset = 0
+        # 每个显存行画过内容的 x 范围 [x0, x1)，滚动时只清露出的行里真正有内容的部分
+        self._row_x0 = array('H', [self.width] * self.height)
+        self._row_x1 = array('H', [0] * self.height)
+        if self.scroll:
+            self.tft.vscrdef(self.scroll_top, self.scroll_height, tft_config.BFA)
+            self.tft.vscsad(self.scroll_top)
         
         # Precompiled punctuation set
         self._punctuation = {0xFF0C, 0xFF0E, 0xFF1A, 0xFF1B, 0xFF01, 0xFF1F, 0x002E, 0x0021, 0x003F}
 
         if self.debug >= 1:
             gc.collect()
-            print("Memory after init:")
-            micropython.mem_info()
+            logger.info("Memory after init:")
+            mem_info()
 
     def _init_display(self):
         """Initialize the circular display."""
         try:
-            start_time = utime.ticks_ms()
+            start_time = ticks_ms()
             tft = tft_config.config(1)
             tft.init()
             tft.fill(gc9a01.BLUE)
             if self.debug >= 1:
-                print(f"Display init time: {utime.ticks_diff(utime.ticks_ms(), start_time)} ms")
+                logger.info("Display init time: %s ms", ticks_diff(ticks_ms(), start_time))
             return tft
         except Exception as e:
-            print(f"Display initialization failed: {e}")
+            logger.error("Display initialization failed: %s", e)
             raise
 
-    def _get_line_bounds(self, y):
-        """Get x-coordinate bounds for a given y, using cache."""
-        if y in self._bounds_cache:
-            return self._bounds_cache[y]
-        
-        dy = abs(y - self.center_y)
-        if dy >= self.radius:
-            bounds = (self.center_x, self.center_x)
-        else:
-            x_offset = int(math.sqrt(self.radius * self.radius - dy * dy)) - 10
-            bounds = (max(0, self.center_x - x_offset), min(self.width, self.center_x + x_offset))
-        
-        self._bounds_cache[y] = bounds
-        return bounds
-
-    def _is_within_circle(self, x, y, width):
-        """Check if character is within circular bounds (top corners only)."""
-        for dx in (0, width):
-            if (x + dx - self.center_x) ** 2 + (y - self.center_y) ** 2 > (self.radius - 5) ** 2:
-                return False
-        return True
-
     def _is_chinese_or_punctuation(self, char):
         """Check if character is Chinese or punctuation."""
         if not char:
@@ -101,163 +128,274 @@ class CircularTextDisplay:
         code = ord(char)
         return (0x4E00 <= code <= 0x9FFF) or (code in self._punctuation)
 
-    def _new_line(self):
-        """Handle new line, resetting x and checking bounds."""
-        self.current_line += 1
-        self.current_y += self.line_height
-        
-        if abs(self.current_y - self.center_y) > self.radius - 10:
-            start_time = utime.ticks_ms()
-            self.tft.fill(self.bg_color)
-            self.current_line = 0
-            self.current_y = 20
-            self._bounds_cache.clear()
-            gc.collect()
-            if self.debug >= 1:
-                print(f"Screen clear time: {utime.ticks_diff(utime.ticks_ms(), start_time)} ms")
-                print("Memory after screen clear:")
-                micropython.mem_info()
+    def _measure(self, char):
+        """Glyph lookup for the layout engine: (font kind, glyph index, width), None if not in the font."""
+        if self._is_chinese_or_punctuation(char):
+            index = self.chinese_font.index(char)
+            if index < 0:
+                return None
+            return CHINESE, index, self.chinese_font.glyph_index.widths[index]
+        index = self.english_index.find(char)
+        if index < 0:
+            return None
+        return ENGLISH, index, self.english_char_width
 
-        self.current_x = self._get_line_bounds(self.current_y)[0]
+    def _new_layout(self, scroll=None):
+        return text_layout.LayoutEngine(self._measure, self.line_height,
+                                        self.scroll if scroll is None else scroll)
 
-    def _print_char(self, char):
-        """Print a single character, returning True if rendered, False if skipped."""
-        if char == '\n':
-            self._new_line()
-            return False
-        
-        start_time = utime.ticks_ms() if self.debug >= 2 else 0
-        
-        # Select font and dimensions
-        is_chinese = self._is_chinese_or_punctuation(char)
-        font = self.chinese_font if is_chinese else self.english_font
-        char_width = self.chinese_char_width if is_chinese else self.english_char_width
-        char_height = self.chinese_char_height if is_chinese else self.english_char_height
-        
-        # Get dynamic character width for Chinese if supported
-        if is_chinese and self.has_write_len:
-            char_width = self.tft.write_len(font, char) or char_width
-        
-        # Check line bounds
-        x_min, x_max = self._get_line_bounds(self.current_y)
-        if self.current_x + char_width > x_max:
-            self._new_line()
-            x_min, x_max = self._get_line_bounds(self.current_y)
-        
-        x = self.current_x
-        if not self._is_within_circle(x, self.current_y, char_width):
-            self._new_line()
-            x = self.current_x = self._get_line_bounds(self.current_y)[0]
-        
-        # Draw character
-        try:
-            render_start = utime.ticks_ms() if self.debug >= 2 else 0
-            self.tft.fill_rect(x, self.current_y, char_width, char_height, self.bg_color)
-            if is_chinese and self.has_write:
-                self.tft.write(font, char, x, self.current_y, self.text_color, self.bg_color)
-            elif not is_chinese and char in self.english_map:
-                char_index = self.english_font.MAP.index(char)
-                self.tft.bitmap(font, x, self.current_y, char_index)
-            else:
-                return False
-            render_time = utime.ticks_diff(utime.ticks_ms(), render_start) if self.debug >= 2 else 0
-            if self.debug >= 2 and render_time > 10:
-                print(f"High render time for '{char}': {render_time} ms (write/bitmap)")
-        except (AttributeError, ValueError) as e:
-            if self.debug >= 1:
-                print(f"Failed to render '{char}': {e}")
-            return False
-        
-        self.current_x += char_width
+    def _layout_text(self, text):
+        """Pass one for a whole text, cached by text hash so repeated prompts skip the layout."""
+        key = hash(text)
+        cache = self._layouts
+        for i in range(len(cache)):
+            entry = cache[i]
+            if entry[0] == key and entry[1] == text:
+                if i:
+                    cache.insert(0, cache.pop(i))
+                return entry[2]
+        # 一屏放得下的文本不会滚动，不必按滚动模式收窄每行
+        layout = self._new_layout(False)
+        layout.feed(text)
+        if self.scroll and text_layout.NEW_PAGE in layout.line_action:
+            layout = self._new_layout()
+            layout.feed(text)
+        cache.insert(0, (key, text, layout))
+        del cache[DISPLAY_LAYOUT_CACHE:]
+        return layout
+
+    def _clear_page(self):
+        """Start a new page: clear the screen instead of scrolling."""
+        start_time = ticks_ms()
+        self.tft.fill(self.bg_color)
+        self._reset_scroll()
+        gc.collect()
+        if self.debug >= 1:
+            logger.info("Screen clear time: %s ms", ticks_diff(ticks_ms(), start_time))
+            logger.info("Memory after screen clear:")
+            mem_info()
+
+    def _scroll_up(self):
+        """Scroll the text region up by one line instead of clearing the screen.
+        The new line reuses the last line slot; scroll-mode layouts give every line the bounds of
+        the top slot (text_layout.scroll_rows), so lines stay inside the disc as they move up."""
+        start_time = ticks_ms()
+        self.scroll_offset = (self.scroll_offset + self.line_height) % self.scroll_height
+        self.tft.vscsad(self.scroll_top + self.scroll_offset)
+        # 滚动区底部露出的行显示的是原来顶部的内容；移到第一行上方的行已离开文字区，
+        # 圆在那里更窄，一并清掉
+        self._clear_rows(self.scroll_top + self.scroll_height - self.line_height, self.line_height)
+        if text_layout.FIRST_Y > self.scroll_top:
+            self._clear_rows(self.scroll_top, text_layout.FIRST_Y - self.scroll_top)
         if self.debug >= 2:
-            total_time = utime.ticks_diff(utime.ticks_ms(), start_time)
-            print(f"Char '{char}' render time: {total_time} ms")
-            if total_time > 10:
-                print(f"High total render time for '{char}': {total_time} ms")
-            gc.collect()
-            print(f"Memory after rendering '{char}':")
-            micropython.mem_info()
-        
-        return True
+            logger.debug("Scroll time: %s ms", ticks_diff(ticks_ms(), start_time))
+
+    def _clear_rows(self, y, h):
+        """Clear screen rows [y, y+h), only over the x-extent drawn in each memory row."""
+        row_x0 = self._row_x0
+        row_x1 = self._row_x1
+        for mem_y, rows, _ in self._mem_rows(y, h):
+            x0 = self.width
+            x1 = 0
+            for r in range(mem_y, mem_y + rows):
+                x0 = min(x0, row_x0[r])
+                x1 = max(x1, row_x1[r])
+                row_x0[r] = self.width
+                row_x1[r] = 0
+            if x1 > x0:
+                self.tft.fill_rect(x0, mem_y, x1 - x0, rows, self.bg_color)
+
+    def _mem_rows(self, y, h):
+        """Screen rows [y, y+h) -> [(memory row, rows, first screen row offset)], split where the
+        scroll region wraps around."""
+        top = self.scroll_top
+        if not self.scroll_offset or y < top or y >= top + self.scroll_height:
+            return ((y, h, 0),)
+        mem_y = top + (y - top + self.scroll_offset) % self.scroll_height
+        first = top + self.scroll_height - mem_y
+        if first >= h:
+            return ((mem_y, h, 0),)
+        return ((mem_y, first, 0), (top, h - first, first))
 
-    def display_text(self, text, color=None, bg_color=None, char_delay=None):
-        """Display text character by character or in batches."""
-        start_time = utime.ticks_ms()
+    def _reset_scroll(self):
+        """After a full-screen fill, point the scroll region back at its first row."""
+        if not self.scroll:
+            return
+        for r in range(self.height):
+            self._row_x0[r] = self.width
+            self._row_x1[r] = 0
+        if self.scroll_offset:
+            self.scroll_offset = 0
+            self.tft.vscsad(self.scroll_top)
+
+    def display_text(self, text, color=None, bg_color=None, char_delay=None, stop=None):
+        """Display a whole text: lay it out (or reuse a cached layout), then render it line by line.
+        stop: optional callable checked before each line; rendering ends early once it returns True."""
+        start_time = ticks_ms()
         
         self.text_color = color or self.text_color
         self.bg_color = bg_color or self.bg_color
         self.char_delay = char_delay if char_delay is not None else self.char_delay
         
+        layout = self._layout_text(text)
         self.tft.fill(self.bg_color)
-        self.current_line = 0
-        self.current_y = 20
-        self.current_x = self._get_line_bounds(self.current_y)[0]
-        self._bounds_cache.clear()
-        
-        # Batch rendering: process one line at a time
-        line_buffer = []
-        line_width = 0
-        x_min, x_max = self._get_line_bounds(self.current_y)
-        
-        for char in text:
-            if char == '\n':
-                if line_buffer:
-                    self._render_line(line_buffer, line_width)
-                    line_buffer.clear()
-                    line_width = 0
-                self._new_line()
-                x_min, x_max = self._get_line_bounds(self.current_y)
-                continue
-            
-            is_chinese = self._is_chinese_or_punctuation(char)
-            char_width = self.chinese_char_width if is_chinese else self.english_char_width
-            if is_chinese and self.has_write_len:
-                char_width = self.tft.write_len(self.chinese_font, char) or char_width
-            
-            if self.current_x + line_width + char_width > x_max or not self._is_within_circle(self.current_x + line_width, self.current_y, char_width):
-                if line_buffer:
-                    self._render_line(line_buffer, line_width)
-                    line_buffer.clear()
-                    line_width = 0
-                self._new_line()
-                x_min, x_max = self._get_line_bounds(self.current_y)
-            
-            line_buffer.append(char)
-            line_width += char_width
-        
-        # Render any remaining characters
-        if line_buffer:
-            self._render_line(line_buffer, line_width)
+        self._reset_scroll()
+        self.first_glyph_ms = None
+        self._start(layout)
+        self._render(self.char_delay, stop)
         
+        total_time = ticks_diff(ticks_ms(), start_time)
+        _render_ms.observe(total_time)
         gc.collect()
         if self.debug >= 1:
-            print(f"Total display_text time: {utime.ticks_diff(utime.ticks_ms(), start_time)} ms")
-            print("Memory after display_text:")
-            micropython.mem_info()
+            logger.info("Total display_text time: %s ms", total_time)
+            logger.info("Memory after display_text:")
+            mem_info()
 
-    def _render_line(self, line_buffer, line_width):
-        """Render a line of characters with a single delay."""
-        start_time = utime.ticks_ms() if self.debug >= 2 else 0
-        for char in line_buffer:
-            self._print_char(char)
-        if self.char_delay > 0:
-            utime.sleep(self.char_delay * len(line_buffer))
-        if self.debug >= 2:
-            print(f"Line render time for {len(line_buffer)} chars: {utime.ticks_diff(utime.ticks_ms(), start_time)} ms")
+    def begin_text(self, color=None, bg_color=None):
+        """Start a streamed text: clear the screen and reset layout, then feed it with append_text()."""
+        self.text_color = color or self.text_color
+        self.bg_color = bg_color or self.bg_color
+        self.tft.fill(self.bg_color)
+        self._reset_scroll()
+        self.first_glyph_ms = None
+        if self._stream is None:
+            self._stream = self._new_layout()
+        self._stream.reset()
+        self._start(self._stream)
+
+    def append_text(self, delta):
+        """Lay delta out after the text so far and draw only what changed.
+        Returns the number of glyphs drawn (glyphs a late wrap moved to the next line count again)."""
+        start_time = ticks_ms()
+        if self._layout is not self._stream:
+            self.begin_text()
+        self._stream.feed(delta)
+        drawn = self._render()
+        _append_ms.observe(ticks_diff(ticks_ms(), start_time))
+        return drawn
+
+    def _start(self, layout):
+        self._layout = layout
+        self._line = 0
+        self._drawn = 0
+        self._drawn_x = layout.row_start[layout.line_y[0]]
+
+    def _render(self, char_delay=0, stop=None):
+        """Pass two: draw what the layout has that is not on screen yet, one line at a time,
+        applying each line's page action (clear or scroll) before it. Returns the glyphs drawn."""
+        layout = self._layout
+        last = len(layout.line_y) - 1
+        drawn = 0
+        while True:
+            i = self._line
+            y = layout.line_y[i]
+            end = layout.line_end(i)
+            if self._drawn > end:
+                # 增量排版折行时把本行已画的字移到了下一行：擦掉
+                x = layout.xs[end - 1] + layout.widths[end - 1] if end > layout.line_start[i] else self._drawn_x
+                self._fill_rows(x, y, self._drawn_x - x)
+                self._drawn = end
+                self._drawn_x = x
+            if self._drawn < end:
+                start_time = ticks_ms() if self.debug >= 2 else 0
+                self._draw_run(layout, self._drawn, end, y)
+                drawn += end - self._drawn
+                self._drawn_x = layout.xs[end - 1] + layout.widths[end - 1]
+                if char_delay > 0:
+                    time.sleep(char_delay * (end - self._drawn))
+                if self.debug >= 2:
+                    logger.debug("Line render time for %s chars: %s ms", end - self._drawn, ticks_diff(ticks_ms(), start_time))
+                self._drawn = end
+            if i >= last or (stop is not None and stop()):
+                return drawn
+            i += 1
+            action = layout.line_action[i]
+            if action == text_layout.NEW_PAGE:
+                self._clear_page()
+            elif action == text_layout.SCROLL:
+                self._scroll_up()
+            self._line = i
+            self._drawn = layout.line_start[i]
+            self._drawn_x = layout.row_start[layout.line_y[i]]
+
+    def _fill_rows(self, x, y, w):
+        """Fill one text line's rows [x, x+w) with the background colour."""
+        if w <= 0:
+            return
+        h = max(self.chinese_char_height, self.english_char_height)
+        for mem_y, rows, _ in self._mem_rows(y, h):
+            self.tft.fill_rect(x, mem_y, w, rows, self.bg_color)
+
+    def _draw_run(self, layout, start, end, y):
+        """Draw glyphs [start, end) of one laid-out line: composed in the line buffer and sent with a
+        single blit_buffer, or glyph by glyph with fill_rect + write/bitmap."""
+        kinds = layout.kinds
+        glyphs = layout.glyphs
+        widths = layout.widths
+        english = self.english_font
+        x = layout.xs[start]
+        lb = self.line_buffer
+        if lb is None:
+            for k in range(start, end):
+                char_width = widths[k]
+                gx = layout.xs[k]
+                try:
+                    if kinds[k] == CHINESE:
+                        self.tft.fill_rect(gx, y, char_width, self.chinese_char_height, self.bg_color)
+                        if self.has_write:
+                            self.chinese_font.write(self.tft, chr(layout.codes[k]), gx, y, self.text_color, self.bg_color)
+                    else:
+                        self.tft.fill_rect(gx, y, char_width, self.english_char_height, self.bg_color)
+                        self.tft.bitmap(english, gx, y, glyphs[k])
+                except (AttributeError, ValueError) as e:
+                    if self.debug >= 1:
+                        logger.error("Failed to render '%s': %s", chr(layout.codes[k]), e)
+        else:
+            run_width = layout.xs[end - 1] + widths[end - 1] - x
+            lb.start(run_width, self.bg_color)
+            for k in range(start, end):
+                if kinds[k] == CHINESE:
+                    data, bit = self.chinese_font.glyph(glyphs[k])
+                    lb.glyph(data, bit, widths[k], self.chinese_char_height, self.text_color, self.bg_color)
+                else:
+                    h = self.english_char_height
+                    lb.glyph(english.BITMAP, glyphs[k] * widths[k] * h, widths[k], h,
+                             english.PALETTE[1], english.PALETTE[0])
+            view = lb.view()
+            row_bytes = run_width * 2
+            for mem_y, rows, first in self._mem_rows(y, lb.height):
+                self.tft.blit_buffer(view[first * row_bytes:(first + rows) * row_bytes], x, mem_y, run_width, rows)
+                if self.scroll:
+                    for r in range(mem_y, mem_y + rows):
+                        if x < self._row_x0[r]:
+                            self._row_x0[r] = x
+                        if x + run_width > self._row_x1[r]:
+                            self._row_x1[r] = x + run_width
+        if self.first_glyph_ms is None:
+            self.first_glyph_ms = ticks_ms()
+
+    def show_image(self, path, x=0, y=0):
+        """Draw a jpg file with the driver's decoder; a following append_text starts a new text."""
+        start_time = ticks_ms()
+        self._reset_scroll()
+        self.tft.jpg(path, x, y)
+        self._layout = None
+        self.first_glyph_ms = None
+        if self.debug >= 1:
+            logger.info("Image %s draw time: %s ms", path, ticks_diff(ticks_ms(), start_time))
 
     def clear_screen(self):
         """Clear the screen and reset state."""
-        start_time = utime.ticks_ms()
+        start_time = ticks_ms()
         self.tft.fill(self.bg_color)
-        self.current_line = 0
-        self.current_y = 20
-        self.current_x = self._get_line_bounds(self.current_y)[0]
-        self._bounds_cache.clear()
+        self._reset_scroll()
+        self._layout = None
         gc.collect()
         if self.debug >= 1:
-            print(f"Clear screen time: {utime.ticks_diff(utime.ticks_ms(), start_time)} ms")
-            print("Memory after clear_screen:")
-            micropython.mem_info()
+            logger.info("Clear screen time: %s ms", ticks_diff(ticks_ms(), start_time))
+            logger.info("Memory after clear_screen:")
+            mem_info()
 
 if __name__ == "__main__":
     try:
@@ -279,7 +417,7 @@ if __name__ == "__main__":
         print_text(test_text3)
 
         #display.clear_screen()
-        print("Test completed")
+        logger.info("Test completed")
     except Exception as e:
-        print(f"Test failed: {e}")
+        logger.error("Test failed: %s", e)
 
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# 预分配的环形缓冲区，稳态运行时不分配内存
+import sys
+from array import array
+
+# viper 代码只在 MicroPython 下执行，CPython 不会求值装饰器和类型注解
+_VIPER = sys.implementation.name == "micropython"
+
+if _VIPER:
+    import micropython
+
+    @micropython.viper
+    def _copy_viper(dst: ptr8, doff: int, src: ptr8, soff: int, n: int):
+        i = 0
+        while i < n:
+            dst[doff + i] = src[soff + i]
+            i += 1
+
+    def copy(dst, doff, src, soff, n):
+        """dst[doff:doff+n] = src[soff:soff+n]，不创建切片或 memoryview 对象"""
+        _copy_viper(dst, doff, src, soff, n)
+
+else:
+    def copy(dst, doff, src, soff, n):
+        """dst[doff:doff+n] = src[soff:soff+n]，不创建切片或 memoryview 对象"""
+        memoryview(dst)[doff:doff + n] = memoryview(src)[soff:soff + n]
+
+
+class ChunkRing:
+    """
+    固定槽位的块环形缓冲：所有槽位共用一个 bytearray，按槽位下标寻址
+    满了之后新块覆盖最旧的块，适合保存"最近 N 个麦克风块"
+    """
+
+    def __init__(self, slots, slot_size):
+        self.slots = slots
+        self.slot_size = slot_size
+        self._buf = bytearray(slots * slot_size)
+        self._lens = array('H', [0] * slots)
+        self._head = 0    # 下一个写入的槽位
+        self.count = 0    # 当前保存的块数
+        self.nbytes = 0   # 当前保存的总字节数
+
+    def clear(self):
+        self.count = 0
+        self.nbytes = 0
+
+    def push(self, src, n):
+        """把 src[:n] 存入一个槽位 (超过 slot_size 的部分截断)"""
+        if not self.slots:
+            return
+        if n > self.slot_size:
+            n = self.slot_size
+        slot = self._head
+        if self.count == self.slots:
+            self.nbytes -= self._lens[slot]  # 覆盖最旧的块
+        else:
+            self.count += 1
+        copy(self._buf, slot * self.slot_size, src, 0, n)
+        self._lens[slot] = n
+        self.nbytes += n
+        self._head = slot + 1 if slot + 1 < self.slots else 0
+
+    def drain_into(self, dst, pos=0):
+        """按旧到新的顺序把所有块连续拷贝到 dst[pos:]，清空并返回结束位置"""
+        slot = self._head - self.count
+        if slot < 0:
+            slot += self.slots
+        for _ in range(self.count):
+            n = self._lens[slot]
+            copy(dst, pos, self._buf, slot * self.slot_size, n)
+            pos += n
+            slot = slot + 1 if slot + 1 < self.slots else 0
+        self.clear()
+        return pos
+
+
+class ByteRing:
+    """字节流 FIFO：固定容量，写满后 write() 只接收放得下的部分，由调用方决定等待还是丢弃"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._read = 0    # 下一个读取位置
+        self.level = 0    # 当前缓存的字节数
+
+    def clear(self):
+        self._read = 0
+        self.level = 0
+
+    def free(self):
+        return self.capacity - self.level
+
+    def write(self, src, n):
+        """追加 src[:n]，返回实际写入的字节数 (空间不足时截断)"""
+        if n > self.capacity - self.level:
+            n = self.capacity - self.level
+        pos = self._read + self.level
+        if pos >= self.capacity:
+            pos -= self.capacity
+        first = min(n, self.capacity - pos)
+        copy(self._buf, pos, src, 0, first)
+        if n > first:
+            copy(self._buf, 0, src, first, n - first)
+        self.level += n
+        return n
+
+    def read_into(self, dst, n):
+        """取出最多 n 字节写入 dst[0:]，返回实际读取的字节数"""
+        if n > self.level:
+            n = self.level
+        first = min(n, self.capacity - self._read)
+        copy(dst, 0, self._buf, self._read, first)
+        if n > first:
+            copy(dst, first, self._buf, 0, n - first)
+        self._read += n
+        if self._read >= self.capacity:
+            self._read -= self.capacity
+        self.level -= n
+        return n
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+event_sniff 分拣服务端事件 (CPython)：音频增量走原始区间，delta 含 JSON 转义 (\\/) 时退回 json.loads
+"""
+import asyncio
+import base64
+import json
+
+import b64codec
+import event_sniff
+import events
+
+# 编码后含 "/" 的 PCM (0xFF 0xFF 0xFF -> "////")
+PCM = bytes(range(256)) + b"\xff" * 30
+
+
+def frame(delta, escape_slash=False, **extra):
+    body = dict(type=event_sniff.AUDIO_DELTA, response_id="resp_1", delta=delta, **extra)
+    text = json.dumps(body)
+    if escape_slash:
+        text = text.replace("/", "\\/")
+    return bytearray(text.encode())
+
+
+def decode(buf, start, end):
+    dst = bytearray(len(PCM) + 3)
+    n = b64codec.decode_into(buf, start, end, dst, 0)
+    return bytes(dst[:n])
+
+
+def test_plain_delta_uses_raw_range():
+    delta = base64.b64encode(PCM).decode()
+    buf = frame(delta)
+    event_type, data, start, end = event_sniff.parse(buf)
+    assert event_type == event_sniff.AUDIO_DELTA and data is None
+    assert bytes(buf[start:end]) == delta.encode()
+    assert decode(buf, start, end) == PCM
+
+
+def test_escaped_delta_falls_back_to_json():
+    delta = base64.b64encode(PCM).decode()
+    assert "/" in delta
+    buf = frame(delta, escape_slash=True)
+    assert b"\\/" in buf
+    event_type, data, start, end = event_sniff.parse(buf)
+    assert event_type == event_sniff.AUDIO_DELTA
+    assert (start, end) == (-1, -1)
+    assert data["delta"] == delta
+    assert decode(data["delta"], 0, len(delta)) == PCM
+
+
+def test_escape_outside_delta_keeps_fast_path():
+    delta = base64.b64encode(PCM).decode()
+    buf = frame(delta, item_id='a"b\\c')
+    event_type, data, start, end = event_sniff.parse(buf)
+    assert data is None
+    assert decode(buf, start, end) == PCM
+
+
+def test_replay_dispatches_escaped_delta_as_range():
+    delta = base64.b64encode(PCM).decode()
+    router = events.EventRouter()
+    got = []
+
+    @router.on(event_sniff.AUDIO_DELTA)
+    async def on_delta(ws, buf, start, end):
+        got.append(decode(buf, start, end))
+
+    failures = asyncio.run(events.replay([frame(delta), frame(delta, escape_slash=True)], router))
+    assert failures == 0
+    assert got == [PCM, PCM]
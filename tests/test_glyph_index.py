@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+glyph_index 与 MAP.index 的结果一致 (CPython 上走 ASCII 表 + 二分的纯 Python 回退，与设备同一条路径)
+"""
+import glyph_index
+import inconsolata_16
+import proverbs_20
+
+
+def test_chinese_font_matches_map():
+    index = glyph_index.from_map(proverbs_20.MAP, proverbs_20.WIDTHS)
+    for ch in set(proverbs_20.MAP):
+        i = proverbs_20.MAP.index(ch)
+        assert index.find(ch) == i
+        assert index.width(ch) == proverbs_20.WIDTHS[i]
+
+
+def test_english_font_matches_map():
+    index = glyph_index.from_map(inconsolata_16.MAP, width=inconsolata_16.WIDTH)
+    for code in range(0x20, 0x3000):
+        ch = chr(code)
+        expected = inconsolata_16.MAP.index(ch) if ch in inconsolata_16.MAP else glyph_index.MISSING
+        assert index.find(ch) == expected
+
+
+def test_missing_characters():
+    index = glyph_index.from_map(proverbs_20.MAP, proverbs_20.WIDTHS)
+    for ch in ("\x00", "☃", "￿", "\U0001f600"):
+        if ch not in proverbs_20.MAP:
+            assert index.find(ch) == glyph_index.MISSING
+            assert index.width(ch) == 0
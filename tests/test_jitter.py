@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+audio_playback.JitterBuffer 的低水位规则 (CPython，不启动播放线程，直接调用 put/take)
+
+连续几轮响应，每轮都要在攒够低水位 (或流结束) 之后才开始输出，且开头不计欠载
+"""
+import pytest
+
+import audio_playback
+
+LOW = 6400
+BLOCK = 2048
+
+
+def make():
+    return audio_playback.JitterBuffer(32768, LOW, 24576)
+
+
+def response(jitter, chunk=4092, chunks=4):
+    """模拟一轮响应：逐块放入，每块之后播放线程取一次；返回第一次取到数据时缓冲里的字节数"""
+    src = bytearray(chunk)
+    dst = bytearray(BLOCK)
+    first = None
+    jitter.start_stream()
+    for _ in range(chunks):
+        jitter.put(src, chunk)
+        level = jitter.level
+        if jitter.take(dst, BLOCK) and first is None:
+            first = level
+    jitter.end_stream()
+    while jitter.take(dst, BLOCK):
+        pass
+    return first
+
+
+@pytest.mark.parametrize("turns", [1, 2, 5])
+def test_every_response_waits_for_low_watermark(turns):
+    jitter = make()
+    for _ in range(turns):
+        assert response(jitter) >= LOW
+        assert jitter.level == 0
+    assert jitter.underruns == 0
+
+
+def test_priming_restored_on_start_stream():
+    jitter = make()
+    response(jitter)
+    assert not jitter.priming
+    jitter.start_stream()
+    assert jitter.priming
+    jitter.put(bytearray(4092), 4092)
+    assert jitter.take(bytearray(BLOCK), BLOCK) == 0
+    assert jitter.underruns == 0
+
+
+def test_short_response_plays_after_end_stream():
+    """不足低水位的短响应在 end_stream 后直接播完"""
+    jitter = make()
+    for _ in range(3):
+        jitter.start_stream()
+        jitter.put(bytearray(1000), 1000)
+        assert jitter.take(bytearray(BLOCK), BLOCK) == 0
+        jitter.end_stream()
+        assert jitter.take(bytearray(BLOCK), BLOCK) == 1000
+    assert jitter.underruns == 0
+
+
+def test_underrun_mid_stream_counts_once_and_reprimes():
+    jitter = make()
+    dst = bytearray(8192)
+    jitter.start_stream()
+    jitter.put(bytearray(LOW), LOW)
+    assert jitter.take(dst, len(dst)) == LOW
+    assert jitter.take(dst, len(dst)) == 0
+    assert jitter.underruns == 1
+    jitter.put(bytearray(1000), 1000)
+    assert jitter.take(dst, len(dst)) == 0
+    assert jitter.underruns == 1
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+vad.energy / zero_crossing_rate 与逐样本参考实现对比 (CPython)
+
+夹具为确定性生成的 16 位小端 PCM：静音、正弦、带噪声的语音样波形、满幅方波 (含 -32768)
+numpy 路径在没有安装 numpy 时跳过，memoryview 回退路径总会测试
+"""
+import math
+import random
+import struct
+
+import pytest
+
+import vad
+
+
+def pcm(samples):
+    return struct.pack("<%dh" % len(samples), *samples)
+
+
+def fixtures():
+    rnd = random.Random(1234)
+    sine = [int(12000 * math.sin(2 * math.pi * 440 * i / 16000)) for i in range(1024)]
+    noisy = [max(-32768, min(32767, int(6000 * math.sin(i / 7.0)) + rnd.randint(-900, 900)))
+             for i in range(1024)]
+    return {
+        "silence": pcm([0] * 512),
+        "sine": pcm(sine),
+        "noisy": pcm(noisy),
+        "full-scale": pcm([32767, -32768] * 256),
+        "negative-peak": pcm([-32768] + [100] * 63),
+        "single": pcm([-5]),
+    }
+
+
+def reference(buf, nbytes, step=1):
+    samples = struct.unpack("<%dh" % (nbytes // 2), bytes(buf[:nbytes // 2 * 2]))[::step]
+    if not samples:
+        return 0, 0, 0
+    mags = [abs(s) for s in samples]
+    return (sum(mags) / len(samples), math.sqrt(sum(s * s for s in samples) / len(samples)), max(mags))
+
+
+def reference_zcr(buf, nbytes, step=1):
+    samples = struct.unpack("<%dh" % (nbytes // 2), bytes(buf[:nbytes // 2 * 2]))[::step]
+    if len(samples) < 2:
+        return 0
+    signs = [s < 0 for s in samples]
+    return sum(a != b for a, b in zip(signs, signs[1:])) / (len(samples) - 1)
+
+
+@pytest.fixture(params=["memoryview", "numpy"])
+def backend(request, monkeypatch):
+    """切换 vad 在 CPython 上的两条实现路径"""
+    if request.param == "numpy":
+        monkeypatch.setattr(vad, "_np", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(vad, "_np", None)
+    return request.param
+
+
+def assert_energy(got, want):
+    assert got[0] == pytest.approx(want[0])
+    assert got[1] == pytest.approx(want[1])
+    assert got[2] == want[2]
+
+
+@pytest.mark.parametrize("name", sorted(fixtures()))
+def test_energy_matches_reference(backend, name):
+    buf = fixtures()[name]
+    assert_energy(vad.energy(buf, len(buf)), reference(buf, len(buf)))
+
+
+def test_full_scale(backend):
+    buf = pcm([32767, -32768] * 256)
+    mean_abs, rms, peak = vad.energy(buf, len(buf))
+    assert peak == 32768
+    assert mean_abs == pytest.approx(32767.5)
+    assert rms == pytest.approx(math.sqrt((32767 ** 2 + 32768 ** 2) / 2))
+
+
+@pytest.mark.parametrize("nbytes", [1, 3, 101, 1023])
+def test_odd_nbytes_ignores_trailing_byte(backend, nbytes):
+    buf = bytearray(fixtures()["noisy"])
+    got = vad.energy(buf, nbytes)
+    assert_energy(got, reference(buf, nbytes))
+    # 末尾不成对的字节 (半个样本) 不参与计算
+    buf[nbytes - 1] ^= 0xFF
+    assert_energy(vad.energy(buf, nbytes), got)
+
+
+def test_empty(backend):
+    assert vad.energy(b"", 0) == (0, 0, 0)
+
+
+@pytest.mark.parametrize("step", [2, 3, 4, 7])
+@pytest.mark.parametrize("name", ["sine", "noisy", "full-scale"])
+def test_energy_decimated(backend, name, step):
+    buf = fixtures()[name]
+    assert_energy(vad.energy(buf, len(buf), step), reference(buf, len(buf), step))
+
+
+def test_memoryview_input(backend):
+    buf = fixtures()["sine"]
+    view = memoryview(bytearray(buf))
+    assert_energy(vad.energy(view, len(buf)), reference(buf, len(buf)))
+
+
+@pytest.mark.parametrize("step", [1, 2, 5])
+@pytest.mark.parametrize("name", sorted(fixtures()))
+def test_zero_crossing_rate(name, step):
+    buf = fixtures()[name]
+    assert vad.zero_crossing_rate(buf, len(buf), step) == pytest.approx(reference_zcr(buf, len(buf), step))
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+圆形屏幕 (240x240) 的文字排版，分两遍：LayoutEngine 先把文本排成紧凑数组 (每个字的字形、x，每行的 y 与起始下标)，
+再由 mix_display 按行渲染
+
+- 行边界表在导入时按圆算一次 (不再每行 math.sqrt、每个字做浮点平方判断)，判断一个字能否放下只查两个数组
+- 换行时英文单词整体移到下一行，中文遵守避头尾：行首不放 ，。！？ 等收尾标点，行尾不放开括号/开引号
+- 排版可以一次做完 (display_text)，也可以随流式增量继续 (append_text)；后者折行时可能把本行已画的字移到下一行，
+  渲染端比较 line_end() 与已画位置擦掉多出的部分
+"""
+import math
+from array import array
+
+WIDTH = 240
+HEIGHT = 240
+RADIUS = 120
+CENTER_X = 120
+CENTER_Y = 120
+MARGIN = 10        # 行边界比圆周向内缩进的像素
+CORNER_MARGIN = 5  # 字的左上、右上角须落在半径 RADIUS - 5 的圆内
+FIRST_Y = 20       # 第一行的 y
+
+# 每行开始前的动作
+NONE = 0
+NEW_PAGE = 1  # 清屏后从 FIRST_Y 重新开始
+SCROLL = 2    # 内容上移一行，新行沿用最后一个行位 (见 scroll_rows)
+
+NO_LINE_START = set(ord(c) for c in "，。、；：？！）》」』”’…,.;:?!)]}%")
+NO_LINE_END = set(ord(c) for c in "（《「『“‘([{")
+
+
+def _build_rows():
+    """逐行的 (行首 x, 字的右边界, 字的左边界)：字放得下当且仅当 x >= LEFT[y] 且 x + 宽 <= LIMIT[y]"""
+    start = array("H", [CENTER_X] * HEIGHT)
+    limit = array("H", [0] * HEIGHT)
+    left = array("H", [WIDTH] * HEIGHT)
+    inner = RADIUS - CORNER_MARGIN
+    for y in range(HEIGHT):
+        dy = abs(y - CENTER_Y)
+        if dy >= RADIUS:
+            continue
+        offset = int(math.sqrt(RADIUS * RADIUS - dy * dy)) - MARGIN
+        start[y] = max(0, CENTER_X - offset)
+        if dy > inner:
+            continue
+        corner = int(math.sqrt(inner * inner - dy * dy))
+        limit[y] = max(0, min(WIDTH, CENTER_X + offset, CENTER_X + corner))
+        left[y] = max(0, CENTER_X - corner)
+    return start, limit, left
+
+
+ROW_START, ROW_LIMIT, ROW_LEFT = _build_rows()
+
+_scroll_rows = {}  # 行高 -> 滚动模式的边界表
+
+
+def _box(y, h):
+    """y 开始高 h 的一行里所有像素行边界的交集 (行首 x, 右边界, 左边界)"""
+    rows = range(y, min(y + h, HEIGHT))
+    return (max(ROW_START[r] for r in rows), min(ROW_LIMIT[r] for r in rows),
+            max(ROW_LEFT[r] for r in rows))
+
+
+def scroll_rows(line_height):
+    """
+    滚动模式的 (行首 x 表, 右边界表, 左边界表, 最后一个行位的 y)：
+    滚动会把每一行一直移到最上面的行位，所以所有行都按第一行整个行高范围内的边界排 (圆在顶部最窄)；
+    向下的行位只用到行高范围仍不比第一行窄的为止，写满后在那里滚动
+    同一行高只算一次，之后共用
+    """
+    rows = _scroll_rows.get(line_height)
+    if rows is None:
+        start, limit, left = _box(FIRST_Y, line_height)
+        last = FIRST_Y
+        y = FIRST_Y + line_height
+        while not overflows(y):
+            s, l, f = _box(y, line_height)
+            if s > start or l < limit or f > left:
+                break
+            last = y
+            y += line_height
+        rows = _scroll_rows[line_height] = (array("H", [start]) * HEIGHT, array("H", [limit]) * HEIGHT,
+                                            array("H", [left]) * HEIGHT, last)
+    return rows
+
+
+def overflows(y):
+    """第 y 行是否已超出圆内可用的范围"""
+    return abs(y - CENTER_Y) > RADIUS - MARGIN
+
+
+def _is_word(code):
+    return (0x30 <= code <= 0x39 or 0x41 <= code <= 0x5A or 0x61 <= code <= 0x7A
+            or code == 0x27 or code == 0x2D)
+
+
+class LayoutEngine:
+    """
+    排版结果与状态：
+    codes/kinds/glyphs/widths/xs 按字的顺序 (kinds 由 measure 决定，例如 0 中文字体、1 英文字体)，
+    line_y/line_start/line_action 每行一项 (line_action 为该行开始前的 NONE/NEW_PAGE/SCROLL)
+    measure(ch) 返回 (kind, 字形序号, 宽度)，字库中没有的字返回 None (跳过)
+    """
+
+    def __init__(self, measure, line_height, scroll=False, kinsoku=True, word_wrap=True):
+        self.measure = measure
+        self.line_height = line_height
+        self.scroll = scroll
+        # 滚动模式下每行都要在移到最上面的行位时仍在圆内
+        if scroll:
+            self.row_start, self.row_limit, self.row_left, self.last_y = scroll_rows(line_height)
+        else:
+            self.row_start, self.row_limit, self.row_left = ROW_START, ROW_LIMIT, ROW_LEFT
+            self.last_y = None
+        self.kinsoku = kinsoku
+        self.word_wrap = word_wrap
+        self.reset()
+
+    def reset(self):
+        self.codes = array("H")
+        self.kinds = bytearray()
+        self.glyphs = array("H")
+        self.widths = bytearray()
+        self.xs = array("H")
+        self.line_y = array("H", [FIRST_Y])
+        self.line_start = array("H", [0])
+        self.line_action = bytearray(1)
+        self.y = FIRST_Y
+        self.x = self.row_start[FIRST_Y]
+        self._wrapped = False  # 当前行由自动折行产生 (行首的空格丢掉)
+
+    def line_end(self, i):
+        """第 i 行最后一个字之后的下标"""
+        return self.line_start[i + 1] if i + 1 < len(self.line_start) else len(self.codes)
+
+    def feed(self, text):
+        """把 text 接着排到现有结果后面"""
+        measure = self.measure
+        for ch in text:
+            if ch == "\n":
+                self._new_line(len(self.codes))
+                self._wrapped = False
+                continue
+            m = measure(ch)
+            if m is None:
+                continue
+            kind, glyph, width = m
+            code = ord(ch)
+            k = len(self.codes)
+            y = self.y
+            if k > self.line_start[-1] and (self.x < self.row_left[y] or self.x + width > self.row_limit[y]):
+                self._new_line(self._break_point(k, code))
+                self._wrapped = True
+            if code == 0x20 and self._wrapped and len(self.codes) == self.line_start[-1]:
+                continue
+            self.codes.append(code)
+            self.kinds.append(kind)
+            self.glyphs.append(glyph)
+            self.widths.append(width)
+            self.xs.append(self.x)
+            self.x += width
+
+    def _break_point(self, k, code):
+        """放不下第 k 个字 (码点 code) 时，下一行从哪个字开始"""
+        codes = self.codes
+        first = self.line_start[-1]
+        b = k
+        if self.word_wrap and _is_word(code):
+            j = k
+            while j > first and _is_word(codes[j - 1]):
+                j -= 1
+            if j > first:  # 单词比整行还长时只能从中间断开
+                b = j
+        if self.kinsoku:
+            while b > first + 1 and (codes[b] if b < k else code) in NO_LINE_START:
+                b -= 1
+            while b > first + 1 and codes[b - 1] in NO_LINE_END:
+                b -= 1
+        return b
+
+    def _new_line(self, b):
+        """从第 b 个字开始新的一行，b 之后已排的字移到新行"""
+        y = self.y + self.line_height
+        action = NONE
+        if (y > self.last_y) if self.scroll else overflows(y):
+            if self.scroll:
+                y = self.y
+                action = SCROLL
+            else:
+                y = FIRST_Y
+                action = NEW_PAGE
+        self.line_y.append(y)
+        self.line_start.append(b)
+        self.line_action.append(action)
+        self.y = y
+        x = self.row_start[y]
+        xs = self.xs
+        widths = self.widths
+        for i in range(b, len(self.codes)):
+            xs[i] = x
+            x += widths[i]
+        self.x = x
@@ -3,8 +3,7 @@ https://www.waveshare.com/wiki/ESP32-S3-LCD-1.28
 Firmware: ESP32_GENERIC/firmware_16MiB.bin
 """
 
-from machine import Pin, SPI
-import gc9a01
+from hal import Pin, SPI, gc9a01
 
 TFA = 0
 BFA = 0
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# 端到端对话时延追踪：每一轮 (一次说话到回复播完) 在固定的几个节点打时间戳，
+# 结束的轮次放进有界环形缓冲，report() 按相邻节点之间的阶段给出 p50/p95，看是哪一段拖慢了响应
+# 打点 (mark) 只写预分配数组，可以在录音线程里调用
+from hal import ticks_ms, ticks_diff
+from array import array
+
+# 时间节点，按一轮对话中出现的先后顺序编号
+ONSET = 0          # VAD 检测到说话开始
+COMMIT = 1         # VAD 判定说完，input_audio_buffer.commit 入队
+COMMITTED = 2      # 收到 input_audio_buffer.committed
+CREATE_SENT = 3    # response.create 已发出
+CREATED = 4        # 收到 response.created
+FIRST_DELTA = 5    # 收到第一个 response.audio.delta
+FIRST_PCM = 6      # 第一个 PCM 样本写入 I2S (PlaybackStage.first_write_ms)
+AUDIO_DONE = 7     # 收到 response.audio.done
+RESPONSE_DONE = 8  # 收到 response.done
+CHAIN = 9          # 以上节点按先后排成一条链，相邻节点之间即一个阶段
+# 旁路节点：与链上节点的先后不固定，只和指定的链上节点比较
+FIRST_GLYPH = 9    # 回复文本的第一个字画到屏幕上 (display_events)
+POINTS = 10
+
+POINT_NAMES = ("onset", "vad_commit", "committed", "create_sent", "created",
+               "first_delta", "first_pcm", "audio_done", "response_done", "first_glyph")
+
+
+class Turn:
+    """一轮对话的打点记录：stamps[i] 在 mask 第 i 位置位时有效"""
+
+    def __init__(self):
+        self.event_id = None
+        self.stamps = array("l", [0] * POINTS)
+        self.mask = 0
+
+    def reset(self, event_id):
+        self.event_id = event_id
+        self.mask = 0
+
+    def has(self, point):
+        return bool(self.mask & (1 << point))
+
+    def set(self, point, t):
+        self.stamps[point] = t
+        self.mask |= 1 << point
+
+    def span(self, a, b):
+        """节点 a 到 b 的毫秒数，任一缺失返回 None"""
+        if self.has(a) and self.has(b):
+            return ticks_diff(self.stamps[b], self.stamps[a])
+        return None
+
+    def spans(self):
+        """
+        [("a->b", 毫秒)]，按节点顺序列出链上有记录的相邻节点之间的耗时 (缺失的节点被跳过)，
+        最后附上 vad_commit->first_glyph
+        """
+        out = []
+        prev = None
+        for point in range(CHAIN):
+            if not self.has(point):
+                continue
+            if prev is not None:
+                out.append((POINT_NAMES[prev] + "->" + POINT_NAMES[point], self.span(prev, point)))
+            prev = point
+        ms = self.span(COMMIT, FIRST_GLYPH)
+        if ms is not None:
+            out.append(("vad_commit->first_glyph", ms))
+        return out
+
+
+def _percentile(sorted_values, p):
+    """最近秩法取第 p 百分位"""
+    n = len(sorted_values)
+    k = (n * p + 99) // 100
+    return sorted_values[max(0, min(n - 1, k - 1))]
+
+
+class Tracer:
+    """
+    当前进行中的一轮 + 最近 capacity 轮已结束的记录 (槽位预分配，循环覆盖最旧的)
+    每轮用 begin() 开始、finish() 结束；同一节点只记第一次 (例如只记第一个音频增量)
+    """
+
+    def __init__(self, capacity=32):
+        self._slots = [Turn() for _ in range(capacity)]
+        self._head = 0
+        self.count = 0
+        self.current = None
+
+    def begin(self, event_id=None, t=None):
+        """开始新一轮并记下 ONSET；上一轮尚未结束时按已有节点收尾"""
+        if self.current is not None:
+            self.finish()
+        turn = self._slots[self._head]
+        turn.reset(event_id)
+        self.current = turn
+        turn.set(ONSET, ticks_ms() if t is None else t)
+        return turn
+
+    def mark(self, point, t=None):
+        """给当前轮记一个节点，t 默认取当前 ticks_ms；没有进行中的轮次或已记过时忽略"""
+        turn = self.current
+        if turn is None or turn.mask & (1 << point):
+            return
+        turn.set(point, ticks_ms() if t is None else t)
+
+    def tag(self, event_id):
+        """给当前轮设置/替换 event_id (例如 commit 消息生成 ID 时)"""
+        if self.current is not None:
+            self.current.event_id = event_id
+
+    def cancel(self):
+        """丢弃当前轮 (例如语音段过短被 VAD 忽略)"""
+        self.current = None
+
+    def finish(self):
+        """结束当前轮，放入环形缓冲，返回该轮记录"""
+        turn = self.current
+        if turn is None:
+            return None
+        self.current = None
+        self._head = (self._head + 1) % len(self._slots)
+        if self.count < len(self._slots):
+            self.count += 1
+        return turn
+
+    def turns(self):
+        """按旧到新依次产出已结束的轮次"""
+        size = len(self._slots)
+        count = self.count
+        if count == size and self.current is not None:
+            count -= 1  # 最旧的槽位已被进行中的一轮占用
+        i = (self._head - count) % size
+        for _ in range(count):
+            yield self._slots[i]
+            i = (i + 1) % size
+
+    def summary(self):
+        """
+        [(阶段名, 样本数, p50, p95, 最大)]：链上相邻节点之间的各阶段，外加
+        onset->first_pcm (从开口到听到回复，含说话时长)、vad_commit->first_pcm (说完到听到回复)
+        与 vad_commit->first_glyph (说完到屏幕出字)
+        """
+        stages = [(a, a + 1) for a in range(CHAIN - 1)]
+        stages.append((ONSET, FIRST_PCM))
+        stages.append((COMMIT, FIRST_PCM))
+        stages.append((COMMIT, FIRST_GLYPH))
+        rows = []
+        for a, b in stages:
+            values = []
+            for turn in self.turns():
+                ms = turn.span(a, b)
+                if ms is not None:
+                    values.append(ms)
+            if not values:
+                continue
+            values.sort()
+            rows.append((POINT_NAMES[a] + "->" + POINT_NAMES[b], len(values),
+                         _percentile(values, 50), _percentile(values, 95), values[-1]))
+        return rows
+
+    def report(self, out=print):
+        """打印各阶段的样本数与 p50/p95/最大耗时 (毫秒)"""
+        out("{:<28} {:>5} {:>8} {:>8} {:>8}".format("stage", "turns", "p50 ms", "p95 ms", "max ms"))
+        for name, n, p50, p95, peak in self.summary():
+            out("{:<28} {:>5} {:>8} {:>8} {:>8}".format(name, n, p50, p95, peak))
+
+    def report_turn(self, turn, out=print):
+        """单轮的各阶段耗时，一行输出"""
+        parts = ["{} {}ms".format(name, ms) for name, ms in turn.spans()]
+        out("⏱️ {}: {}".format(turn.event_id or "-", ", ".join(parts)))
+
+
+# 默认追踪器，doubao_chat 与插件模块共用
+tracer = Tracer()
+begin = tracer.begin
+mark = tracer.mark
+tag = tracer.tag
+cancel = tracer.cancel
+finish = tracer.finish
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+# 语音活动检测 (VAD)：能量/过零率计算与流式 VAD 引擎
+import sys
+import math
+from ringbuf import ChunkRing
+
+# viper 代码只在 MicroPython 下执行，CPython 不会求值装饰器和类型注解
+_VIPER = sys.implementation.name == "micropython"
+
+# viper 的整数是 32 位有符号数，平方和按 >>6 缩放后每次最多累加这么多个样本，避免溢出
+_BLOCK = 120
+
+if _VIPER:
+    import micropython
+    from array import array
+
+    _acc = array('i', (0, 0, 0, 0))  # total_abs, sum_sq >> 6, peak, count
+
+    @micropython.viper
+    def _energy_viper(buf: ptr16, start: int, end: int, step: int, out: ptr32):
+        total = 0
+        sq = 0
+        peak = 0
+        count = 0
+        i = start
+        while i < end:
+            s = int(buf[i])
+            if s & 0x8000:
+                s = 0x10000 - s
+            total += s
+            sq += (s * s) >> 6
+            if s > peak:
+                peak = s
+            count += 1
+            i += step
+        out[0] = total
+        out[1] = sq
+        out[2] = peak
+        out[3] = count
+
+    @micropython.viper
+    def _crossings_viper(buf: ptr16, samples: int, step: int) -> int:
+        count = 0
+        prev = int(buf[0]) & 0x8000
+        i = step
+        while i < samples:
+            cur = int(buf[i]) & 0x8000
+            if cur != prev:
+                count += 1
+                prev = cur
+            i += step
+        return count
+
+    def _crossings(buf, samples, step):
+        return int(_crossings_viper(buf, samples, step))
+
+    def _energy(buf, samples, step):
+        total = sq = peak = count = 0
+        acc = _acc
+        start = 0
+        span = _BLOCK * step
+        while start < samples:
+            end = min(start + span, samples)
+            _energy_viper(buf, start, end, step, acc)
+            total += acc[0]
+            sq += acc[1] << 6
+            if acc[2] > peak:
+                peak = acc[2]
+            count += acc[3]
+            start = end
+        return total, sq, peak, count
+
+else:
+    from operator import mul as _mul, ne as _ne
+
+    try:
+        import numpy as _np
+    except ImportError:
+        _np = None
+
+    def _energy(buf, samples, step):
+        if _np is not None:
+            pcm = _np.frombuffer(buf, dtype='<i2', count=samples)[::step].astype(_np.int64)
+            if not len(pcm):
+                return 0, 0, 0, 0
+            mag = _np.abs(pcm)
+            return int(mag.sum()), int(_np.dot(pcm, pcm)), int(mag.max()), len(pcm)
+        pcm = memoryview(buf)[:samples * 2].cast('h')[::step].tolist()
+        if not pcm:
+            return 0, 0, 0, 0
+        return (sum(map(abs, pcm)), sum(map(_mul, pcm, pcm)),
+                max(max(pcm), -min(pcm)), len(pcm))
+
+    def _crossings(buf, samples, step):
+        signs = [x < 0 for x in memoryview(buf)[:samples * 2].cast('h')[::step].tolist()]
+        return sum(map(_ne, signs, signs[1:]))
+
+
+def energy(buf, nbytes, step=1):
+    """
+    计算 16 位小端 PCM 块 buf[:nbytes] 的能量，一次调用同时返回 (平均绝对值, RMS, 峰值)
+    step > 1 时只检查每第 step 个样本 (降采样)，CPU 紧张时可以用来减负
+    """
+    samples = nbytes // 2
+    if samples <= 0:
+        return 0, 0, 0
+    total, sq, peak, count = _energy(buf, samples, step)
+    if not count:
+        return 0, 0, 0
+    return total / count, math.sqrt(sq / count), peak
+
+
+def zero_crossing_rate(buf, nbytes, step=1):
+    """buf[:nbytes] 中相邻 (降采样后) 样本符号变化的比例，0~1；底噪嘶声偏高，浊音偏低"""
+    samples = nbytes // 2
+    inspected = (samples + step - 1) // step
+    if inspected < 2:
+        return 0
+    return _crossings(buf, samples, step) / (inspected - 1)
+
+
+# --- VAD 引擎 ---
+# feed() 对每个麦克风块返回以下状态之一
+SILENCE = 0   # 不在语音段中，本块不发送
+ONSET = 1     # 语音段开始：先发送 preroll() 中缓存的块，再发送本块
+SPEECH = 2    # 语音段中的有声块，需要发送
+HANGOVER = 3  # 语音段中的短暂静音，不发送，继续等待
+COMMIT = 4    # 语音段结束且时长有效，应提交 input_audio_buffer.commit
+DISCARD = 5   # 语音段过短，已忽略并重置
+
+STATE_NAMES = ("SILENCE", "ONSET", "SPEECH", "HANGOVER", "COMMIT", "DISCARD")
+
+
+class VAD:
+    """
+    流式 VAD 基类：子类只需实现 _is_voiced()，语音段状态机、pre-roll 与时延统计都在这里
+    时长全部按音频时间 (样本数 / 采样率) 累计，离线回放与实时运行结果一致
+    """
+
+    def __init__(self, rate=16000, min_speech_s=0.4, post_speech_silence_s=1.5,
+                 attack_frames=1, preroll_chunks=0, chunk_size=1024):
+        self.rate = rate
+        self.min_speech_s = min_speech_s
+        self.post_speech_silence_s = post_speech_silence_s
+        self.attack_frames = attack_frames
+        # 起音确认期间的块也存在 pre-roll 里，所以槽位至少要容纳 attack_frames - 1 个块
+        self._preroll = ChunkRing(max(preroll_chunks, attack_frames - 1), chunk_size)
+        # 最近一次语音段的统计 (秒)，供调试和离线评估
+        self.speech_duration = 0
+        self.onset_latency = 0       # 第一个有声块到判定 ONSET 的延迟
+        self.commit_latency = 0      # 最后一个有声块到判定 COMMIT 的延迟
+        self.reset()
+
+    def reset(self):
+        """丢弃当前语音段和 pre-roll，例如暂停录音时"""
+        self.in_speech = False
+        self._voiced_run = 0
+        self._voiced_run_time = 0
+        self._speech_time = 0
+        self._silence_time = 0
+        self._preroll.clear()
+
+    @property
+    def preroll_bytes(self):
+        """当前 pre-roll 中缓存的字节数"""
+        return self._preroll.nbytes
+
+    def _is_voiced(self, buf, nbytes):
+        raise NotImplementedError
+
+    def preroll(self, buf, nbytes):
+        """
+        ONSET 时调用：返回一个新 bytearray，依次包含 pre-roll 中缓存的块 (旧到新) 和 buf[:nbytes]，
+        以便作为一条消息整批发送；取走后 pre-roll 清空
+        """
+        batch = bytearray(self._preroll.nbytes + nbytes)
+        pos = self._preroll.drain_into(batch)
+        batch[pos:] = memoryview(buf)[:nbytes]
+        return batch
+
+    def _remember(self, buf, nbytes):
+        self._preroll.push(buf, nbytes)
+
+    def feed(self, buf, nbytes):
+        """输入一个 16 位 PCM 块，返回 SILENCE/ONSET/SPEECH/HANGOVER/COMMIT/DISCARD"""
+        duration = (nbytes // 2) / self.rate
+        voiced = self._is_voiced(buf, nbytes)
+
+        if not self.in_speech:
+            if not voiced:
+                self._voiced_run = 0
+                self._voiced_run_time = 0
+                self._remember(buf, nbytes)
+                return SILENCE
+            self._voiced_run += 1
+            self._voiced_run_time += duration
+            if self._voiced_run < self.attack_frames:
+                # 起音确认中，先缓存，确认后随 pre-roll 一起发送
+                self._remember(buf, nbytes)
+                return SILENCE
+            self.in_speech = True
+            self.onset_latency = self._voiced_run_time - duration
+            self._speech_time = self._voiced_run_time
+            self._silence_time = 0
+            return ONSET
+
+        if voiced:
+            self._speech_time += self._silence_time + duration
+            self._silence_time = 0
+            return SPEECH
+
+        self._silence_time += duration
+        if self._silence_time < self.post_speech_silence_s:
+            return HANGOVER
+
+        self.speech_duration = self._speech_time
+        self.commit_latency = self._silence_time
+        self.reset()
+        return COMMIT if self.speech_duration >= self.min_speech_s else DISCARD
+
+
+class ThresholdVAD(VAD):
+    """固定阈值：平均绝对值超过 threshold 即为有声 (原 audio_recording_thread 的逻辑)"""
+
+    def __init__(self, threshold=80, **kwargs):
+        self.threshold = threshold
+        super().__init__(**kwargs)
+
+    def _is_voiced(self, buf, nbytes):
+        return energy(buf, nbytes)[0] > self.threshold
+
+
+class AdaptiveVAD(VAD):
+    """
+    自适应底噪 VAD
+    非语音段持续用指数平均跟踪底噪 (下降快、上升慢)，有声判定为：
+    能量高于 max(threshold, 底噪 * ratio)，且过零率不像宽带嘶声 (能量特别高时不看过零率)
+    """
+
+    def __init__(self, threshold=80, ratio=3.0, zcr_max=0.45, rise=0.05, fall=0.3,
+                 step=1, attack_frames=2, **kwargs):
+        self.threshold = threshold
+        self.ratio = ratio
+        self.zcr_max = zcr_max
+        self.rise = rise
+        self.fall = fall
+        self.step = step
+        self.noise_floor = None
+        super().__init__(attack_frames=attack_frames, **kwargs)
+
+    def _is_voiced(self, buf, nbytes):
+        level = energy(buf, nbytes, self.step)[0]
+        floor = self.noise_floor
+        if floor is None:
+            floor = self.noise_floor = level
+        gate = max(self.threshold, floor * self.ratio)
+        voiced = level > gate and (level > gate * 2
+                                   or zero_crossing_rate(buf, nbytes, self.step) <= self.zcr_max)
+        if not voiced and not self.in_speech:
+            # 只在非语音时更新底噪，避免把说话声学进去
+            alpha = self.rise if level > floor else self.fall
+            self.noise_floor = floor + alpha * (level - floor)
+        return voiced
+
+
+ENGINES = {
+    "threshold": ThresholdVAD,
+    "adaptive": AdaptiveVAD,
+}
+
+
+def make_vad(engine, **kwargs):
+    """按 config.VAD_ENGINE 创建 VAD 引擎，其余参数原样传给引擎构造函数"""
+    try:
+        return ENGINES[engine](**kwargs)
+    except KeyError:
+        raise ValueError("Unknown VAD engine: {}".format(engine))